@@ -1,64 +1,231 @@
+import argparse
 import os
+import sys
 import json
+import ctypes
 import subprocess
 import datetime
-import math
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from fs_utils import bulk_attr_size, du_sizes, ensure_cache_dir, format_size, scandir_size
+
+try:
+    import orjson  # C encoder; optional
+except ImportError:
+    orjson = None
+
+def _encode_line(obj) -> bytes:
+    """Serialize the result as one JSON line (orjson when available).
+
+    Names or paths that aren't valid UTF-8 arrive as surrogate-escaped str,
+    which orjson refuses; those go through json, which writes the escapes.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE)
+        except orjson.JSONEncodeError:
+            pass
+    return (json.dumps(obj) + "\n").encode()
 
 def get_directory_size(start_path):
-    """Calculates the size of an .app bundle."""
-    total_size = 0
-    if not os.path.exists(start_path): return 0
+    """Calculates the size of an .app bundle with the shared bulk/scandir walkers."""
+    size = bulk_attr_size(start_path)
+    if size is None:
+        size = scandir_size(start_path)
+    return size
+
+APP_CACHE_DIR = os.path.expanduser('~/Library/Caches/mac-optimizer')
+APP_CACHE_PATH = os.path.join(APP_CACHE_DIR, 'app_scan.sqlite')
+APP_SIZE_MAX_AGE = 24 * 3600  # cached bundle sizes are re-measured at least this often
+
+def open_app_cache():
+    """Opens the sidecar cache of bundle sizes, or None if it can't be created."""
     try:
-        for dirpath, _, filenames in os.walk(start_path):
-            for f in filenames:
-                fp = os.path.join(dirpath, f)
-                if not os.path.islink(fp):
-                    try:
-                        total_size += os.path.getsize(fp)
-                    except (OSError, FileNotFoundError):
-                        pass
-    except Exception:
+        ensure_cache_dir(APP_CACHE_DIR)
+        conn = sqlite3.connect(APP_CACHE_PATH)
+        conn.execute("CREATE TABLE IF NOT EXISTS apps (path TEXT PRIMARY KEY, mtime REAL, size INTEGER)")
+        try:
+            # Caches written before sizes expired have no timestamp; their rows read as expired
+            conn.execute("ALTER TABLE apps ADD COLUMN scanned_at REAL")
+        except sqlite3.OperationalError:
+            pass
+        return conn
+    except (OSError, sqlite3.Error):
+        return None
+
+def bundle_mtime(app_path):
+    """Change marker for a bundle: the newest of the .app, Contents and Info.plist mtimes.
+
+    Updaters usually swap files inside Contents, which leaves the .app
+    directory's own mtime untouched, so the root alone is not enough.
+    """
+    newest = os.stat(app_path).st_mtime
+    for sub in ('Contents', os.path.join('Contents', 'Info.plist')):
+        try:
+            newest = max(newest, os.stat(os.path.join(app_path, sub)).st_mtime)
+        except OSError:
+            pass
+    return newest
+
+def load_cached_sizes(conn, mtimes, max_age=APP_SIZE_MAX_AGE):
+    """Returns cached sizes for bundles whose mtime is unchanged and whose size is recent."""
+    sizes = {}
+    if conn is None:
+        return sizes
+    cutoff = time.time() - max_age
+    try:
+        for path, mtime, size, scanned_at in conn.execute("SELECT path, mtime, size, scanned_at FROM apps"):
+            if path in mtimes and mtimes[path] == mtime and scanned_at is not None and scanned_at >= cutoff:
+                sizes[path] = size
+    except sqlite3.Error:
         pass
-    return total_size
+    return sizes
 
-def extract_metadata(app_path):
-    """Uses macOS mdls to get reliable creation and last-used dates."""
-    result = {
-        "kMDItemFSCreationDate": None,
-        "kMDItemLastUsedDate": None
-    }
+def _is_utf8(path):
     try:
-        # Run mdls to extract all metadata key-values
-        process = subprocess.Popen(['mdls', '-name', 'kMDItemFSCreationDate', '-name', 'kMDItemLastUsedDate', app_path], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        out, err = process.communicate()
-        if process.returncode != 0:
-            return result
-        
-        output = out.decode('utf-8').split('\n')
-        for line in output:
-            if "kMDItemFSCreationDate" in line:
-                parts = line.split('=')
-                if len(parts) > 1 and "(null)" not in parts[1]:
-                    # Extract date string like '2023-10-25 14:32:00 +0000'
-                    date_str = parts[1].strip()
-                    result["kMDItemFSCreationDate"] = date_str
-            elif "kMDItemLastUsedDate" in line:
-                parts = line.split('=')
-                if len(parts) > 1 and "(null)" not in parts[1]:
-                    date_str = parts[1].strip()
-                    result["kMDItemLastUsedDate"] = date_str
-    except Exception as e:
+        path.encode('utf-8')
+        return True
+    except UnicodeEncodeError:
+        return False
+
+def store_cached_sizes(conn, mtimes, sizes):
+    """Saves freshly measured sizes and drops rows for bundles no longer installed.
+
+    sqlite only takes valid UTF-8 text, so bundles whose names carry
+    surrogate-escaped bytes are not cached and get sized on every run.
+    """
+    if conn is None:
+        return
+    now = time.time()
+    try:
+        with conn:
+            gone = [(path,) for (path,) in conn.execute("SELECT path FROM apps") if path not in mtimes]
+            conn.executemany("DELETE FROM apps WHERE path = ?", gone)
+            conn.executemany(
+                "INSERT OR REPLACE INTO apps (path, mtime, size, scanned_at) VALUES (?, ?, ?, ?)",
+                [(path, mtimes[path], size, now) for path, size in sizes.items()
+                 if path in mtimes and _is_utf8(path)]
+            )
+    except sqlite3.Error:
         pass
+
+MDLS_ATTRIBUTES = ("kMDItemFSCreationDate", "kMDItemLastUsedDate")
+MDLS_BATCH_SIZE = 500  # paths per mdls invocation, keeps argv well under ARG_MAX
+
+_CF_STRING_ENCODING_UTF8 = 0x08000100
+_CF_ABSOLUTE_TIME_1970 = 978307200.0  # kCFAbsoluteTimeIntervalSince1970
+
+def _load_mditem_api():
+    """Loads Spotlight's MDItem C API from CoreServices, or None off macOS."""
+    try:
+        cf = ctypes.CDLL('/System/Library/Frameworks/CoreFoundation.framework/CoreFoundation')
+        cs = ctypes.CDLL('/System/Library/Frameworks/CoreServices.framework/CoreServices')
+    except OSError:
+        return None
+
+    cf.CFStringCreateWithCString.argtypes = [ctypes.c_void_p, ctypes.c_char_p, ctypes.c_uint32]
+    cf.CFStringCreateWithCString.restype = ctypes.c_void_p
+    cf.CFRelease.argtypes = [ctypes.c_void_p]
+    cf.CFRelease.restype = None
+    cf.CFGetTypeID.argtypes = [ctypes.c_void_p]
+    cf.CFGetTypeID.restype = ctypes.c_ulong
+    cf.CFDateGetTypeID.argtypes = []
+    cf.CFDateGetTypeID.restype = ctypes.c_ulong
+    cf.CFDateGetAbsoluteTime.argtypes = [ctypes.c_void_p]
+    cf.CFDateGetAbsoluteTime.restype = ctypes.c_double
+    cs.MDItemCreate.argtypes = [ctypes.c_void_p, ctypes.c_void_p]
+    cs.MDItemCreate.restype = ctypes.c_void_p
+    cs.MDItemCopyAttribute.argtypes = [ctypes.c_void_p, ctypes.c_void_p]
+    cs.MDItemCopyAttribute.restype = ctypes.c_void_p
+
+    def cfstr(value):
+        return cf.CFStringCreateWithCString(None, value.encode('utf-8'), _CF_STRING_ENCODING_UTF8)
+
+    # Attribute-name CFStrings are created once and live for the whole process
+    attr_refs = {attr: cfstr(attr) for attr in MDLS_ATTRIBUTES}
+    if not all(attr_refs.values()):
+        return None
+    return cf, cs, cfstr, attr_refs, cf.CFDateGetTypeID()
+
+def _extract_metadata_mditem(api, app_path):
+    """Reads the MDLS_ATTRIBUTES dates for one path in-process, formatted like mdls."""
+    cf, cs, cfstr, attr_refs, date_type_id = api
+    result = dict.fromkeys(MDLS_ATTRIBUTES)
+    path_ref = cfstr(app_path)
+    if not path_ref:
+        return result
+    try:
+        item = cs.MDItemCreate(None, path_ref)
+        if not item:
+            return result
+        try:
+            for attr, attr_ref in attr_refs.items():
+                value = cs.MDItemCopyAttribute(item, attr_ref)
+                if not value:
+                    continue
+                try:
+                    if cf.CFGetTypeID(value) == date_type_id:
+                        ts = cf.CFDateGetAbsoluteTime(value) + _CF_ABSOLUTE_TIME_1970
+                        dt_obj = datetime.datetime.fromtimestamp(ts, datetime.UTC)
+                        result[attr] = dt_obj.strftime('%Y-%m-%d %H:%M:%S +0000')
+                finally:
+                    cf.CFRelease(value)
+        finally:
+            cf.CFRelease(item)
+    finally:
+        cf.CFRelease(path_ref)
     return result
 
+_MDITEM_API = _load_mditem_api()
+
+def extract_metadata_many(app_paths):
+    """Gets creation and last-used dates for every path.
+
+    Prefers the in-process MDItem API; otherwise falls back to one batched
+    mdls call per chunk. With -raw, mdls prints every requested attribute for every path in argument
+    order, separated by NUL bytes, so the output can be zipped back onto paths.
+    """
+    if _MDITEM_API is not None:
+        return {p: _extract_metadata_mditem(_MDITEM_API, p) for p in app_paths}
+
+    results = {p: dict.fromkeys(MDLS_ATTRIBUTES) for p in app_paths}
+    name_args = []
+    for attr in MDLS_ATTRIBUTES:
+        name_args += ['-name', attr]
+
+    for start in range(0, len(app_paths), MDLS_BATCH_SIZE):
+        chunk = app_paths[start:start + MDLS_BATCH_SIZE]
+        try:
+            process = subprocess.run(['mdls', '-raw', '-nullMarker', '', *name_args, *chunk], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        except Exception:
+            continue
+        if process.returncode != 0:
+            continue
+
+        values = process.stdout.decode('utf-8').split('\0')
+        if len(values) < len(chunk) * len(MDLS_ATTRIBUTES):
+            continue
+        for i, app_path in enumerate(chunk):
+            for j, attr in enumerate(MDLS_ATTRIBUTES):
+                # Values look like '2023-10-25 14:32:00 +0000'
+                date_str = values[i * len(MDLS_ATTRIBUTES) + j].strip()
+                if date_str and date_str != "(null)":
+                    results[app_path][attr] = date_str
+    return results
+
 def format_date(date_string):
     """Parses Apple metadata dates into human relative strings."""
     if not date_string:
         return "Never Used", 99999
         
     try:
-        # Expected format: 2024-02-15 18:22:33 +0000
-        dt_obj = datetime.datetime.strptime(date_string[:19], '%Y-%m-%d %H:%M:%S')
+        # Expected format: 2024-02-15 18:22:33 +0000 — fixed offsets, so slice
+        # instead of running strptime's format interpreter for every app
+        s = date_string
+        dt_obj = datetime.datetime(int(s[0:4]), int(s[5:7]), int(s[8:10]),
+                                   int(s[11:13]), int(s[14:16]), int(s[17:19]))
         now = datetime.datetime.now(datetime.UTC).replace(tzinfo=None)
         delta = now - dt_obj
         
@@ -78,16 +245,9 @@ def format_date(date_string):
     except Exception:
         return "Unknown", 99999
 
-def format_size(size_bytes):
-    if size_bytes == 0: return "0 B"
-    size_name = ("B", "KB", "MB", "GB", "TB")
-    i = int(math.floor(math.log(size_bytes, 1024))) if size_bytes > 0 else 0
-    p = math.pow(1024, i)
-    s = round(size_bytes / p, 2)
-    return f"{s} {size_name[i]}"
-
-def scan_apps():
+def scan_apps(include_metadata=True):
     app_directories = ['/Applications', os.path.expanduser('~/Applications')]
+    candidates = []
     results = []
 
     for d in app_directories:
@@ -96,42 +256,83 @@ def scan_apps():
         try:
             for item in os.listdir(d):
                 if item.endswith('.app'):
-                    app_path = os.path.join(d, item)
-                    app_name = item.replace('.app', '')
-                    
-                    # Ignore tiny system stubs
-                    size_bytes = get_directory_size(app_path)
-                    if size_bytes < 5 * 1024 * 1024: # Smaller than 5MB
-                        continue
-                        
-                    meta = extract_metadata(app_path)
-                    
-                    # Calculate relative usage
-                    last_used_str, days_since_used = format_date(meta['kMDItemLastUsedDate'])
-                    install_str, _ = format_date(meta['kMDItemFSCreationDate'])
-                    
-                    # Determine weight category
-                    category = "Active"
-                    if days_since_used > 180 or last_used_str == "Never Used":
-                        category = "Dead Weight"
-                    elif days_since_used > 60:
-                        category = "Rarely Used"
-
-                    results.append({
-                        "id": app_name,
-                        "name": app_name,
-                        "path": app_path,
-                        "sizeBytes": size_bytes,
-                        "sizeFormatted": format_size(size_bytes),
-                        "lastUsedRaw": meta['kMDItemLastUsedDate'],
-                        "lastUsed": last_used_str,
-                        "daysSinceUsed": days_since_used, # for sorting
-                        "installed": install_str,
-                        "category": category
-                    })
+                    candidates.append((os.path.join(d, item), item.replace('.app', '')))
         except PermissionError:
             pass
 
+    # Reuse sizes from the last run for bundles that haven't changed on disk.
+    # Spotlight dates are always re-read: launching an app updates its
+    # last-used date without touching the bundle.
+    mtimes = {}
+    for app_path, _ in candidates:
+        try:
+            mtimes[app_path] = bundle_mtime(app_path)
+        except OSError:
+            pass
+    cache = open_app_cache()
+    sizes = load_cached_sizes(cache, mtimes)
+    stale = [app_path for app_path, _ in candidates if app_path not in sizes]
+    fresh = du_sizes(stale)
+
+    # Bundle walks are syscall-bound and release the GIL, so size any bundle
+    # du could not report concurrently
+    missing = [app_path for app_path in stale if app_path not in fresh]
+    if missing:
+        with ThreadPoolExecutor(max_workers=min(16, len(missing))) as executor:
+            fresh.update(zip(missing, executor.map(get_directory_size, missing)))
+
+    sizes.update(fresh)
+    store_cached_sizes(cache, mtimes, fresh)
+    if cache is not None:
+        cache.close()
+
+    apps = []
+    for app_path, app_name in candidates:
+        size_bytes = sizes[app_path]
+        # Ignore tiny system stubs
+        if size_bytes < 5 * 1024 * 1024: # Smaller than 5MB
+            continue
+        apps.append((app_path, app_name, size_bytes))
+
+    # Size-only callers skip the Spotlight step entirely
+    if include_metadata:
+        metadata = extract_metadata_many([app_path for app_path, _, _ in apps])
+    else:
+        metadata = {}
+
+    for app_path, app_name, size_bytes in apps:
+        meta = metadata.get(app_path) or dict.fromkeys(MDLS_ATTRIBUTES)
+
+        # Calculate relative usage
+        if include_metadata:
+            last_used_str, days_since_used = format_date(meta['kMDItemLastUsedDate'])
+            install_str, _ = format_date(meta['kMDItemFSCreationDate'])
+        else:
+            last_used_str, days_since_used = "Unknown", 99999
+            install_str = "Unknown"
+        
+        # Determine weight category
+        category = "Active"
+        if not include_metadata:
+            category = "Unknown"
+        elif days_since_used > 180 or last_used_str == "Never Used":
+            category = "Dead Weight"
+        elif days_since_used > 60:
+            category = "Rarely Used"
+
+        results.append({
+            "id": app_name,
+            "name": app_name,
+            "path": app_path,
+            "sizeBytes": size_bytes,
+            "sizeFormatted": format_size(size_bytes),
+            "lastUsedRaw": meta['kMDItemLastUsedDate'],
+            "lastUsed": last_used_str,
+            "daysSinceUsed": days_since_used, # for sorting
+            "installed": install_str,
+            "category": category
+        })
+
     # Sort largest apps first
     sorted_results = sorted(results, key=lambda x: x['sizeBytes'], reverse=True)
 
@@ -141,7 +342,12 @@ def scan_apps():
         "items": sorted_results
     }
     
-    print(json.dumps(output))
+    sys.stdout.buffer.write(_encode_line(output))
+    sys.stdout.flush()
 
 if __name__ == "__main__":
-    scan_apps()
+    parser = argparse.ArgumentParser(description="Mac Optimizer App Telemetry Auditor")
+    parser.add_argument("--metadata", action=argparse.BooleanOptionalAction, default=True,
+                        help="Query Spotlight for install/last-used dates (--no-metadata for a size-only scan)")
+    args = parser.parse_args()
+    scan_apps(include_metadata=args.metadata)
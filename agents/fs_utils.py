@@ -0,0 +1,349 @@
+"""
+Shared filesystem helpers for the Mac Optimizer agents.
+
+Sizing is done in-process with os.scandir so collectors don't fork a `du`
+per directory; `du` is only used as a fallback for very large trees.
+"""
+import ctypes
+import functools
+import os
+import stat
+import struct
+import subprocess
+import time
+
+SIZE_UNITS = ("B", "KB", "MB", "GB", "TB", "PB")
+
+# Entries visited before handing a tree off to `du` (C walks huge trees faster)
+DU_FALLBACK_ENTRIES = 200_000
+
+# st_blocks is counted in 512-byte units regardless of the filesystem block size
+STAT_BLOCK_SIZE = 512
+
+
+def physical_size(st: os.stat_result) -> int:
+    """Bytes a file actually occupies on disk (what `du` and diskutil count).
+
+    Unlike st_size this doesn't overcount sparse or APFS-compressed files.
+    """
+    return st.st_blocks * STAT_BLOCK_SIZE
+
+
+def ensure_cache_dir(path: str) -> str:
+    """Create a cache directory that Spotlight will not index.
+
+    mds/mdworker honour a `.metadata_never_index` file in a directory, so our
+    own SQLite caches don't trigger re-indexing every time a scan writes them.
+    """
+    os.makedirs(path, exist_ok=True)
+    marker = os.path.join(path, ".metadata_never_index")
+    if not os.path.exists(marker):
+        open(marker, "a").close()
+    return path
+
+
+def scandir_size(start_path: str, max_entries: int | None = None) -> int | None:
+    """Sum regular-file allocated sizes under start_path with a scandir stack.
+
+    Sizes come from DirEntry.stat(follow_symlinks=False), so symlinks are never
+    followed or counted; they are physical (st_blocks) to match the `du -sk`
+    fallback. Returns None if more than max_entries were visited.
+    """
+    total = 0
+    seen = 0
+    stack = [start_path]
+    while stack:
+        current = stack.pop()
+        try:
+            it = os.scandir(current)
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                seen += 1
+                if max_entries is not None and seen > max_entries:
+                    return None
+                try:
+                    st = entry.stat(follow_symlinks=False)
+                except OSError:
+                    continue
+                if stat.S_ISDIR(st.st_mode):
+                    stack.append(entry.path)
+                elif stat.S_ISREG(st.st_mode):
+                    total += st.st_blocks * STAT_BLOCK_SIZE
+    return total
+
+
+# getattrlistbulk(2) constants from <sys/attr.h> / <sys/vnode.h>
+_ATTR_BIT_MAP_COUNT = 5
+_ATTR_CMN_NAME = 0x00000001
+_ATTR_CMN_OBJTYPE = 0x00000008
+_ATTR_CMN_MODTIME = 0x00000400
+_ATTR_CMN_ACCTIME = 0x00001000
+_ATTR_CMN_ERROR = 0x20000000
+_ATTR_CMN_RETURNED_ATTRS = 0x80000000
+_ATTR_FILE_ALLOCSIZE = 0x00000004
+_VREG, _VDIR = 1, 2
+_BULK_BUFFER_SIZE = 256 * 1024
+
+
+class _AttrList(ctypes.Structure):
+    _fields_ = [
+        ("bitmapcount", ctypes.c_ushort),
+        ("reserved", ctypes.c_uint16),
+        ("commonattr", ctypes.c_uint32),
+        ("volattr", ctypes.c_uint32),
+        ("dirattr", ctypes.c_uint32),
+        ("fileattr", ctypes.c_uint32),
+        ("forkattr", ctypes.c_uint32),
+    ]
+
+
+def _load_getattrlistbulk():
+    """Return libSystem's getattrlistbulk, or None off macOS."""
+    try:
+        fn = ctypes.CDLL(None, use_errno=True).getattrlistbulk
+    except (OSError, AttributeError):
+        return None
+    fn.argtypes = [ctypes.c_int, ctypes.POINTER(_AttrList), ctypes.c_void_p,
+                   ctypes.c_size_t, ctypes.c_uint64]
+    fn.restype = ctypes.c_int
+    return fn
+
+
+_GETATTRLISTBULK = _load_getattrlistbulk()
+_BULK_ATTRS = _AttrList(
+    bitmapcount=_ATTR_BIT_MAP_COUNT,
+    commonattr=_ATTR_CMN_RETURNED_ATTRS | _ATTR_CMN_NAME | _ATTR_CMN_ERROR | _ATTR_CMN_OBJTYPE,
+    fileattr=_ATTR_FILE_ALLOCSIZE,
+)
+_BULK_TIME_ATTRS = _AttrList(
+    bitmapcount=_ATTR_BIT_MAP_COUNT,
+    commonattr=(_ATTR_CMN_RETURNED_ATTRS | _ATTR_CMN_NAME | _ATTR_CMN_ERROR | _ATTR_CMN_OBJTYPE
+                | _ATTR_CMN_MODTIME | _ATTR_CMN_ACCTIME),
+)
+_BULK_SIZE_ATIME_ATTRS = _AttrList(
+    bitmapcount=_ATTR_BIT_MAP_COUNT,
+    commonattr=_ATTR_CMN_RETURNED_ATTRS | _ATTR_CMN_NAME | _ATTR_CMN_ERROR | _ATTR_CMN_OBJTYPE | _ATTR_CMN_ACCTIME,
+    fileattr=_ATTR_FILE_ALLOCSIZE,
+)
+
+
+def _scandir_bulk(path: str, attrs: _AttrList, buf):
+    """Yield (name, obj_type, alloc_size, atime, mtime) for path's entries.
+
+    Each getattrlistbulk(2) call fills buf with a whole batch of records (the
+    macOS counterpart of getdents64 plus a stat per entry); only the
+    attributes requested in attrs are filled in, the rest read as 0. name is
+    raw bytes so callers decode only the names they use; entries the kernel
+    flags with an error are skipped. Raises OSError if path can't be opened
+    or a batch fails, after yielding whatever came before it.
+    """
+    fd = os.open(path, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        while True:
+            count = _GETATTRLISTBULK(fd, ctypes.byref(attrs), buf, len(buf), 0)
+            if count == 0:
+                return
+            if count < 0:
+                err = ctypes.get_errno()
+                raise OSError(err, os.strerror(err), path)
+            raw = buf.raw
+            offset = 0
+            for _ in range(count):
+                length, common, _vol, _dir, file_attrs, _fork = struct.unpack_from("=6I", raw, offset)
+                field = offset + 24
+                error = 0
+                if common & _ATTR_CMN_ERROR:
+                    error, = struct.unpack_from("=I", raw, field)
+                    field += 4
+                name = None
+                if common & _ATTR_CMN_NAME:
+                    name_off, name_len = struct.unpack_from("=iI", raw, field)
+                    start = field + name_off
+                    name = raw[start:start + name_len].rstrip(b"\0")
+                    field += 8
+                obj_type = 0
+                if common & _ATTR_CMN_OBJTYPE:
+                    obj_type, = struct.unpack_from("=I", raw, field)
+                    field += 4
+                mtime = atime = 0.0
+                if common & _ATTR_CMN_MODTIME:
+                    sec, nsec = struct.unpack_from("=qq", raw, field)
+                    mtime = sec + nsec / 1e9
+                    field += 16
+                if common & _ATTR_CMN_ACCTIME:
+                    sec, nsec = struct.unpack_from("=qq", raw, field)
+                    atime = sec + nsec / 1e9
+                    field += 16
+                alloc_size = 0
+                if file_attrs & _ATTR_FILE_ALLOCSIZE:
+                    alloc_size, = struct.unpack_from("=q", raw, field)
+                if not error and name:
+                    yield name, obj_type, alloc_size, atime, mtime
+                offset += length
+    finally:
+        os.close(fd)
+
+
+def bulk_attr_size(start_path: str, known: dict | None = None) -> int | None:
+    """Sum regular-file allocated sizes under start_path with getattrlistbulk(2).
+
+    Symlinks are neither followed nor counted, matching scandir_size. known
+    maps already sized subdirectory paths to bytes; those are added instead
+    of descended. Returns None when the call isn't available so callers can
+    fall back to scandir_size.
+    """
+    if _GETATTRLISTBULK is None:
+        return None
+    if known is None:
+        known = {}
+    buf = ctypes.create_string_buffer(_BULK_BUFFER_SIZE)
+    total = 0
+    stack = [start_path]
+    while stack:
+        current = stack.pop()
+        try:
+            for name, obj_type, alloc_size, _atime, _mtime in _scandir_bulk(current, _BULK_ATTRS, buf):
+                if obj_type == _VDIR:
+                    sub_path = os.path.join(current, os.fsdecode(name))
+                    sub = known.get(sub_path)
+                    if sub is None:
+                        stack.append(sub_path)
+                    else:
+                        total += sub
+                elif obj_type == _VREG:
+                    total += alloc_size
+        except OSError:
+            continue  # unreadable, or a batch failed: keep what was counted
+    return total
+
+
+def bulk_size_and_atime(start_path: str) -> tuple | None:
+    """(allocated bytes, oldest file atime) under start_path via getattrlistbulk(2).
+
+    One walk answers both "how big" and "how long unused" for a tree, with
+    name, type, size and atime arriving in the same batches. Symlinks are
+    neither followed nor counted; the atime is None when no regular file was
+    found. Returns None when the call isn't available so callers can fall
+    back to os.scandir.
+    """
+    if _GETATTRLISTBULK is None:
+        return None
+    buf = ctypes.create_string_buffer(_BULK_BUFFER_SIZE)
+    total = 0
+    oldest = None
+    stack = [start_path]
+    while stack:
+        current = stack.pop()
+        try:
+            for name, obj_type, alloc_size, atime, _mtime in _scandir_bulk(current, _BULK_SIZE_ATIME_ATTRS, buf):
+                if obj_type == _VDIR:
+                    stack.append(os.path.join(current, os.fsdecode(name)))
+                elif obj_type == _VREG:
+                    total += alloc_size
+                    if oldest is None or atime < oldest:
+                        oldest = atime
+        except OSError:
+            continue  # unreadable, or a batch failed: keep what was counted
+    return total, oldest
+
+
+def bulk_list_times(path: str) -> list | None:
+    """[(name, atime, mtime)] for path's direct entries via getattrlistbulk(2).
+
+    One syscall returns a whole batch of names and timestamps, so a caller
+    that needs every child's times doesn't stat each entry. Symlinks report
+    their own times (no following), like DirEntry.stat(follow_symlinks=False).
+    Returns None when the call isn't available or fails part way, so callers
+    can fall back to os.scandir.
+    """
+    if _GETATTRLISTBULK is None:
+        return None
+    buf = ctypes.create_string_buffer(_BULK_BUFFER_SIZE)
+    try:
+        return [(os.fsdecode(name), atime, mtime)
+                for name, _type, _size, atime, mtime in _scandir_bulk(path, _BULK_TIME_ATTRS, buf)]
+    except OSError:
+        return None
+
+
+def du_size(path: str, timeout: int = 60) -> int:
+    """Size a tree with `du -sk`, returning 0 if du fails."""
+    try:
+        result = subprocess.run(["du", "-sk", path], capture_output=True, text=True, timeout=timeout)
+        return int(result.stdout.split()[0]) * 1024
+    except (OSError, subprocess.SubprocessError, ValueError, IndexError):
+        return 0
+
+
+def du_sizes(paths: list, timeout: int = 120) -> dict:
+    """Size many trees with a single `du -sk p1 p2 ...` call.
+
+    du prints one "<kb>\t<path>" line per argument and keeps going past
+    unreadable paths, so its exit status is ignored. Output is decoded like
+    os.fsdecode, so non-UTF-8 paths come back as the keys they were passed as.
+    """
+    sizes = {}
+    if not paths:
+        return sizes
+    try:
+        result = subprocess.run(["du", "-sk", *paths], stdout=subprocess.PIPE,
+                                stderr=subprocess.DEVNULL, text=True, errors="surrogateescape",
+                                timeout=timeout)
+    except (OSError, subprocess.SubprocessError):
+        return sizes
+    for line in result.stdout.splitlines():
+        kb, _, path = line.partition("\t")
+        if path and kb.isdigit():
+            sizes[path] = int(kb) * 1024
+    return sizes
+
+
+def fast_dir_sizes(paths: list) -> dict:
+    """Size several directories in-process; trees too big for the walker share one `du` call."""
+    sizes = {}
+    oversized = []
+    for path in paths:
+        size = scandir_size(path, max_entries=DU_FALLBACK_ENTRIES)
+        if size is None:
+            oversized.append(path)
+        else:
+            sizes[path] = size
+    fallback = du_sizes(oversized)
+    for path in oversized:
+        sizes[path] = fallback.get(path, 0)
+    return sizes
+
+
+def fast_dir_size(path: str) -> int:
+    """Size a directory in-process, bailing to `du` for trees with very many entries."""
+    size = scandir_size(path, max_entries=DU_FALLBACK_ENTRIES)
+    if size is None:
+        return du_size(path)
+    return size
+
+
+@functools.lru_cache(maxsize=4096)
+def _format_epoch_second(second: int) -> str:
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(second))
+
+
+def format_timestamp(ts: float) -> str:
+    """Format an epoch timestamp the way item events report dates.
+
+    Goes through time.localtime/strftime (no datetime object per call) and
+    memoizes per whole second, since sibling entries often share a timestamp.
+    """
+    try:
+        return _format_epoch_second(int(ts))
+    except (OverflowError, OSError, ValueError):
+        return "Unknown"
+
+
+def format_size(size_bytes: int, precision: int = 2) -> str:
+    """Human-readable size using integer bit-length instead of log/pow."""
+    if size_bytes <= 0:
+        return "0 B"
+    i = min((int(size_bytes).bit_length() - 1) // 10, len(SIZE_UNITS) - 1)
+    return f"{round(size_bytes / (1 << (10 * i)), precision)} {SIZE_UNITS[i]}"
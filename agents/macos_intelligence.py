@@ -1,21 +1,41 @@
 import os
+import sys
 import json
 import subprocess
 import plistlib
-from datetime import datetime
+import re
+from datetime import datetime, timezone
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
-HOME = os.path.expanduser("~")
+from fs_utils import fast_dir_size, fast_dir_sizes, format_size as _format_size
+
+try:
+    import orjson  # C encoder; optional
+except ImportError:
+    orjson = None
+
+try:
+    # CoreFoundation's plist parser via pyobjc; optional, plistlib is the fallback
+    from Foundation import NSData, NSPropertyListSerialization
+except ImportError:
+    NSPropertyListSerialization = None
+
+HOME = os.path.realpath(os.path.expanduser("~"))
+
+# Docker sizes look like "1.2GB", "512kB" or "1.2GB (50%)" for reclaimable
+_DOCKER_SIZE_RE = re.compile(r'([\d.]+)\s*([KMGTP]?)B', re.IGNORECASE)
+_DOCKER_UNIT_BYTES = {"": 1, "K": 1024, "M": 1024**2, "G": 1024**3, "T": 1024**4, "P": 1024**5}
+
+def parse_docker_size(size_str: str) -> int:
+    match = _DOCKER_SIZE_RE.search(size_str or "")
+    if not match:
+        return 0
+    return int(float(match.group(1)) * _DOCKER_UNIT_BYTES[match.group(2).upper()])
 
 def format_size(bytes_val: int) -> str:
-    if bytes_val == 0:
-        return "0 B"
-    sizes = ["B", "KB", "MB", "GB", "TB", "PB"]
-    i = 0
-    while bytes_val >= 1024 and i < len(sizes) - 1:
-        bytes_val /= 1024.0
-        i += 1
-    return f"{bytes_val:.1f} {sizes[i]}"
+    return _format_size(bytes_val, precision=1)
 
 def run_cmd(cmd: list) -> str:
     try:
@@ -36,50 +56,18 @@ def get_docker_data() -> dict:
     if not out:
         return None
 
-    # system df returns multiple JSON objects (one per line)
+    # system df returns one JSON object per line (Images, Containers, Local Volumes, Build Cache)
     total_bytes = 0
     reclaimable_bytes = 0
-    
-    try:
-        for line in out.splitlines():
-            if not line.strip():
-                continue
+    for line in out.splitlines():
+        if not line.strip():
+            continue
+        try:
             data = json.loads(line)
-            # Size often comes back as e.g. "1.2GB" or "0B". We parse roughly.
-            # However docker provides Size and Reclaimable
-            # Docker 20+ --format json produces standard JSON with Size, Reclaimable fields
-            # Actually, let's just use docker system df and parse it
-            pass
-    except Exception:
-        pass
-
-    # A simpler way is to just use `docker image prune -n` or something, but let's parse `docker system df` without formatting
-    out = run_cmd(["docker", "system", "df"])
-    if not out:
-        return None
-
-    def parse_docker_size(size_str: str) -> int:
-        size_str = size_str.replace(" ", "").upper()
-        if "GB" in size_str: return int(float(size_str.replace("GB", "")) * 1024**3)
-        if "MB" in size_str: return int(float(size_str.replace("MB", "")) * 1024**2)
-        if "KB" in size_str: return int(float(size_str.replace("KB", "")) * 1024)
-        if "B" in size_str: return int(float(size_str.replace("B", "")))
-        return 0
-
-    lines = out.splitlines()
-    for line in lines[1:]: # Skip header
-        parts = line.split()
-        if len(parts) >= 4: # TYPE TOTAL ACTIVE SIZE RECLAIMABLE
-            size_str = parts[-2]
-            if len(parts) == 6: # SIZE RECLAIMABLE has parenthesis like 1.2GB (50%)
-                size_str = parts[-3]
-            total_bytes += parse_docker_size(size_str)
-            # Reclaimable is parts[-2] or parts[-1]
-            try:
-                rec_str = parts[-2] if "%" in parts[-1] else parts[-1]
-                reclaimable_bytes += parse_docker_size(rec_str)
-            except Exception:
-                pass
+        except ValueError:
+            continue
+        total_bytes += parse_docker_size(data.get("Size"))
+        reclaimable_bytes += parse_docker_size(data.get("Reclaimable"))
 
     if total_bytes > 0:
         return {
@@ -101,33 +89,69 @@ def get_xcode_derived_data() -> list:
 
     items = []
     try:
-        for entry in os.scandir(derived_dir):
-            if entry.is_dir(follow_symlinks=False) and entry.name != "ModuleCache.noindex":
-                # Get size via du
-                out = run_cmd(["du", "-sk", entry.path])
-                if out:
-                    kb = int(out.split()[0])
-                    size_bytes = kb * 1024
-                    # Extract original project name from folder (e.g., MyApp-abcxyz)
-                    proj_name = entry.name.rsplit("-", 1)[0] if "-" in entry.name else entry.name
+        entries = [
+            entry for entry in os.scandir(derived_dir)
+            if entry.is_dir(follow_symlinks=False) and entry.name != "ModuleCache.noindex"
+        ]
+        sizes = fast_dir_sizes([entry.path for entry in entries])
+        for entry in entries:
+            size_bytes = sizes[entry.path]
+            if size_bytes:
+                # Extract original project name from folder (e.g., MyApp-abcxyz)
+                proj_name = entry.name.rsplit("-", 1)[0] if "-" in entry.name else entry.name
                     
-                    st = entry.stat()
-                    days_stale = (time.time() - st.st_mtime) / 86400
+                st = entry.stat()
+                days_stale = (time.time() - st.st_mtime) / 86400
                     
-                    items.append({
-                        "name": proj_name,
-                        "path": entry.path,
-                        "size": size_bytes,
-                        "days_stale": int(days_stale),
-                        "type": "xcode_derived",
-                        "description": "Xcode Build Artifacts",
-                        "risk": "safe" if days_stale > 30 else "caution",
-                    })
+                items.append({
+                    "name": proj_name,
+                    "path": entry.path,
+                    "size": size_bytes,
+                    "days_stale": int(days_stale),
+                    "type": "xcode_derived",
+                    "description": "Xcode Build Artifacts",
+                    "risk": "safe" if days_stale > 30 else "caution",
+                })
     except Exception:
         pass
     
     return items
 
+def read_backup_info(plist_path: str) -> tuple:
+    """Returns (device_name, last_backup "YYYY-MM-DD") from a backup's Info.plist.
+
+    Both parsers' dates become an epoch timestamp first, so the day is in
+    local time whether or not pyobjc is installed.
+    """
+    device_name = "Unknown Device"
+    last_backup = "Unknown Date"
+    last_backup_ts = None
+    try:
+        if NSPropertyListSerialization is not None:
+            data = NSData.dataWithContentsOfFile_(plist_path)
+            pl, _, _ = NSPropertyListSerialization.propertyListWithData_options_format_error_(data, 0, None, None)
+            if pl is None:
+                return device_name, last_backup
+            device_name = str(pl.get("Device Name", device_name))
+            last_backup_date = pl.get("Last Backup Date")
+            if last_backup_date is not None:
+                last_backup_ts = last_backup_date.timeIntervalSince1970()
+        else:
+            with open(plist_path, "rb") as f:
+                pl = plistlib.load(f)
+            device_name = pl.get("Device Name", device_name)
+            last_backup_date = pl.get("Last Backup Date")
+            if last_backup_date:
+                # plistlib hands back naive datetimes in UTC
+                if last_backup_date.tzinfo is None:
+                    last_backup_date = last_backup_date.replace(tzinfo=timezone.utc)
+                last_backup_ts = last_backup_date.timestamp()
+        if last_backup_ts is not None:
+            last_backup = datetime.fromtimestamp(last_backup_ts).strftime("%Y-%m-%d")
+    except Exception:
+        pass
+    return device_name, last_backup
+
 def get_ios_backups() -> list:
     """Finds local iOS device backups."""
     backup_dir = os.path.join(HOME, "Library", "Application Support", "MobileSync", "Backup")
@@ -136,41 +160,31 @@ def get_ios_backups() -> list:
 
     items = []
     try:
-        for entry in os.scandir(backup_dir):
-            if entry.is_dir(follow_symlinks=False):
-                # Check for Info.plist
-                plist_path = os.path.join(entry.path, "Info.plist")
-                device_name = "Unknown Device"
-                last_backup = "Unknown Date"
-                if os.path.exists(plist_path):
-                    try:
-                        with open(plist_path, "rb") as f:
-                            pl = plistlib.load(f)
-                            device_name = pl.get("Device Name", "Unknown Device")
-                            last_backup_date = pl.get("Last Backup Date")
-                            if last_backup_date:
-                                last_backup = last_backup_date.strftime("%Y-%m-%d")
-                    except Exception:
-                        pass
+        entries = [entry for entry in os.scandir(backup_dir) if entry.is_dir(follow_symlinks=False)]
+        sizes = fast_dir_sizes([entry.path for entry in entries])
+        for entry in entries:
+            # Check for Info.plist
+            plist_path = os.path.join(entry.path, "Info.plist")
+            device_name = "Unknown Device"
+            last_backup = "Unknown Date"
+            if os.path.exists(plist_path):
+                device_name, last_backup = read_backup_info(plist_path)
                 
-                out = run_cmd(["du", "-sk", entry.path])
-                if out:
-                    kb = int(out.split()[0])
-                    size_bytes = kb * 1024
-                    
-                    st = entry.stat()
-                    days_stale = (time.time() - st.st_mtime) / 86400
+            size_bytes = sizes[entry.path]
+            if size_bytes:
+                st = entry.stat()
+                days_stale = (time.time() - st.st_mtime) / 86400
                     
-                    items.append({
-                        "name": f"iOS Backup: {device_name}",
-                        "path": entry.path,
-                        "size": size_bytes,
-                        "days_stale": int(days_stale),
-                        "last_backup": last_backup,
-                        "type": "ios_backup",
-                        "description": f"Device backup from {last_backup}",
-                        "risk": "safe" if days_stale > 180 else "caution", # Safe to delete if > 6 months old
-                    })
+                items.append({
+                    "name": f"iOS Backup: {device_name}",
+                    "path": entry.path,
+                    "size": size_bytes,
+                    "days_stale": int(days_stale),
+                    "last_backup": last_backup,
+                    "type": "ios_backup",
+                    "description": f"Device backup from {last_backup}",
+                    "risk": "safe" if days_stale > 180 else "caution", # Safe to delete if > 6 months old
+                })
     except Exception:
         pass
         
@@ -190,34 +204,37 @@ def get_mail_attachments() -> dict:
     
     # Check mail downloads
     if os.path.exists(mail_dl):
-        try:
-            out = run_cmd(["du", "-sk", mail_dl])
-            if out:
-                total_size += int(out.split()[0]) * 1024
-                paths.append(mail_dl)
-        except Exception:
-            pass
+        size_bytes = fast_dir_size(mail_dl)
+        if size_bytes:
+            total_size += size_bytes
+            paths.append(mail_dl)
             
-    # Check V* folders
+    # Check V* folders breadth-first for Attachments folders
     try:
-        for entry in os.scandir(mail_dir):
-            if entry.is_dir() and entry.name.startswith("V"):
-                v_dir = entry.path
-                # Search for Attachments folders
-                try:
-                    for root, dirs, _ in os.walk(v_dir):
-                        if "Attachments" in dirs:
-                            att_path = os.path.join(root, "Attachments")
-                            out = run_cmd(["du", "-sk", att_path])
-                            if out:
-                                total_size += int(out.split()[0]) * 1024
-                                paths.append(att_path)
-                            # Don't descend into Attachments
-                            dirs.remove("Attachments")
-                except Exception:
-                    pass
-    except Exception:
-        pass
+        queue = deque(
+            entry.path for entry in os.scandir(mail_dir)
+            if entry.is_dir() and entry.name.startswith("V")
+        )
+    except OSError:
+        queue = deque()
+
+    while queue:
+        current = queue.popleft()
+        try:
+            with os.scandir(current) as it:
+                for entry in it:
+                    if not entry.is_dir(follow_symlinks=False):
+                        continue
+                    if entry.name == "Attachments":
+                        # Size it whole; don't descend into Attachments
+                        size_bytes = fast_dir_size(entry.path)
+                        if size_bytes:
+                            total_size += size_bytes
+                            paths.append(entry.path)
+                    else:
+                        queue.append(entry.path)
+        except OSError:
+            pass
         
     if total_size > 50 * 1024 * 1024: # > 50MB
         return {
@@ -258,20 +275,26 @@ def get_stale_downloads() -> list:
         return []
         
     items = []
+    now = time.time()
+    min_age = 30 * 86400  # > 30 days old
+    min_size = 50 * 1024 * 1024  # > 50 MB
     try:
-        for entry in os.scandir(downloads_dir):
-            if entry.is_file(follow_symlinks=False):
-                st = entry.stat()
-                days_stale = (time.time() - max(st.st_atime, st.st_mtime)) / 86400
-                if days_stale > 30 and st.st_size > 50 * 1024 * 1024: # > 30 days old and > 50 MB
+        with os.scandir(downloads_dir) as it:
+            for entry in it:
+                if not entry.is_file(follow_symlinks=False):
+                    continue
+                st = entry.stat(follow_symlinks=False)
+                age = now - max(st.st_atime, st.st_mtime)
+                if age > min_age and st.st_size > min_size:
+                    days_stale = int(age / 86400)
                     items.append({
                         "name": entry.name,
                         "path": entry.path,
                         "size": st.st_size,
-                        "days_stale": int(days_stale),
+                        "days_stale": days_stale,
                         "type": "stale_download",
-                        "description": f"Downloaded {int(days_stale)} days ago",
-                        "risk": "safe" if days_stale > 90 else "caution",
+                        "description": f"Downloaded {days_stale} days ago",
+                        "risk": "safe" if age > 90 * 86400 else "caution",
                     })
     except Exception:
         pass
@@ -280,23 +303,27 @@ def get_stale_downloads() -> list:
     items.sort(key=lambda x: x["size"], reverse=True)
     return items
 
+INSTALLER_MIN_BYTES = 100 * 1024 * 1024
+
 def get_forgotten_installers() -> list:
     """Uses Spotlight to find large DMG, PKG, and ISO files that are old."""
     items = []
-    # mdfind is efficient because it uses the spotlight index
-    out = run_cmd(["mdfind", "kMDItemFSName == '*.dmg' || kMDItemFSName == '*.pkg' || kMDItemFSName == '*.iso'"])
+    # mdfind is efficient because it uses the spotlight index; scoping it to
+    # the user directory and filtering on the indexed size keeps results small
+    out = run_cmd([
+        "mdfind", "-onlyin", HOME,
+        f"(kMDItemFSName == '*.dmg'cd || kMDItemFSName == '*.pkg'cd || kMDItemFSName == '*.iso'cd) && kMDItemFSSize > {INSTALLER_MIN_BYTES}",
+    ])
     if not out:
         return []
         
     for path in out.splitlines():
-        if not path.startswith(HOME): # Only look in user directory
-            continue
         try:
             st = os.stat(path, follow_symlinks=False)
             days_stale = (time.time() - max(st.st_atime, st.st_mtime)) / 86400
             
             # If it's larger than 100MB and older than 14 days
-            if st.st_size > 100 * 1024 * 1024 and days_stale > 14:
+            if st.st_size > INSTALLER_MIN_BYTES and days_stale > 14:
                 # Make sure it's not currently mounted (rough check)
                 if not os.path.ismount(path):
                     items.append({
@@ -315,17 +342,28 @@ def get_forgotten_installers() -> list:
     return items
 
 def gather_macos_intelligence() -> dict:
-    """Gathers all macOS-specific storage intelligence."""
-    insights = {
-        "xcode": get_xcode_derived_data(),
-        "ios_backups": get_ios_backups(),
-        "docker": get_docker_data(),
-        "mail": get_mail_attachments(),
-        "snapshots": get_time_machine_snapshots(),
-        "stale_downloads": get_stale_downloads(),
-        "forgotten_installers": get_forgotten_installers(),
+    """Gathers all macOS-specific storage intelligence.
+
+    Collectors are independent and spend their time waiting on subprocesses
+    (docker, tmutil, mdfind) or disk, so they run concurrently.
+    """
+    collectors = {
+        "xcode": get_xcode_derived_data,
+        "ios_backups": get_ios_backups,
+        "docker": get_docker_data,
+        "mail": get_mail_attachments,
+        "snapshots": get_time_machine_snapshots,
+        "stale_downloads": get_stale_downloads,
+        "forgotten_installers": get_forgotten_installers,
     }
+    with ThreadPoolExecutor(max_workers=len(collectors)) as executor:
+        futures = {key: executor.submit(fn) for key, fn in collectors.items()}
+        insights = {key: future.result() for key, future in futures.items()}
     return insights
 
 if __name__ == "__main__":
-    print(json.dumps(gather_macos_intelligence(), indent=2))
+    insights = gather_macos_intelligence()
+    if orjson is not None:
+        sys.stdout.buffer.write(orjson.dumps(insights, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE))
+    else:
+        print(json.dumps(insights, indent=2))
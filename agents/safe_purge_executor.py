@@ -1,20 +1,19 @@
 import os
 import sys
 import json
-import shutil
+import stat
+from concurrent.futures import ThreadPoolExecutor
 
-def generate_cleanup_script(target_paths):
-    """
-    Safely deletes specified target paths.
-    Applies strict validation to ensure we NEVER delete system roots, user documents,
-    or anything outside of known cleanable locations.
-    """
-    
-    user_home = os.path.expanduser('~')
+from fs_utils import physical_size
+
+# Resolved once at import: the purge loop compares realpaths against these,
+# so neither the home lookup nor any zone realpath is repeated per target.
+USER_HOME = os.path.realpath(os.path.expanduser('~'))
 
-    # Safe zones: all ~/Library subdirectories that contain caches/junk, plus common
-    # cleanable locations. This must cover every path the storage scanner can find.
-    safe_zones = [
+def _build_safe_zones(user_home):
+    """Safe zones: all ~/Library subdirectories that contain caches/junk, plus common
+    cleanable locations. This must cover every path the storage scanner can find."""
+    return [
         # Library caches and junk
         os.path.join(user_home, "Library", "Caches"),
         os.path.join(user_home, "Library", "Logs"),
@@ -49,35 +48,97 @@ def generate_cleanup_script(target_paths):
         os.path.join(user_home, "Library", "Developer", "CoreSimulator"),
     ]
 
-    # Also allow node_modules, .venv, build dirs, __pycache__ ANYWHERE under home
-    # These are always safe to delete (they can be regenerated)
-    ALWAYS_SAFE_BASENAMES = {
-        "node_modules", ".venv", "venv", "__pycache__", ".next", ".nuxt",
-        ".cache", ".tox", ".gradle", "Pods", "DerivedData", ".dart_tool",
-        "coverage", ".parcel-cache", ".turbo",
-    }
-    
-    # Directories that should NEVER be deleted
-    FORBIDDEN_PATHS = {
-        user_home,
-        os.path.join(user_home, "Desktop"),
-        os.path.join(user_home, "Documents"),
-        os.path.join(user_home, "Downloads"),
-        os.path.join(user_home, "Pictures"),
-        os.path.join(user_home, "Music"),
-        os.path.join(user_home, "Movies"),
-        os.path.join(user_home, "Library"),
-        "/",
-        "/System",
-        "/Applications",
-        "/Users",
-        "/var",
-        "/private",
-        "/usr",
-        "/bin",
-        "/sbin",
-        "/tmp",
-    }
+# (zone, zone + sep) pairs, longest first so nested zones (e.g. Caches/Homebrew)
+# match before their parents
+REAL_SAFE_ZONES = tuple(sorted(
+    {(real_zone, real_zone + os.sep) for real_zone in map(os.path.realpath, _build_safe_zones(USER_HOME))},
+    key=lambda z: len(z[0]), reverse=True,
+))
+
+# Also allow node_modules, .venv, build dirs, __pycache__ ANYWHERE under home
+# These are always safe to delete (they can be regenerated)
+ALWAYS_SAFE_BASENAMES = {
+    "node_modules", ".venv", "venv", "__pycache__", ".next", ".nuxt",
+    ".cache", ".tox", ".gradle", "Pods", "DerivedData", ".dart_tool",
+    "coverage", ".parcel-cache", ".turbo",
+}
+
+# Directories that should NEVER be deleted
+FORBIDDEN_PATHS = {
+    USER_HOME,
+    os.path.join(USER_HOME, "Desktop"),
+    os.path.join(USER_HOME, "Documents"),
+    os.path.join(USER_HOME, "Downloads"),
+    os.path.join(USER_HOME, "Pictures"),
+    os.path.join(USER_HOME, "Music"),
+    os.path.join(USER_HOME, "Movies"),
+    os.path.join(USER_HOME, "Library"),
+    "/",
+    "/System",
+    "/Applications",
+    "/Users",
+    "/var",
+    "/private",
+    "/usr",
+    "/bin",
+    "/sbin",
+    "/tmp",
+}
+# /tmp, /var etc. are symlinks into /private on macOS; forbid both spellings
+FORBIDDEN_PATHS |= {os.path.realpath(p) for p in FORBIDDEN_PATHS}
+
+def _remove_tree(path):
+    """Delete a directory tree in one bottom-up pass, returning the bytes freed.
+
+    os.fwalk hands us a descriptor for each directory, and every lstat, unlink
+    and rmdir is relative to it, so a directory swapped for a symlink mid-purge
+    can't redirect deletion outside the tree. Freed bytes are allocated blocks,
+    matching what the scanners report. Like rmtree(ignore_errors=True), entries
+    that can't be removed are skipped.
+    """
+    freed = 0
+    for _root, dirs, files, root_fd in os.fwalk(path, topdown=False):
+        # Symlinked dirs are listed in dirs but never descended into
+        for name in files + dirs:
+            try:
+                st = os.lstat(name, dir_fd=root_fd)
+                if stat.S_ISDIR(st.st_mode):
+                    os.rmdir(name, dir_fd=root_fd)
+                else:
+                    os.unlink(name, dir_fd=root_fd)
+                    if not stat.S_ISLNK(st.st_mode):
+                        freed += physical_size(st)
+            except OSError:
+                pass
+    try:
+        os.rmdir(path)
+    except OSError:
+        pass
+    return freed
+
+def _delete_one(path):
+    """Delete one validated target. Returns (path, bytes_freed, ok)."""
+    try:
+        if os.path.isdir(path):
+            size = _remove_tree(path)
+        else:
+            size = 0
+            try:
+                size = physical_size(os.lstat(path))
+            except (OSError, FileNotFoundError):
+                pass
+            os.remove(path)
+        return path, size, True
+    except Exception as e:
+        print(f"Error deleting {path}: {e}", file=sys.stderr)
+        return path, 0, False
+
+def generate_cleanup_script(target_paths):
+    """
+    Safely deletes specified target paths.
+    Applies strict validation to ensure we NEVER delete system roots, user documents,
+    or anything outside of known cleanable locations.
+    """
     
     validated_paths = []
     
@@ -93,21 +154,16 @@ def generate_cleanup_script(target_paths):
             
         # Check if the basename is always-safe (node_modules, .venv, etc.)
         basename = os.path.basename(real_path)
-        if basename in ALWAYS_SAFE_BASENAMES and real_path.startswith(user_home):
+        if basename in ALWAYS_SAFE_BASENAMES and real_path.startswith(USER_HOME + os.sep):
             validated_paths.append(real_path)
             continue
         
-        # Check if it's inside a known safe zone
-        is_safe = False
-        for zone in safe_zones:
-            real_zone = os.path.realpath(zone)
-            if real_path.startswith(real_zone + os.sep) and len(real_path) > len(real_zone):
-                is_safe = True
-                break
-            # Also allow deleting the zone directory itself (e.g., the entire Caches dir)
-            if real_path == real_zone:
-                is_safe = True
-                break
+        # Check if it's inside a known safe zone (or is the zone directory itself,
+        # e.g. the entire Caches dir)
+        is_safe = any(
+            real_path == zone or real_path.startswith(zone_prefix)
+            for zone, zone_prefix in REAL_SAFE_ZONES
+        )
                 
         if is_safe:
             validated_paths.append(real_path)
@@ -115,38 +171,32 @@ def generate_cleanup_script(target_paths):
     if not validated_paths:
         return {"status": "error", "message": "No valid or safe paths provided for deletion."}
         
+    # Targets nested inside another target are removed along with it; dropping
+    # them keeps parallel workers from racing on the same subtree.
+    # Sorting by components (not raw strings) keeps every descendant directly
+    # after its ancestor; "foo-bar" and "foo.bak" would otherwise sort between
+    # "foo" and "foo/sub".
+    top_level = []
+    nested = {}
+    for path in sorted(set(validated_paths), key=lambda p: p.split(os.sep)):
+        if top_level and path.startswith(top_level[-1] + os.sep):
+            nested.setdefault(top_level[-1], []).append(path)
+            continue
+        top_level.append(path)
+
     deleted_count = 0
     freed_bytes = 0
     deleted_paths = []
     
-    for path in validated_paths:
-        try:
-            # Get size before deletion
-            size = 0
-            if os.path.isdir(path):
-                try:
-                    for dp, _, fnames in os.walk(path):
-                        for f in fnames:
-                            fp = os.path.join(dp, f)
-                            try:
-                                if os.path.exists(fp) and not os.path.islink(fp):
-                                    size += os.path.getsize(fp)
-                            except (OSError, FileNotFoundError):
-                                pass
-                except (OSError, PermissionError):
-                    pass
-                shutil.rmtree(path, ignore_errors=True)
-            else:
-                try:
-                    size = os.path.getsize(path)
-                except (OSError, FileNotFoundError):
-                    pass
-                os.remove(path)
-            deleted_count += 1
-            freed_bytes += size
-            deleted_paths.append(path)
-        except Exception as e:
-            print(f"Error deleting {path}: {e}", file=sys.stderr)
+    # unlink/rmdir release the GIL, so independent trees delete concurrently
+    with ThreadPoolExecutor(max_workers=min(os.cpu_count() or 4, len(top_level))) as executor:
+        for path, size, ok in executor.map(_delete_one, top_level):
+            if ok:
+                # Nested targets went with their ancestor; report them as deleted too
+                covered = [path] + nested.get(path, [])
+                deleted_count += len(covered)
+                freed_bytes += size
+                deleted_paths.extend(covered)
     
     return {
         "status": "success",
@@ -27,20 +27,51 @@ Error Handling Contract:
   Any other OSError→ log full exception, skip item, continue
 """
 import argparse
+import atexit
+import base64
+import io
 import macos_intelligence
+from fs_utils import (DU_FALLBACK_ENTRIES, STAT_BLOCK_SIZE, bulk_attr_size, bulk_list_times, du_size,
+                      ensure_cache_dir, format_timestamp, physical_size, format_size as _format_size)
+import functools
+import hashlib
+import heapq
+import hmac
+import itertools
 import json
-import math
 import os
+import queue
+import re
 import shutil
+import stat
 import subprocess
 import sys
 import time
 import sqlite3
-from collections import defaultdict
+from collections import defaultdict, deque
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from datetime import datetime
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from json.encoder import encode_basestring_ascii as _encode_json_ascii
+from operator import itemgetter
 from pathlib import Path
-from threading import Lock
+from threading import Event, Lock, Thread
+
+try:
+    import orjson  # C encoder; optional
+except ImportError:
+    orjson = None
+
+try:
+    from cryptography.hazmat.primitives import serialization  # Ed25519 attestation; optional
+    from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+except ImportError:
+    Ed25519PrivateKey = serialization = None
+
+try:
+    import xxhash  # fast non-cryptographic hash for recommendation ids; optional
+except ImportError:
+    xxhash = None
 
 # ─── Configuration ───────────────────────────────────────────────────────────
 
@@ -51,16 +82,77 @@ EMIT_INTERVAL = 0.2        # seconds between progress events (was 0.1 — too ch
 MIN_ITEM_SIZE = 1024       # 1 KB minimum to report
 DISK_WARN_THRESHOLD = 1 * 1024 * 1024 * 1024  # 1 GB
 DISK_CHECK_INTERVAL = 100  # check every N items
+EVENT_SCHEMA_VERSION = 2   # 2: canonical keys only (dir/files/bytes/rate_mbps, no item aliases)
+RATE_WINDOW = 20           # progress samples averaged for rate_mbps
+PROGRESS_TICK_MASK = 63    # plain directory ticks only read the clock every 64 calls
+# Size trees with getattrlistbulk(2) batches instead of scandir + stat where the
+# call exists (macOS); MAC_OPTIMIZER_BULK_ATTRS=0 forces the scandir walker
+USE_BULK_ATTRS = os.environ.get("MAC_OPTIMIZER_BULK_ATTRS", "1") != "0"
+# Fan a large tree's top-level subdirectories out to a walker pool. Off by
+# default on macOS, where APFS serializes concurrent readdir on one volume and
+# the extra threads only contend; MAC_OPTIMIZER_PARALLEL_WALK=1/0 overrides
+PARALLEL_WALK = os.environ.get("MAC_OPTIMIZER_PARALLEL_WALK",
+                               "0" if sys.platform == "darwin" else "1") != "0"
+PARALLEL_WALK_MIN_SUBDIRS = 8  # below this the root's subtrees are walked inline
+DU_TIMEOUT = 120  # seconds for a `du -sk` handed a tree too big for the scandir walker
+# Entries walked when sizing a full-map leaf before reporting it as estimated
+SIZE_ESTIMATE_MAX_ENTRIES = 250_000
 
 # ─── Buffered Emit ──────────────────────────────────────────────────────────
 # Instead of flushing stdout for every single item (which blocks Python and
 # hammers the Electron readline parser), we buffer item events and flush them
 # in batches.  Progress/found/complete/error events still flush immediately.
-
-_emit_lock = Lock()
-_item_buffer: list = []
-_last_item_flush: float = 0.0
+# emit() encodes the event and queues the bytes; one writer thread groups
+# items into batch lines and does the stdout writes, so scanner threads never
+# wait on the pipe.  Batches go to a 64 KB BufferedWriter over the raw stdout
+# buffer and only reach the pipe when a non-item event flushes it (or at exit).
+
+_emit_queue: queue.SimpleQueue = queue.SimpleQueue()
+_EMIT_STOP = object()        # queued at exit: drain, flush, stop the writer
+_pipe_closed = Event()       # set by the writer when the parent has gone away
+_writer_failed = Event()     # set by the writer when it died on anything else
+_writer_error: BaseException | None = None
 _ITEM_FLUSH_INTERVAL = 0.15  # flush buffered items every 150ms
+_ITEM_BATCH_MAX = 64         # ...or as soon as this many are waiting
+_out = io.BufferedWriter(sys.stdout.buffer, buffer_size=65536)
+
+
+# Compact separators so the stdlib fallback writes the same shape orjson does
+_json_encoder = json.JSONEncoder(separators=(",", ":"))
+
+
+def _encode_line(event_dict: dict) -> bytes:
+    """Serialize one NDJSON line straight to bytes (orjson when available).
+
+    Paths that aren't valid UTF-8 arrive as surrogate-escaped str, which
+    orjson refuses; those events go through json, which writes the escapes.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(event_dict, option=orjson.OPT_APPEND_NEWLINE)
+        except orjson.JSONEncodeError:
+            pass
+    return (_json_encoder.encode(event_dict) + "\n").encode()
+
+
+def _dumps(obj) -> str:
+    """Serialize a payload for the cache DB's JSON columns (orjson when available).
+
+    Falls back to json for the same surrogate-escaped paths as _encode_line.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+        except orjson.JSONEncodeError:
+            pass
+    return json.dumps(obj)
+
+
+def _loads(text: str):
+    """Parse a cache DB JSON column written by _dumps (or older json.dumps)."""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
 
 # ─── Extension Allowlist (file-type targeting) ───────────────────────────────
 
@@ -80,6 +172,9 @@ EXTENSION_ALLOWLIST = {
 }
 ALL_ALLOWED_EXTENSIONS = set().union(*EXTENSION_ALLOWLIST.values())
 
+ENTROPY_BINARY_THRESHOLD = 0.30  # non-text byte ratio above which a sample is binary
+_TEXT_BYTES = bytes(range(32, 127)) + b"\t\n\r"  # printable + tab/nl/cr
+
 
 def is_binary_heuristic(path: str, sample_size: int = 8192) -> bool:
     """Check if file is binary by sampling first bytes for non-printable ratio."""
@@ -88,9 +183,9 @@ def is_binary_heuristic(path: str, sample_size: int = 8192) -> bool:
             chunk = f.read(sample_size)
         if not chunk:
             return False
-        # Count non-text bytes (excluding common whitespace)
-        text_chars = set(range(32, 127)) | {9, 10, 13}  # printable + tab/nl/cr
-        non_text = sum(1 for b in chunk if b not in text_chars)
+        # Count non-text bytes: translate() deletes every text byte in C,
+        # leaving only the non-printables behind
+        non_text = len(chunk.translate(None, _TEXT_BYTES))
         return (non_text / len(chunk)) > ENTROPY_BINARY_THRESHOLD
     except (OSError, PermissionError):
         return True  # Can't read = treat as binary
@@ -109,6 +204,67 @@ def check_disk_space() -> dict:
         return {"free_bytes": -1, "total_bytes": -1, "low": False}
 
 
+# External commands each scan needs once; started early so their fork/exec
+# and I/O overlap the directory walking instead of adding to it.
+SYSTEM_COMMANDS = {
+    "tmutil_snapshots": ["tmutil", "listlocalsnapshots", "/"],
+    "diskutil_info": ["diskutil", "info", "/"],
+}
+SYSTEM_COMMAND_TIMEOUT = 10
+_pending_commands: dict = {}
+
+
+def prefetch_system_commands():
+    """Start every SYSTEM_COMMANDS entry in the background and forget earlier results."""
+    _tmutil_snapshots.cache_clear()
+    _diskutil_info.cache_clear()
+    for key, argv in SYSTEM_COMMANDS.items():
+        stale = _pending_commands.pop(key, None)
+        if stale is not None:
+            stale.kill()
+            stale.communicate()
+        try:
+            _pending_commands[key] = subprocess.Popen(
+                argv, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True
+            )
+        except OSError:
+            pass  # command not available on this system
+
+
+def _command_output(key: str) -> str | None:
+    """Collect a prefetched command's stdout (or run it now); None on failure."""
+    proc = _pending_commands.pop(key, None)
+    if proc is None:
+        try:
+            proc = subprocess.Popen(
+                SYSTEM_COMMANDS[key], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True
+            )
+        except OSError:
+            return None
+    try:
+        out, _ = proc.communicate(timeout=SYSTEM_COMMAND_TIMEOUT)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.communicate()
+        return None
+    return out if proc.returncode == 0 else None
+
+
+@functools.lru_cache(maxsize=None)
+def _tmutil_snapshots() -> tuple:
+    """Local Time Machine snapshot names on the boot volume, one per line of tmutil output."""
+    out = _command_output("tmutil_snapshots")
+    if not out:
+        return ()
+    return tuple(l.strip() for l in out.strip().split("\n") if l.strip())
+
+
+@functools.lru_cache(maxsize=None)
+def _diskutil_info() -> str:
+    """`diskutil info /` output ("" when unavailable)."""
+    return _command_output("diskutil_info") or ""
+
+
 def resolve_symlink_safe(path: str, seen: set = None) -> str | None:
     """Resolve symlink, return None if circular."""
     if seen is None:
@@ -144,104 +300,169 @@ CRITICAL_PATTERNS = [
 ]
 
 
-def classify_risk(path: str) -> str:
-    """Classify deletion risk based on path patterns."""
-    for pattern in CRITICAL_PATTERNS:
-        if pattern in path:
-            return "critical"
-    for pattern in CAUTION_PATTERNS:
-        if pattern in path:
-            return "caution"
-    for pattern in SAFE_PATTERNS:
-        if pattern in path:
-            return "safe"
+def _compile_tier(patterns: list) -> tuple:
+    """Split a tier into single-segment names and a regex for the rest.
+
+    A pattern "/X/" occurs in a path exactly when X is one of the path's
+    interior segments (split("/")[1:-1]), so those become a frozenset and cost
+    one hash lookup per segment.  Multi-segment patterns such as
+    "/target/debug/" keep a precompiled alternation.
+    """
+    segments = frozenset(p.strip("/") for p in patterns if p.count("/") == 2)
+    multi = [p for p in patterns if p.count("/") > 2]
+    return segments, re.compile("|".join(map(re.escape, multi))) if multi else None
+
+
+_RISK_TIERS = (
+    ("critical", *_compile_tier(CRITICAL_PATTERNS)),
+    ("caution", *_compile_tier(CAUTION_PATTERNS)),
+    ("safe", *_compile_tier(SAFE_PATTERNS)),
+)
+
+
+@functools.lru_cache(maxsize=2048)
+def _classify_dir(dir_prefix: str) -> str:
+    """Risk tier for everything directly inside dir_prefix (ends with "/")."""
+    segments = dir_prefix.split("/")[1:-1]
+    for risk, tier_segments, tier_re in _RISK_TIERS:
+        if not tier_segments.isdisjoint(segments):
+            return risk
+        if tier_re is not None and tier_re.search(dir_prefix):
+            return risk
     # Default: caution for unknown
     return "caution"
 
 
+def classify_risk(path: str) -> str:
+    """Classify deletion risk based on path patterns.
+
+    Every pattern is "/.../", so a match can never involve the final path
+    component: the answer depends only on the parent directory.  Siblings
+    therefore share one cached classification.
+    """
+    return _classify_dir(path[:path.rfind("/") + 1])
+
+
 # ─── Utility Functions ──────────────────────────────────────────────────────
 
-def _flush_item_buffer(force: bool = False):
-    """Flush buffered item events to stdout as a single batch line."""
-    global _item_buffer, _last_item_flush
-    now = time.monotonic()
-    if not _item_buffer:
-        return
-    if not force and (now - _last_item_flush) < _ITEM_FLUSH_INTERVAL:
-        return
-    with _emit_lock:
-        if not _item_buffer:
+def _write_batch(batch: list):
+    """Write buffered item lines as one 'batch' line (not yet flushed).
+
+    The items are already encoded, so the batch is spliced together from
+    their bytes (newlines dropped) instead of being serialized again.
+    """
+    _out.write(b'{"event":"batch","items":[' + b",".join(line[:-1] for line in batch) + b"]}\n")
+
+
+def _emit_writer():
+    """Writer thread: drain _emit_queue to stdout in event order.
+
+    Queue entries are (is_item, line) pairs encoded by emit().  Any failure
+    other than a closed pipe is recorded and makes the next emit() raise.
+    """
+    global _writer_error
+    batch = []
+    deadline = 0.0
+    while True:
+        try:
+            event = _emit_queue.get(timeout=max(0.0, deadline - time.monotonic()) if batch else None)
+        except queue.Empty:
+            event = None  # the batch interval ran out
+        try:
+            if event is not None and event is not _EMIT_STOP and event[0]:
+                if not batch:
+                    deadline = time.monotonic() + _ITEM_FLUSH_INTERVAL
+                batch.append(event[1])
+                if len(batch) >= _ITEM_BATCH_MAX:
+                    _write_batch(batch)
+                    batch = []
+                continue
+            # Anything else carries the pending items out ahead of it
+            if batch:
+                _write_batch(batch)
+                batch = []
+            if event is None:
+                continue
+            if event is _EMIT_STOP:
+                _out.flush()
+                return
+            _out.write(event[1])
+            _out.flush()
+        except BrokenPipeError:
+            _pipe_closed.set()
+            return
+        except BaseException as e:
+            _writer_error = e
+            _writer_failed.set()
             return
-        batch = _item_buffer[:]
-        _item_buffer = []
-        _last_item_flush = now
+
+
+_emit_thread = Thread(target=_emit_writer, name="emit-writer", daemon=True)
+_emit_thread.start()
+
+
+def _stop_emit_writer():
+    """Drain queued events at exit; the parent may already be gone."""
+    if _emit_thread.is_alive():
+        _emit_queue.put(_EMIT_STOP)
+        _emit_thread.join(timeout=5)
     try:
-        # Emit a single 'batch' event containing multiple items — one stdout write
-        sys.stdout.write(json.dumps({"event": "batch", "items": batch}) + "\n")
-        sys.stdout.flush()
-    except BrokenPipeError:
-        sys.exit(0)
+        _out.flush()
+    except (BrokenPipeError, ValueError):
+        pass
 
 
-def emit(event_dict: dict):
-    """Write a JSON event line to stdout.
+atexit.register(_stop_emit_writer)
+
 
-    Item events are buffered and flushed in batches every 150ms to avoid
-    hammering the Electron readline parser with thousands of tiny writes.
-    All other events (progress, found, complete, warning, error) flush immediately.
+def emit(event_dict: dict):
+    """Queue a JSON event line for stdout.
+
+    Item events are buffered by the writer thread and written in batches
+    every 150ms to avoid hammering the Electron readline parser with
+    thousands of tiny writes.  All other events (progress, found, complete,
+    warning, error) flush the stdout buffer immediately, carrying any
+    pending batches with them.  The event is encoded here, so encoding
+    errors surface in the caller and later changes to event_dict are not
+    written.  Once the parent has closed the pipe, the next emit exits
+    cleanly; if the writer thread died any other way, emit raises.
     """
-    global _item_buffer, _last_item_flush
-    try:
-        evt = event_dict.get("event")
-        # Normalize camelCase aliases for frontend compatibility
-        if evt == "item":
-            if "size" in event_dict and "sizeBytes" not in event_dict:
-                event_dict["sizeBytes"] = event_dict["size"]
-            if "size_formatted" in event_dict and "sizeFormatted" not in event_dict:
-                event_dict["sizeFormatted"] = event_dict["size_formatted"]
-            if "last_accessed" in event_dict and "lastUsed" not in event_dict:
-                event_dict["lastUsed"] = event_dict["last_accessed"]
-            # Buffer instead of immediate flush
-            with _emit_lock:
-                _item_buffer.append(event_dict)
-            _flush_item_buffer()  # will no-op if interval not met
-            return
-        # Non-item events: flush pending items first, then emit immediately
-        _flush_item_buffer(force=True)
-        sys.stdout.write(json.dumps(event_dict) + "\n")
-        sys.stdout.flush()
-    except BrokenPipeError:
+    if _pipe_closed.is_set():
         sys.exit(0)
+    if _writer_failed.is_set():
+        raise RuntimeError("stdout writer thread failed") from _writer_error
+    # Events carry canonical snake_case keys only; the renderer's ingest
+    # layer maps them onto its camelCase fields.
+    _emit_queue.put((event_dict.get("event") == "item", _encode_line(event_dict)))
 
 
+@functools.lru_cache(maxsize=4096)
 def format_size(size_bytes: int) -> str:
-    """Convert bytes to human-readable format."""
-    if size_bytes == 0:
-        return "0 B"
-    units = ("B", "KB", "MB", "GB", "TB")
-    i = int(math.floor(math.log(size_bytes, 1024))) if size_bytes > 0 else 0
-    i = min(i, len(units) - 1)
-    p = math.pow(1024, i)
-    s = round(size_bytes / p, 2)
-    return f"{s} {units[i]}"
+    """Convert bytes to human-readable format (memoized — item sizes repeat a lot)."""
+    return _format_size(size_bytes)
 
 
-def get_last_accessed(path: str) -> str:
-    """Get last accessed date from stat, return ISO format string."""
+def stat_bundle(path: str) -> tuple:
+    """(allocated size, last_accessed, last_modified) from a single os.stat call.
+
+    Callers that need more than one of these should take them from here
+    rather than stat-ing the same path once per getter.
+    """
     try:
         st = os.stat(path)
-        return datetime.fromtimestamp(st.st_atime).strftime("%Y-%m-%d %H:%M:%S")
-    except (OSError, ValueError):
-        return "Unknown"
+    except OSError:
+        return 0, "Unknown", "Unknown"
+    return physical_size(st), format_timestamp(st.st_atime), format_timestamp(st.st_mtime)
+
+
+def get_last_accessed(path: str) -> str:
+    """Get last accessed date from stat, return ISO format string."""
+    return stat_bundle(path)[1]
 
 
 def get_last_modified(path: str) -> str:
     """Get last modified date from stat, return ISO format string."""
-    try:
-        st = os.stat(path)
-        return datetime.fromtimestamp(st.st_mtime).strftime("%Y-%m-%d %H:%M:%S")
-    except (OSError, ValueError):
-        return "Unknown"
+    return stat_bundle(path)[2]
 
 
 def retry_fs_op(fn, max_retries=3, initial_delay=0.1, max_delay=5.0):
@@ -288,47 +509,344 @@ def _is_du_only_path(path: str) -> bool:
     return False
 
 
-def _scandir_size(path: str) -> int:
-    """Recursively sum file sizes using os.scandir with DirEntry.stat() caching.
+# realpath -> bytes for directories sized during the current scan
+_dirsize_cache: dict = {}
+_dirsize_lock = Lock()
+# Only ever runs _walk_size (never submits to itself), so callers on other
+# pools can block on it without deadlocking
+_walk_pool = ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1))
 
-    DirEntry.stat() re-uses the inode info the kernel already returned from
-    the getdents() syscall, so on APFS we avoid a separate stat() call per
-    entry entirely.  This is significantly faster than os.walk + os.lstat.
+
+def _scandir_size(path: str, max_entries: int | None = None) -> tuple[int, bool]:
+    """Recursively sum file sizes using os.scandir; returns (bytes, complete).
+
+    Entry types come from the d_type the kernel already returned with the
+    directory listing, so is_dir()/is_symlink() cost no syscalls; only regular
+    files pay for a stat.  Directories are pushed without ever being stat'ed.
+    An explicit stack (not recursion) keeps deep trees off the call stack.
 
     Rules:
     - followlinks=False  — no symlink traversal
-    - Skips symlinks (st_size of the symlink itself, not the target)
+    - Skips symlinks (neither the link nor its target is counted)
+    - Sizes are allocated bytes (st_blocks), like `du` and diskutil's "used"
     - PermissionError / OSError on individual entries are skipped silently
+    - Subdirectories already sized this scan are added from _dirsize_cache
+    - With max_entries, stops after the directory that crosses it and
+      returns the partial sum with complete=False
     """
     total = 0
+    seen = 0
     stack = [path]
+    known = _dirsize_cache
     while stack:
+        if max_entries is not None and seen > max_entries:
+            return total, False
         current = stack.pop()
         try:
-            with os.scandir(current) as it:
+            fd = os.open(current, os.O_RDONLY | os.O_DIRECTORY)
+        except (PermissionError, OSError):
+            continue
+        try:
+            # Listing the open descriptor makes each DirEntry.stat() an
+            # fstatat(fd, name): the kernel never re-resolves the full path
+            with os.scandir(fd) as it:
                 for entry in it:
+                    seen += 1
                     try:
-                        if entry.is_symlink():
-                            continue  # skip symlinks
-                        st = entry.stat(follow_symlinks=False)
                         if entry.is_dir(follow_symlinks=False):
-                            stack.append(entry.path)  # recurse
-                        else:
-                            total += st.st_size
+                            sub_path = os.path.join(current, entry.name)
+                            sub = known.get(sub_path)
+                            if sub is None:
+                                stack.append(sub_path)  # recurse
+                            else:
+                                total += sub
+                        elif not entry.is_symlink():
+                            total += entry.stat(follow_symlinks=False).st_blocks * STAT_BLOCK_SIZE
                     except OSError:
                         pass
-        except (PermissionError, OSError):
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+    return total, True
+
+
+def _walk_size(path: str) -> int:
+    """Serial walk of one tree: getattrlistbulk where enabled, else scandir.
+
+    The scandir walker hands trees past DU_FALLBACK_ENTRIES to `du -sk`,
+    whose C fts loop outruns a per-entry stat in Python on huge caches
+    (DerivedData, node_modules, module caches). getattrlistbulk already
+    batches its metadata, so it always finishes the walk itself.
+    """
+    size = None
+    if USE_BULK_ATTRS:
+        size = bulk_attr_size(path, known=_dirsize_cache)
+    if size is None:
+        size, complete = _scandir_size(path, DU_FALLBACK_ENTRIES)
+        if not complete:
+            size = du_size(path, timeout=DU_TIMEOUT) or _scandir_size(path)[0]
+    return size
+
+
+def _fan_out_size(path: str) -> int:
+    """Size path by walking its top-level subdirectories concurrently.
+
+    The root is listed once; its files are summed here and its subtrees go
+    to _walk_pool when there are at least PARALLEL_WALK_MIN_SUBDIRS of them.
+    """
+    try:
+        entries = _list_dir(path)
+    except OSError:
+        return 0
+    total = 0
+    subdirs = []
+    for entry in entries:
+        try:
+            if entry.is_dir(follow_symlinks=False):
+                sub = _dirsize_cache.get(entry.path)
+                if sub is None:
+                    subdirs.append(entry.path)
+                else:
+                    total += sub
+            elif not entry.is_symlink():
+                total += entry.stat(follow_symlinks=False).st_blocks * STAT_BLOCK_SIZE
+        except OSError:
             pass
-    return total
+    if len(subdirs) < PARALLEL_WALK_MIN_SUBDIRS:
+        return total + sum(map(_walk_size, subdirs))
+    return total + sum(_walk_pool.map(_walk_size, subdirs))
 
 
 def get_dir_size_fast(path: str) -> int:
     """Calculate directory size — pure Python, no subprocess, no FSEvents.
 
     Uses scandir-based recursive walk (faster than os.walk on APFS because
-    DirEntry.stat() is cached from the directory read syscall).
+    DirEntry.stat() is cached from the directory read syscall).  On macOS
+    it uses getattrlistbulk(2) instead, which returns sizes for a whole batch
+    of entries per syscall; scandir remains the fallback wherever that call
+    is unavailable or MAC_OPTIMIZER_BULK_ATTRS=0.  With PARALLEL_WALK the
+    root's subdirectories are walked concurrently (see _fan_out_size).
+
+    Results are memoized per scan under the resolved path, so a root sized
+    by a pass-1 scanner is not walked again by the full-disk map, and a
+    parent walk reuses any subdirectory sized before it.
     """
-    return _scandir_size(path)
+    key = os.path.realpath(path)
+    size = _dirsize_cache.get(key)
+    if size is not None:
+        return size
+    size = _fan_out_size(key) if PARALLEL_WALK else _walk_size(key)
+    with _dirsize_lock:
+        _dirsize_cache[key] = size
+    return size
+
+
+def estimate_dir_size(path: str, max_entries: int = SIZE_ESTIMATE_MAX_ENTRIES) -> tuple[int, bool]:
+    """Size a directory the full-disk map won't descend into, within a budget.
+
+    Returns (bytes, estimated).  Trees with more than max_entries entries
+    (photo libraries, mail stores, cloud mounts) stop early and report the
+    partial sum as an estimate instead of dominating the scan; complete
+    results are memoized like get_dir_size_fast.
+    """
+    key = os.path.realpath(path)
+    size = _dirsize_cache.get(key)
+    if size is not None:
+        return size, False
+    size, complete = _scandir_size(key, max_entries)
+    if complete:
+        with _dirsize_lock:
+            _dirsize_cache[key] = size
+    return size, not complete
+
+
+def reset_dir_size_cache():
+    """Forget memoized directory sizes (called at the start of every scan)."""
+    with _dirsize_lock:
+        _dirsize_cache.clear()
+
+
+@dataclass(slots=True)
+class CacheItem:
+    """One reportable cache/junk location, before it becomes an item event."""
+    path: str
+    size: int
+    risk: str
+    category: str
+    name: str
+    description: str
+    last_accessed: str = ""  # looked up from the path when not supplied
+    # Not a filesystem path (e.g. docker://images): freed by the named action,
+    # never deleted, stat'ed or recorded in scan_state
+    action_type: str | None = None
+
+    def to_dict(self) -> dict:
+        record = {
+            "path": self.path,
+            "size": self.size,
+            "size_formatted": format_size(self.size),
+            "last_accessed": self.last_accessed or get_last_accessed(self.path),
+            "risk": self.risk,
+            "category": self.category,
+            "name": self.name,
+            "description": self.description,
+        }
+        if self.action_type is not None:
+            record["virtual"] = True
+            record["action_type"] = self.action_type
+        return record
+
+
+def report_item(tracker: "ProgressTracker", items: list, item: CacheItem) -> dict:
+    """Serialize an item once, then record it, count it and emit it."""
+    record = item.to_dict()
+    items.append(record)
+    tracker.update(item.path, files=1, bytes_added=item.size)
+    emit({"event": "item", **record})
+    return record
+
+
+SIZING_WORKERS = min(8, os.cpu_count() or 1)  # past ~8, APFS metadata locks dominate
+SIZE_REUSE_MAX_AGE = 24 * 3600  # daemon re-walks every cached root at least this often
+
+# True for daemon re-scans (and `scan --warm`); cold scans never list a root
+# just to build its change_marker
+_reuse_sizes: bool = False
+# path -> (last_mtime, size_bytes) from scan_state; only populated when _reuse_sizes
+_reusable_sizes: dict = {}
+# path -> change_marker (warm scans) or the root's own st_mtime (cold scans),
+# taken before sizing (cache roots, stale-project artifacts) and recorded in
+# scan_state at the end.  A bare mtime is never above the marker a later
+# warm scan computes, so a cold scan's row never lets a changed root be reused.
+_observed_mtimes: dict = {}
+# paths whose size this scan took from _reusable_sizes instead of walking;
+# their scan_state rows keep the last_scan_ts of the walk that measured them
+_reused_paths: set = set()
+
+
+def change_marker(path: str, st: os.stat_result) -> float:
+    """Newest mtime among path (stat'ed as st) and its direct children.
+
+    A directory's own mtime only moves when entries are added, removed or
+    renamed directly inside it; a child subtree changing underneath bumps
+    that child's mtime instead.  Folding the children in catches churn one
+    level down at the cost of a single listing.
+    """
+    newest = st.st_mtime
+    listing = bulk_list_times(path) if USE_BULK_ATTRS else None
+    if listing is not None:
+        for _name, _atime, mtime in listing:
+            if mtime > newest:
+                newest = mtime
+        return newest
+    try:
+        for child in _list_dir(path):
+            try:
+                mtime = child.stat(follow_symlinks=False).st_mtime
+            except OSError:
+                continue
+            if mtime > newest:
+                newest = mtime
+    except OSError:
+        pass
+    return newest
+
+
+def reusable_size(path: str, marker: float) -> int | None:
+    """Recorded size for path if its scan_state row still matches marker (see change_marker)."""
+    cached = _reusable_sizes.get(path)
+    if cached is not None and abs(cached[0] - marker) < 0.01:
+        _reused_paths.add(path)
+        return cached[1]
+    return None
+
+
+def size_targets(tracker: "ProgressTracker", targets: list, category: str,
+                 min_size: int = MIN_ITEM_SIZE) -> tuple:
+    """Size independent cache roots concurrently and emit an item for each.
+
+    targets: (name, path, description, risk) tuples; returns (items, total
+    bytes reported), the total kept as items are reported.  Candidates need
+    no existence pre-check: each root is stat'ed once up front (existence,
+    kind, access time, reuse check) and missing ones are skipped; plain files are sized
+    from that stat and directories are walked by get_dir_size_fast on a
+    worker thread so several subtrees are in flight at once.  Results are
+    consumed via as_completed on the calling thread, which emits the items.
+
+    During daemon re-scans a root whose change_marker matches its scan_state
+    row reuses the recorded size instead of being walked again.  The marker
+    is taken once, before the walk, so changes made while sizing show up
+    next time; cold scans record the root's mtime from the stat instead.
+    """
+    items = []
+    total = 0
+    if not targets:
+        return items, total
+
+    def report(target, st, size, marker):
+        nonlocal total
+        name, path, description, risk = target
+        if size > min_size:
+            total += size
+            _observed_mtimes[path] = marker
+            report_item(tracker, items, CacheItem(
+                path=path,
+                size=size,
+                risk=risk,
+                category=category,
+                name=name,
+                description=description,
+                last_accessed=format_timestamp(st.st_atime),
+            ))
+
+    to_walk = []
+    for target in targets:
+        try:
+            st = os.stat(target[1])
+        except OSError:
+            continue  # vanished since it was listed
+        if stat.S_ISREG(st.st_mode):
+            report(target, st, physical_size(st), st.st_mtime)
+            continue
+        if not stat.S_ISDIR(st.st_mode):
+            continue
+        marker = None if _reuse_sizes else st.st_mtime
+        if target[1] in _reusable_sizes:
+            marker = change_marker(target[1], st)
+            cached = reusable_size(target[1], marker)
+            if cached is not None:
+                report(target, st, cached, marker)
+                continue
+        to_walk.append((target, st, marker))
+
+    def measure(path, st, marker):
+        # Warm scans list roots without a recorded size here, off the main thread
+        if marker is None:
+            marker = change_marker(path, st)
+        return marker, get_dir_size_fast(path)
+
+    with ThreadPoolExecutor(max_workers=SIZING_WORKERS) as executor:
+        futures = {executor.submit(measure, target[1], st, marker): (target, st)
+                   for target, st, marker in to_walk}
+        for future in as_completed(futures):
+            target, st = futures[future]
+            marker, size = future.result()
+            report(target, st, size, marker)
+    return items, total
+
+
+def emit_found(category: str, name: str, items: list, total: int):
+    """Emit a scanner's category summary (nothing when it found no items)."""
+    if items:
+        emit({
+            "event": "found",
+            "category": category,
+            "name": name,
+            "count": len(items),
+            "total_bytes": total,
+            "total_formatted": format_size(total),
+        })
 
 
 def dir_exists(path: str) -> bool:
@@ -336,6 +854,27 @@ def dir_exists(path: str) -> bool:
     return os.path.isdir(path)
 
 
+def unique_dirs(paths: list) -> list:
+    """The existing directories among paths, minus aliases of earlier ones.
+
+    Two roots are the same directory when they share device and inode, e.g.
+    a ~/dev symlink to ~/Developer; walking both would report everything
+    under it twice. Order is kept.
+    """
+    roots = []
+    seen = set()
+    for path in paths:
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        if not stat.S_ISDIR(st.st_mode) or (st.st_dev, st.st_ino) in seen:
+            continue
+        seen.add((st.st_dev, st.st_ino))
+        roots.append(path)
+    return roots
+
+
 def get_permission_remediation(path: str) -> str:
     """Suggest remediation for a permission-denied path."""
     if "/Library/Application Support/" in path or "/Library/Caches/" in path:
@@ -398,9 +937,12 @@ class ProgressTracker:
         self.items_found = 0
         self.current_dir = ""
         self.phase = "fast"
-        self.rate_samples = []
+        self.rate_samples = deque(maxlen=RATE_WINDOW)
+        self.rate_sum = 0.0  # running total of rate_samples
         self.last_bytes = 0
         self.last_sample_time = time.monotonic()
+        self._tick = 0
+        self._lock = Lock()  # category scanners share one tracker across threads
         # Error tracking
         self.errors = {"permission": 0, "symlink": 0, "missing": 0, "other": 0}
         self.last_error = None
@@ -414,6 +956,10 @@ class ProgressTracker:
 
     def record_error(self, path: str, error: Exception):
         """Record an error with structured data for the skipped items panel."""
+        with self._lock:
+            self._record_error(path, error)
+
+    def _record_error(self, path: str, error: Exception):
         if isinstance(error, PermissionError):
             self.errors["permission"] += 1
             self.last_error = f"Permission denied: {path}"
@@ -452,39 +998,61 @@ class ProgressTracker:
                     "free_bytes": status["free_bytes"],
                 })
 
+    def announce(self, label: str):
+        """Emit an immediate progress event for a phase milestone (no rate sample)."""
+        emit({
+            "event": "progress",
+            "schema_version": EVENT_SCHEMA_VERSION,
+            "phase": self.phase,
+            "dir": label,
+            "files": self.files_processed,
+            "bytes": self.bytes_scanned,
+            "rate_mbps": 0,
+            "eta_seconds": -1,
+            "elapsed": round(time.monotonic() - self.start_time, 1),
+        })
+
     def update(self, current_dir: str, files: int = 0, bytes_added: int = 0):
+        with self._lock:
+            self._update(current_dir, files, bytes_added)
+
+    def _update(self, current_dir: str, files: int, bytes_added: int):
         self.current_dir = current_dir
         self.files_processed += files
         self.bytes_scanned += bytes_added
         if files > 0:
             self.items_found += files
             self.check_disk()
+        elif not bytes_added:
+            # Bare "now in this directory" ticks arrive once per directory
+            # during deep walks; only every 64th one pays for a clock read.
+            self._tick += 1
+            if self._tick & PROGRESS_TICK_MASK:
+                return
         now = time.monotonic()
 
         if now - self.last_emit_time >= EMIT_INTERVAL:
             dt = now - self.last_sample_time
             if dt > 0:
                 rate = (self.bytes_scanned - self.last_bytes) / dt
+                if len(self.rate_samples) == RATE_WINDOW:
+                    self.rate_sum -= self.rate_samples[0]  # about to be evicted
                 self.rate_samples.append(rate)
-                if len(self.rate_samples) > 20:
-                    self.rate_samples = self.rate_samples[-20:]
+                self.rate_sum += rate
                 self.last_bytes = self.bytes_scanned
                 self.last_sample_time = now
 
-            avg_rate = sum(self.rate_samples) / len(self.rate_samples) if self.rate_samples else 0
+            avg_rate = self.rate_sum / len(self.rate_samples) if self.rate_samples else 0
             rate_mbps = avg_rate / (1024 * 1024) if avg_rate > 0 else 0
             elapsed = now - self.start_time
 
             emit({
                 "event": "progress",
+                "schema_version": EVENT_SCHEMA_VERSION,
                 "phase": self.phase,
-                "current_path": self.current_dir,
                 "dir": self.current_dir,
-                "files_processed": self.files_processed,
                 "files": self.files_processed,
-                "bytes_scanned": self.bytes_scanned,
                 "bytes": self.bytes_scanned,
-                "scan_rate_mbps": round(rate_mbps, 2),
                 "rate_mbps": round(rate_mbps, 2),
                 "eta_seconds": -1,
                 "elapsed": round(elapsed, 1),
@@ -497,19 +1065,22 @@ class ProgressTracker:
 
 # ─── Scanner Categories ─────────────────────────────────────────────────────
 
+# (browser, base path) — joined once at import like APP_TARGETS
+BROWSER_ROOTS = (
+    ("Chrome", f"{LIBRARY}/Application Support/Google/Chrome"),
+    ("Chrome Canary", f"{LIBRARY}/Application Support/Google/Chrome Canary"),
+    ("Firefox", f"{LIBRARY}/Application Support/Firefox/Profiles"),
+    ("Safari", f"{LIBRARY}/Caches/com.apple.Safari"),
+    ("Edge", f"{LIBRARY}/Application Support/Microsoft Edge"),
+    ("Brave", f"{LIBRARY}/Application Support/BraveSoftware/Brave-Browser"),
+)
+
+
 def scan_browser_caches(tracker: ProgressTracker) -> list:
     """Scan browser cache directories with profile detection."""
-    items = []
-    browsers = {
-        "Chrome": os.path.join(LIBRARY, "Application Support", "Google", "Chrome"),
-        "Chrome Canary": os.path.join(LIBRARY, "Application Support", "Google", "Chrome Canary"),
-        "Firefox": os.path.join(LIBRARY, "Application Support", "Firefox", "Profiles"),
-        "Safari": os.path.join(LIBRARY, "Caches", "com.apple.Safari"),
-        "Edge": os.path.join(LIBRARY, "Application Support", "Microsoft Edge"),
-        "Brave": os.path.join(LIBRARY, "Application Support", "BraveSoftware", "Brave-Browser"),
-    }
+    targets = []
 
-    for browser_name, base_path in browsers.items():
+    for browser_name, base_path in BROWSER_ROOTS:
         if not dir_exists(base_path):
             continue
 
@@ -518,155 +1089,160 @@ def scan_browser_caches(tracker: ProgressTracker) -> list:
         if browser_name == "Firefox":
             # Firefox has profile subdirectories
             try:
-                for profile_dir in os.listdir(base_path):
-                    profile_path = os.path.join(base_path, profile_dir)
-                    if not os.path.isdir(profile_path):
+                # Components are plain relative POSIX names, so f-string
+                # joins skip os.path.join's per-call validation.  is_dir()
+                # answers from the listing's d_type (it only stats symlinks).
+                for entry in _list_dir(base_path):
+                    if not entry.is_dir():
                         continue
-                    cache_dirs = ["cache2", "startupCache", "thumbnails"]
-                    for cd in cache_dirs:
-                        cache_path = os.path.join(profile_path, cd)
-                        if dir_exists(cache_path):
-                            size = get_dir_size_fast(cache_path)
-                            if size > MIN_ITEM_SIZE:
-                                item = {
-                                    "path": cache_path,
-                                    "size": size,
-                                    "size_formatted": format_size(size),
-                                    "last_accessed": get_last_accessed(cache_path),
-                                    "risk": "safe",
-                                    "category": "browser_cache",
-                                    "name": f"{browser_name} Cache ({profile_dir})",
-                                    "description": f"{browser_name} browser cache for profile {profile_dir}",
-                                }
-                                items.append(item)
-                                tracker.update(cache_path, files=1, bytes_added=size)
-                                emit({"event": "item", **item})
+                    profile_dir, profile_path = entry.name, entry.path
+                    for cd in ("cache2", "startupCache", "thumbnails"):
+                        cache_path = f"{profile_path}/{cd}"
+                        targets.append((
+                            f"{browser_name} Cache ({profile_dir})", cache_path,
+                            f"{browser_name} browser cache for profile {profile_dir}", "safe",
+                        ))
             except (PermissionError, OSError):
                 pass
 
         elif browser_name == "Safari":
-            size = get_dir_size_fast(base_path)
-            if size > MIN_ITEM_SIZE:
-                item = {
-                    "path": base_path,
-                    "size": size,
-                    "size_formatted": format_size(size),
-                    "last_accessed": get_last_accessed(base_path),
-                    "risk": "safe",
-                    "category": "browser_cache",
-                    "name": f"{browser_name} Cache",
-                    "description": f"{browser_name} browser cache and website data",
-                }
-                items.append(item)
-                tracker.update(base_path, files=1, bytes_added=size)
-                emit({"event": "item", **item})
+            targets.append((f"{browser_name} Cache", base_path,
+                            f"{browser_name} browser cache and website data", "safe"))
             # Also check Safari blob storage
             safari_websitedata = os.path.join(LIBRARY, "Caches", "com.apple.Safari.SafeBrowsing")
-            if dir_exists(safari_websitedata):
-                size = get_dir_size_fast(safari_websitedata)
-                if size > MIN_ITEM_SIZE:
-                    item = {
-                        "path": safari_websitedata,
-                        "size": size,
-                        "size_formatted": format_size(size),
-                        "last_accessed": get_last_accessed(safari_websitedata),
-                        "risk": "safe",
-                        "category": "browser_cache",
-                        "name": "Safari Safe Browsing Data",
-                        "description": "Safari safe browsing database cache",
-                    }
-                    items.append(item)
-                    tracker.update(safari_websitedata, files=1, bytes_added=size)
-                    emit({"event": "item", **item})
+            targets.append(("Safari Safe Browsing Data", safari_websitedata,
+                            "Safari safe browsing database cache", "safe"))
 
         else:
             # Chrome-based browsers: check each profile
             try:
-                cache_subdirs = [
+                cache_subdirs = (
                     "Cache", "Code Cache", "GPUCache", "Service Worker",
                     "ShaderCache", "GrShaderCache", "ScriptCache",
-                ]
+                )
                 profiles = ["Default"] + [
-                    d for d in os.listdir(base_path)
-                    if d.startswith("Profile ") and os.path.isdir(os.path.join(base_path, d))
+                    e.name for e in _list_dir(base_path)
+                    if e.name.startswith("Profile ") and e.is_dir()
                 ]
                 for profile in profiles:
+                    base_profile = f"{base_path}/{profile}"
                     for cache_sub in cache_subdirs:
-                        cache_path = os.path.join(base_path, profile, cache_sub)
-                        if dir_exists(cache_path):
-                            size = get_dir_size_fast(cache_path)
-                            if size > MIN_ITEM_SIZE:
-                                item = {
-                                    "path": cache_path,
-                                    "size": size,
-                                    "size_formatted": format_size(size),
-                                    "last_accessed": get_last_accessed(cache_path),
-                                    "risk": "safe",
-                                    "category": "browser_cache",
-                                    "name": f"{browser_name} {cache_sub} ({profile})",
-                                    "description": f"{browser_name} {cache_sub} for {profile}",
-                                }
-                                items.append(item)
-                                tracker.update(cache_path, files=1, bytes_added=size)
-                                emit({"event": "item", **item})
+                        cache_path = f"{base_profile}/{cache_sub}"
+                        targets.append((
+                            f"{browser_name} {cache_sub} ({profile})", cache_path,
+                            f"{browser_name} {cache_sub} for {profile}", "safe",
+                        ))
             except (PermissionError, OSError):
                 pass
 
-    if items:
-        total = sum(i["size"] for i in items)
-        emit({
-            "event": "found",
-            "category": "browser_cache",
-            "name": "Browser Caches",
-            "count": len(items),
-            "total_bytes": total,
-            "total_formatted": format_size(total),
-        })
+    items, total = size_targets(tracker, targets, "browser_cache")
+
+    emit_found("browser_cache", "Browser Caches", items, total)
 
     return items
 
 
+NODE_MODULES_MAX_DEPTH = 5  # deepest project dir (below a search root) we look inside
+_NODE_SKIP_DIRS = {"__pycache__", "venv"}  # plus anything hidden (.git, .venv, ...)
+
+
+def _find_node_modules(roots: list) -> list | None:
+    """Locate node_modules dirs under roots with a single find(1) process.
+
+    find reads directories in C with large getdents batches and prunes at
+    each hit, so neither the walk nor the matches cost interpreter time.
+    Returns None if find can't be run so the caller can fall back.
+    """
+    if not roots:
+        return []
+    cmd = [
+        "find", "-H", *roots,  # -H: follow a symlinked search root, nothing below it
+        "-mindepth", "1", "-maxdepth", str(NODE_MODULES_MAX_DEPTH + 1),
+        "(", "-name", ".*", "-o", "-name", "__pycache__", "-o", "-name", "venv", ")", "-prune",
+        "-o", "-type", "d", "-name", "node_modules", "-prune", "-print0",
+    ]
+    try:
+        result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, timeout=120)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    # Unreadable subdirectories make find exit non-zero; its output is still good
+    return [os.fsdecode(p) for p in result.stdout.split(b"\0") if p]
+
+
+def _walk_node_modules(search_root: str) -> list:
+    """Pure-Python fallback for _find_node_modules over one root.
+
+    Explicit DFS stack of (dir, depth): depth is carried on push instead of
+    being recomputed from the path string for every directory.
+    """
+    found = []
+    stack = [(search_root, 0)]
+    while stack:
+        current, depth = stack.pop()
+        try:
+            it = os.scandir(current)
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                try:
+                    if not entry.is_dir(follow_symlinks=False):
+                        continue
+                except OSError:
+                    continue
+                name = entry.name
+                if name == "node_modules":
+                    found.append(entry.path)  # report it, never recurse into it
+                elif depth < NODE_MODULES_MAX_DEPTH and not name.startswith(".") and name not in _NODE_SKIP_DIRS:
+                    stack.append((entry.path, depth + 1))
+    return found
+
+
 def scan_dev_caches(tracker: ProgressTracker) -> list:
     """Scan developer tool caches: Docker, node_modules, Python, Homebrew, Cargo, Go."""
-    items = []
+    targets = []
 
     # ── Docker ──
+    # `docker system df` already knows what each category could give back, so
+    # report that instead of walking Docker Desktop's sparse VM disk image.
+    docker_items = []
+    docker_total = 0
+    docker_vm = os.path.join(LIBRARY, "Containers", "com.docker.docker", "Data")
     try:
         result = subprocess.run(
             ["docker", "system", "df", "--format", "{{json .}}"],
             capture_output=True, text=True, timeout=10
         )
-        if result.returncode == 0 and result.stdout.strip():
-            docker_total = 0
-            for line in result.stdout.strip().split("\n"):
+        if result.returncode == 0:
+            for line in result.stdout.splitlines():
                 try:
                     data = json.loads(line)
-                    # Parse size string (e.g., "2.5GB")
-                    size_str = data.get("Size", "0B")
-                    reclaimable = data.get("Reclaimable", "0B")
-                    # We'll report the reclaimable amount
-                except (json.JSONDecodeError, KeyError):
+                except ValueError:
                     continue
-
-            # Also check Docker Desktop VM disk image
-            docker_vm = os.path.join(LIBRARY, "Containers", "com.docker.docker", "Data")
-            if dir_exists(docker_vm):
-                size = get_dir_size_fast(docker_vm)
-                if size > MIN_ITEM_SIZE:
-                    item = {
-                        "path": docker_vm,
-                        "size": size,
-                        "size_formatted": format_size(size),
-                        "last_accessed": get_last_accessed(docker_vm),
-                        "risk": "caution",
-                        "category": "dev_cache",
-                        "name": "Docker Desktop Data",
-                        "description": "Docker Desktop VM disk image, containers, volumes, and build cache",
-                    }
-                    items.append(item)
-                    tracker.update(docker_vm, files=1, bytes_added=size)
-                    emit({"event": "item", **item})
-    except (FileNotFoundError, subprocess.TimeoutExpired, OSError):
+                kind = data.get("Type", "")
+                reclaimable = macos_intelligence.parse_docker_size(data.get("Reclaimable"))
+                if not kind or reclaimable <= MIN_ITEM_SIZE:
+                    continue
+                docker_total += reclaimable
+                report_item(tracker, docker_items, CacheItem(
+                    path=f"docker://{kind.lower().replace(' ', '-')}",
+                    size=reclaimable,
+                    risk="caution",
+                    category="dev_cache",
+                    name=f"Docker {kind}",
+                    description=f"Reclaimable Docker {kind.lower()} "
+                                f"(of {data.get('Size', '0B')} total; free with `docker system prune`)",
+                    last_accessed="Unknown",
+                    action_type="docker_prune",
+                ))
+        else:
+            # Daemon not running: fall back to sizing the VM data on disk
+            targets.append(("Docker Desktop Data", docker_vm,
+                            "Docker Desktop VM disk image, containers, volumes, and build cache", "caution"))
+    except subprocess.TimeoutExpired:
+        targets.append(("Docker Desktop Data", docker_vm,
+                        "Docker Desktop VM disk image, containers, volumes, and build cache", "caution"))
+    except OSError:
         pass  # Docker not installed
 
     # ── Node modules — scan common project directories ──
@@ -683,117 +1259,33 @@ def scan_dev_caches(tracker: ProgressTracker) -> list:
     ]
 
     npm_cache = os.path.join(HOME, ".npm")
-    if dir_exists(npm_cache):
-        size = get_dir_size_fast(npm_cache)
-        if size > MIN_ITEM_SIZE:
-            item = {
-                "path": npm_cache,
-                "size": size,
-                "size_formatted": format_size(size),
-                "last_accessed": get_last_accessed(npm_cache),
-                "risk": "safe",
-                "category": "dev_cache",
-                "name": "NPM Cache (~/.npm)",
-                "description": "Global NPM package cache",
-            }
-            items.append(item)
-            tracker.update(npm_cache, files=1, bytes_added=size)
-            emit({"event": "item", **item})
+    targets.append(("NPM Cache (~/.npm)", npm_cache, "Global NPM package cache", "safe"))
 
     # Scan for nested node_modules (limit depth to avoid excessive time)
-    for search_root in node_search_paths:
-        if not dir_exists(search_root):
-            continue
-        tracker.update(search_root)
-        try:
-            for dirpath, dirnames, _ in os.walk(search_root, followlinks=False):
-                depth = dirpath.replace(search_root, "").count(os.sep)
-                if depth > 5:
-                    dirnames.clear()
-                    continue
-                if "node_modules" in dirnames:
-                    nm_path = os.path.join(dirpath, "node_modules")
-                    dirnames.remove("node_modules")  # Don't recurse into it
-                    size = get_dir_size_fast(nm_path)
-                    if size > MIN_ITEM_SIZE:
-                        project_name = os.path.basename(dirpath)
-                        item = {
-                            "path": nm_path,
-                            "size": size,
-                            "size_formatted": format_size(size),
-                            "last_accessed": get_last_accessed(nm_path),
-                            "risk": "safe",
-                            "category": "dev_cache",
-                            "name": f"node_modules ({project_name})",
-                            "description": f"Node.js dependencies for {project_name}",
-                        }
-                        items.append(item)
-                        tracker.update(nm_path, files=1, bytes_added=size)
-                        emit({"event": "item", **item})
-                # Skip hidden dirs and common non-project dirs
-                dirnames[:] = [
-                    d for d in dirnames
-                    if not d.startswith(".") and d not in ("node_modules", "__pycache__", ".git", "venv", ".venv")
-                ]
-        except (PermissionError, OSError):
-            pass
+    search_roots = unique_dirs(node_search_paths)
+    if search_roots:
+        tracker.update(search_roots[0])  # one find(1) pass covers them all
+    nm_paths = _find_node_modules(search_roots)
+    if nm_paths is None:
+        nm_paths = [nm for root in search_roots for nm in _walk_node_modules(root)]
+    for nm_path in nm_paths:
+        project_name = os.path.basename(os.path.dirname(nm_path))
+        targets.append((f"node_modules ({project_name})", nm_path,
+                        f"Node.js dependencies for {project_name}", "safe"))
 
     # ── Python venv and pip cache ──
     pip_cache = os.path.join(LIBRARY, "Caches", "pip")
-    if dir_exists(pip_cache):
-        size = get_dir_size_fast(pip_cache)
-        if size > MIN_ITEM_SIZE:
-            item = {
-                "path": pip_cache,
-                "size": size,
-                "size_formatted": format_size(size),
-                "last_accessed": get_last_accessed(pip_cache),
-                "risk": "safe",
-                "category": "dev_cache",
-                "name": "Python pip Cache",
-                "description": "Cached pip package downloads",
-            }
-            items.append(item)
-            tracker.update(pip_cache, files=1, bytes_added=size)
-            emit({"event": "item", **item})
+    targets.append(("Python pip Cache", pip_cache, "Cached pip package downloads", "safe"))
 
     # ── Homebrew ──
     homebrew_cache = os.path.join(LIBRARY, "Caches", "Homebrew")
-    if dir_exists(homebrew_cache):
-        size = get_dir_size_fast(homebrew_cache)
-        if size > MIN_ITEM_SIZE:
-            item = {
-                "path": homebrew_cache,
-                "size": size,
-                "size_formatted": format_size(size),
-                "last_accessed": get_last_accessed(homebrew_cache),
-                "risk": "safe",
-                "category": "dev_cache",
-                "name": "Homebrew Cache",
-                "description": "Homebrew downloaded packages and build artifacts",
-            }
-            items.append(item)
-            tracker.update(homebrew_cache, files=1, bytes_added=size)
-            emit({"event": "item", **item})
+    targets.append(("Homebrew Cache", homebrew_cache,
+                    "Homebrew downloaded packages and build artifacts", "safe"))
 
     # ── Cargo (Rust) ──
     cargo_registry = os.path.join(HOME, ".cargo", "registry")
-    if dir_exists(cargo_registry):
-        size = get_dir_size_fast(cargo_registry)
-        if size > MIN_ITEM_SIZE:
-            item = {
-                "path": cargo_registry,
-                "size": size,
-                "size_formatted": format_size(size),
-                "last_accessed": get_last_accessed(cargo_registry),
-                "risk": "safe",
-                "category": "dev_cache",
-                "name": "Cargo Registry Cache",
-                "description": "Rust crate registry cache and source downloads",
-            }
-            items.append(item)
-            tracker.update(cargo_registry, files=1, bytes_added=size)
-            emit({"event": "item", **item})
+    targets.append(("Cargo Registry Cache", cargo_registry,
+                    "Rust crate registry cache and source downloads", "safe"))
 
     # ── Go module cache ──
     go_cache = os.path.join(HOME, "go", "pkg", "mod", "cache")
@@ -802,312 +1294,186 @@ def scan_dev_caches(tracker: ProgressTracker) -> list:
         gopath = os.environ.get("GOPATH", "")
         if gopath:
             go_cache = os.path.join(gopath, "pkg", "mod", "cache")
-    if dir_exists(go_cache):
-        size = get_dir_size_fast(go_cache)
-        if size > MIN_ITEM_SIZE:
-            item = {
-                "path": go_cache,
-                "size": size,
-                "size_formatted": format_size(size),
-                "last_accessed": get_last_accessed(go_cache),
-                "risk": "safe",
-                "category": "dev_cache",
-                "name": "Go Module Cache",
-                "description": "Go module download cache",
-            }
-            items.append(item)
-            tracker.update(go_cache, files=1, bytes_added=size)
-            emit({"event": "item", **item})
+    targets.append(("Go Module Cache", go_cache, "Go module download cache", "safe"))
 
-    if items:
-        total = sum(i["size"] for i in items)
-        emit({
-            "event": "found",
-            "category": "dev_cache",
-            "name": "Developer Caches",
-            "count": len(items),
-            "total_bytes": total,
-            "total_formatted": format_size(total),
-        })
+    items, total = size_targets(tracker, targets, "dev_cache")
+    items = docker_items + items
+    total += docker_total
+
+    emit_found("dev_cache", "Developer Caches", items, total)
 
     return items
 
 
+# (name, path, description, risk) — constant per process, built once at import
+APP_TARGETS = (
+    ("Spotify Cache", f"{LIBRARY}/Caches/com.spotify.client", "Spotify streaming cache and offline data", "safe"),
+    ("Spotify App Support", f"{LIBRARY}/Application Support/Spotify/PersistentCache", "Spotify persistent cache data", "safe"),
+    ("Slack Cache", f"{LIBRARY}/Application Support/Slack/Cache", "Slack cached conversations and media", "safe"),
+    ("Slack Service Worker", f"{LIBRARY}/Application Support/Slack/Service Worker", "Slack service worker cache", "safe"),
+    ("Discord Cache", f"{LIBRARY}/Application Support/discord/Cache", "Discord cached messages and media", "safe"),
+    ("Discord Code Cache", f"{LIBRARY}/Application Support/discord/Code Cache", "Discord compiled code cache", "safe"),
+    ("Adobe Creative Cloud Cache", f"{LIBRARY}/Caches/Adobe", "Adobe application caches", "safe"),
+    ("Adobe CC App Data", f"{LIBRARY}/Application Support/Adobe/Common/Media Cache Files", "Adobe media cache files", "safe"),
+    ("Xcode DerivedData", f"{LIBRARY}/Developer/Xcode/DerivedData", "Compiled Xcode project build artifacts", "safe"),
+    ("Xcode Archives", f"{LIBRARY}/Developer/Xcode/Archives", "Xcode archived app builds", "caution"),
+    ("Xcode Device Logs", f"{LIBRARY}/Developer/Xcode/iOS DeviceSupport", "iOS device support files and symbols", "safe"),
+    ("Xcode Simulators", f"{LIBRARY}/Developer/CoreSimulator/Devices", "iOS Simulator installations and data", "caution"),
+    ("Xcode Caches", f"{LIBRARY}/Caches/com.apple.dt.Xcode", "Xcode internal caches", "safe"),
+    ("VS Code Cache", f"{LIBRARY}/Application Support/Code/Cache", "VS Code editor cache", "safe"),
+    ("VS Code Cached Extensions", f"{LIBRARY}/Application Support/Code/CachedExtensionVSIXs", "VS Code extension installation cache", "safe"),
+    ("Teams Cache", f"{LIBRARY}/Application Support/Microsoft Teams/Cache", "Microsoft Teams cache data", "safe"),
+    ("Zoom Cache", f"{LIBRARY}/Application Support/zoom.us/data", "Zoom cached data", "safe"),
+)
+APP_TARGETS_RECHECK = 6 * 3600  # seconds a daemon reuses its APP_TARGETS existence check
+
+_existing_app_targets: list = []
+_existing_app_targets_at: float | None = None
+
+
+def existing_app_targets() -> list:
+    """APP_TARGETS entries whose directory exists.
+
+    The existence check is remembered for APP_TARGETS_RECHECK seconds, so the
+    hourly daemon re-scans don't re-stat every target; a target that vanishes
+    in the meantime simply sizes to 0 and is dropped by size_targets.
+    """
+    global _existing_app_targets, _existing_app_targets_at
+    now = time.monotonic()
+    if _existing_app_targets_at is None or now - _existing_app_targets_at >= APP_TARGETS_RECHECK:
+        _existing_app_targets = [t for t in APP_TARGETS if dir_exists(t[1])]
+        _existing_app_targets_at = now
+    return _existing_app_targets
+
+
 def scan_app_caches(tracker: ProgressTracker) -> list:
     """Scan application-specific caches: Spotify, Slack, Discord, Adobe, Xcode."""
-    items = []
-    app_targets = [
-        # (name, path, description, risk)
-        ("Spotify Cache", os.path.join(LIBRARY, "Caches", "com.spotify.client"), "Spotify streaming cache and offline data", "safe"),
-        ("Spotify App Support", os.path.join(LIBRARY, "Application Support", "Spotify", "PersistentCache"), "Spotify persistent cache data", "safe"),
-        ("Slack Cache", os.path.join(LIBRARY, "Application Support", "Slack", "Cache"), "Slack cached conversations and media", "safe"),
-        ("Slack Service Worker", os.path.join(LIBRARY, "Application Support", "Slack", "Service Worker"), "Slack service worker cache", "safe"),
-        ("Discord Cache", os.path.join(LIBRARY, "Application Support", "discord", "Cache"), "Discord cached messages and media", "safe"),
-        ("Discord Code Cache", os.path.join(LIBRARY, "Application Support", "discord", "Code Cache"), "Discord compiled code cache", "safe"),
-        ("Adobe Creative Cloud Cache", os.path.join(LIBRARY, "Caches", "Adobe"), "Adobe application caches", "safe"),
-        ("Adobe CC App Data", os.path.join(LIBRARY, "Application Support", "Adobe", "Common", "Media Cache Files"), "Adobe media cache files", "safe"),
-        ("Xcode DerivedData", os.path.join(LIBRARY, "Developer", "Xcode", "DerivedData"), "Compiled Xcode project build artifacts", "safe"),
-        ("Xcode Archives", os.path.join(LIBRARY, "Developer", "Xcode", "Archives"), "Xcode archived app builds", "caution"),
-        ("Xcode Device Logs", os.path.join(LIBRARY, "Developer", "Xcode", "iOS DeviceSupport"), "iOS device support files and symbols", "safe"),
-        ("Xcode Simulators", os.path.join(LIBRARY, "Developer", "CoreSimulator", "Devices"), "iOS Simulator installations and data", "caution"),
-        ("Xcode Caches", os.path.join(LIBRARY, "Caches", "com.apple.dt.Xcode"), "Xcode internal caches", "safe"),
-        ("VS Code Cache", os.path.join(LIBRARY, "Application Support", "Code", "Cache"), "VS Code editor cache", "safe"),
-        ("VS Code Cached Extensions", os.path.join(LIBRARY, "Application Support", "Code", "CachedExtensionVSIXs"), "VS Code extension installation cache", "safe"),
-        ("Teams Cache", os.path.join(LIBRARY, "Application Support", "Microsoft Teams", "Cache"), "Microsoft Teams cache data", "safe"),
-        ("Zoom Cache", os.path.join(LIBRARY, "Application Support", "zoom.us", "data"), "Zoom cached data", "safe"),
-    ]
+    items, total = size_targets(tracker, existing_app_targets(), "app_cache")
 
-    for name, path, description, risk in app_targets:
-        if not dir_exists(path):
-            continue
-        tracker.update(path)
-        size = get_dir_size_fast(path)
-        if size > MIN_ITEM_SIZE:
-            item = {
-                "path": path,
-                "size": size,
-                "size_formatted": format_size(size),
-                "last_accessed": get_last_accessed(path),
-                "risk": risk,
-                "category": "app_cache",
-                "name": name,
-                "description": description,
-            }
-            items.append(item)
-            tracker.update(path, files=1, bytes_added=size)
-            emit({"event": "item", **item})
-
-    if items:
-        total = sum(i["size"] for i in items)
-        emit({
-            "event": "found",
-            "category": "app_cache",
-            "name": "Application Caches",
-            "count": len(items),
-            "total_bytes": total,
-            "total_formatted": format_size(total),
-        })
+    emit_found("app_cache", "Application Caches", items, total)
 
     return items
 
 
+# (name, path, description, risk); size_targets' up-front stat skips missing ones
+LOG_TARGETS = (
+    ("User Logs", f"{LIBRARY}/Logs", "Application and system log files in ~/Library/Logs", "safe"),
+    ("System Logs", "/var/log", "macOS system log files", "caution"),
+    ("ASL Logs", "/private/var/log/asl", "Apple System Log files", "safe"),
+    ("Diagnostic Reports", f"{LIBRARY}/Logs/DiagnosticReports", "Crash reports and diagnostic data", "safe"),
+    ("CoreSimulator Logs", f"{LIBRARY}/Logs/CoreSimulator", "iOS Simulator log files", "safe"),
+)
+
+
 def scan_system_logs(tracker: ProgressTracker) -> list:
     """Scan system and user log files."""
-    items = []
-    log_targets = [
-        ("User Logs", os.path.join(LIBRARY, "Logs"), "Application and system log files in ~/Library/Logs", "safe"),
-        ("System Logs", "/var/log", "macOS system log files", "caution"),
-        ("ASL Logs", "/private/var/log/asl", "Apple System Log files", "safe"),
-        ("Diagnostic Reports", os.path.join(LIBRARY, "Logs", "DiagnosticReports"), "Crash reports and diagnostic data", "safe"),
-        ("CoreSimulator Logs", os.path.join(LIBRARY, "Logs", "CoreSimulator"), "iOS Simulator log files", "safe"),
-    ]
+    items, total = size_targets(tracker, LOG_TARGETS, "system_logs")
 
-    for name, path, description, risk in log_targets:
-        if not dir_exists(path) and not os.path.isfile(path):
-            continue
-        tracker.update(path)
-        size = get_dir_size_fast(path) if os.path.isdir(path) else os.path.getsize(path)
-        if size > MIN_ITEM_SIZE:
-            item = {
-                "path": path,
-                "size": size,
-                "size_formatted": format_size(size),
-                "last_accessed": get_last_accessed(path),
-                "risk": risk,
-                "category": "system_logs",
-                "name": name,
-                "description": description,
-            }
-            items.append(item)
-            tracker.update(path, files=1, bytes_added=size)
-            emit({"event": "item", **item})
-
-    if items:
-        total = sum(i["size"] for i in items)
-        emit({
-            "event": "found",
-            "category": "system_logs",
-            "name": "System Logs",
-            "count": len(items),
-            "total_bytes": total,
-            "total_formatted": format_size(total),
-        })
+    emit_found("system_logs", "System Logs", items, total)
 
     return items
 
 
 def scan_mail_and_backups(tracker: ProgressTracker) -> list:
     """Scan Mail downloads, Time Machine snapshots, iOS backups, Trash."""
-    items = []
+    targets = []
 
     # ── Mail Downloads ──
     mail_downloads = os.path.join(LIBRARY, "Containers", "com.apple.mail", "Data", "Library", "Mail Downloads")
     if not dir_exists(mail_downloads):
         mail_downloads = os.path.join(LIBRARY, "Mail Downloads")
-    if dir_exists(mail_downloads):
-        tracker.update(mail_downloads)
-        size = get_dir_size_fast(mail_downloads)
-        if size > MIN_ITEM_SIZE:
-            item = {
-                "path": mail_downloads,
-                "size": size,
-                "size_formatted": format_size(size),
-                "last_accessed": get_last_accessed(mail_downloads),
-                "risk": "safe",
-                "category": "mail_backups",
-                "name": "Mail Downloads",
-                "description": "Email attachment downloads cached by Apple Mail",
-            }
-            items.append(item)
-            tracker.update(mail_downloads, files=1, bytes_added=size)
-            emit({"event": "item", **item})
-
-    # ── Time Machine Local Snapshots ──
-    try:
-        result = subprocess.run(
-            ["tmutil", "listlocalsnapshots", "/"],
-            capture_output=True, text=True, timeout=10
-        )
-        if result.returncode == 0 and result.stdout.strip():
-            snapshot_lines = [l for l in result.stdout.strip().split("\n") if l.strip()]
-            if snapshot_lines:
-                item = {
-                    "path": "/System/Volumes/Data/.TimeMachine",
-                    "size": 0,  # Can't easily determine size without root
-                    "size_formatted": f"{len(snapshot_lines)} snapshots",
-                    "last_accessed": get_last_accessed("/"),
-                    "risk": "caution",
-                    "category": "mail_backups",
-                    "name": f"Time Machine Snapshots ({len(snapshot_lines)})",
-                    "description": "Local Time Machine snapshots stored on this volume",
-                }
-                items.append(item)
-                emit({"event": "item", **item})
-    except (FileNotFoundError, subprocess.TimeoutExpired, OSError):
-        pass
+    targets.append(("Mail Downloads", mail_downloads,
+                    "Email attachment downloads cached by Apple Mail", "safe"))
 
     # ── iOS Backups ──
     ios_backups = os.path.join(LIBRARY, "Application Support", "MobileSync", "Backup")
     if dir_exists(ios_backups):
-        tracker.update(ios_backups)
-        size = get_dir_size_fast(ios_backups)
-        if size > MIN_ITEM_SIZE:
-            # Count individual backups
-            try:
-                backup_count = len([d for d in os.listdir(ios_backups) if os.path.isdir(os.path.join(ios_backups, d))])
-            except OSError:
-                backup_count = 0
-            item = {
-                "path": ios_backups,
-                "size": size,
-                "size_formatted": format_size(size),
-                "last_accessed": get_last_accessed(ios_backups),
-                "risk": "caution",
-                "category": "mail_backups",
-                "name": f"iOS Device Backups ({backup_count} backup{'s' if backup_count != 1 else ''})",
-                "description": "Local backups of iPhones and iPads via Finder/iTunes",
-            }
-            items.append(item)
-            tracker.update(ios_backups, files=1, bytes_added=size)
-            emit({"event": "item", **item})
+        # Count individual backups
+        try:
+            with os.scandir(ios_backups) as it:
+                backup_count = sum(1 for d in it if d.is_dir(follow_symlinks=False))
+        except OSError:
+            backup_count = 0
+        targets.append((f"iOS Device Backups ({backup_count} backup{'s' if backup_count != 1 else ''})",
+                        ios_backups, "Local backups of iPhones and iPads via Finder/iTunes", "caution"))
 
     # ── Trash ──
     trash_path = os.path.join(HOME, ".Trash")
     if dir_exists(trash_path):
-        tracker.update(trash_path)
-        size = get_dir_size_fast(trash_path)
-        if size > MIN_ITEM_SIZE:
-            # List trash contents for original locations
-            try:
-                trash_count = len(os.listdir(trash_path))
-            except OSError:
-                trash_count = 0
-            item = {
-                "path": trash_path,
-                "size": size,
-                "size_formatted": format_size(size),
-                "last_accessed": get_last_accessed(trash_path),
-                "risk": "safe",
-                "category": "mail_backups",
-                "name": f"Trash ({trash_count} items)",
-                "description": "Items in the macOS Trash that haven't been permanently deleted",
-            }
-            items.append(item)
-            tracker.update(trash_path, files=1, bytes_added=size)
-            emit({"event": "item", **item})
+        try:
+            trash_count = len(os.listdir(trash_path))
+        except OSError:
+            trash_count = 0
+        targets.append((f"Trash ({trash_count} items)", trash_path,
+                        "Items in the macOS Trash that haven't been permanently deleted", "safe"))
 
-    if items:
-        total = sum(i["size"] for i in items)
-        emit({
-            "event": "found",
+    items, total = size_targets(tracker, targets, "mail_backups")
+    # tmutil was started with the scan (prefetch_system_commands), so this
+    # normally just collects output that is already waiting
+    snapshot_lines = _tmutil_snapshots()
+
+    # ── Time Machine Local Snapshots ──
+    if snapshot_lines:
+        item = {
+            "path": "/System/Volumes/Data/.TimeMachine",
+            "size": 0,  # Can't easily determine size without root
+            "size_formatted": f"{len(snapshot_lines)} snapshots",
+            "last_accessed": get_last_accessed("/"),
+            "risk": "caution",
             "category": "mail_backups",
-            "name": "Mail, Backups & Trash",
-            "count": len(items),
-            "total_bytes": total,
-            "total_formatted": format_size(total),
-        })
+            "name": f"Time Machine Snapshots ({len(snapshot_lines)})",
+            "description": "Local Time Machine snapshots stored on this volume",
+        }
+        items.append(item)
+        emit({"event": "item", **item})
+
+    emit_found("mail_backups", "Mail, Backups & Trash", items, total)
 
     return items
 
 
+# ~/Library/Caches entries the dedicated scanners already cover (a tuple so
+# str.startswith tests them all in C)
+ALREADY_SCANNED_PREFIXES = (
+    "com.spotify.client", "com.apple.Safari", "com.apple.Safari.SafeBrowsing",
+    "Adobe", "pip", "Homebrew", "com.apple.dt.Xcode",
+    "com.google.Chrome", "com.microsoft.Edge", "com.brave.Browser",
+)
+
+
 def scan_general_caches(tracker: ProgressTracker) -> list:
     """Scan ~/Library/Caches for remaining app caches not covered by specific scanners."""
-    items = []
     caches_root = os.path.join(LIBRARY, "Caches")
 
-    # Already-scanned cache prefixes to skip
-    already_scanned = {
-        "com.spotify.client", "com.apple.Safari", "com.apple.Safari.SafeBrowsing",
-        "Adobe", "pip", "Homebrew", "com.apple.dt.Xcode",
-        "com.google.Chrome", "com.microsoft.Edge", "com.brave.Browser",
-    }
-
     if not dir_exists(caches_root):
-        return items
+        return []
 
+    targets = []
     try:
-        for entry in os.listdir(caches_root):
-            if any(entry.startswith(prefix) or entry == prefix for prefix in already_scanned):
-                continue
-            entry_path = os.path.join(caches_root, entry)
-            if not os.path.isdir(entry_path):
-                continue
-            tracker.update(entry_path)
-            size = get_dir_size_fast(entry_path)
-            if size > 5 * 1024 * 1024:  # Only report caches > 5MB
-                item = {
-                    "path": entry_path,
-                    "size": size,
-                    "size_formatted": format_size(size),
-                    "last_accessed": get_last_accessed(entry_path),
-                    "risk": "safe",
-                    "category": "general_cache",
-                    "name": f"Cache: {entry}",
-                    "description": f"Application cache for {entry}",
-                }
-                items.append(item)
-                tracker.update(entry_path, files=1, bytes_added=size)
-                emit({"event": "item", **item})
+        with os.scandir(caches_root) as it:
+            for entry in it:
+                if entry.name.startswith(ALREADY_SCANNED_PREFIXES):
+                    continue
+                # d_type from the directory read; no extra stat per entry
+                if entry.is_dir(follow_symlinks=False):
+                    targets.append((f"Cache: {entry.name}", entry.path,
+                                    f"Application cache for {entry.name}", "safe"))
     except (PermissionError, OSError):
         pass
 
-    if items:
-        total = sum(i["size"] for i in items)
-        emit({
-            "event": "found",
-            "category": "general_cache",
-            "name": "Other Application Caches",
-            "count": len(items),
-            "total_bytes": total,
-            "total_formatted": format_size(total),
-        })
+    # Only report caches > 5MB
+    items, total = size_targets(tracker, targets, "general_cache", min_size=5 * 1024 * 1024)
+
+    emit_found("general_cache", "Other Application Caches", items, total)
 
     return items
 
 
 # ─── Pass 2: Full Disk Usage Map ─────────────────────────────────────────────
 
-# macOS-style category classification for directories
+# macOS-style category classification for directories.  Looked up with a
+# plain dict.get: one hash probe beats a generated if/elif chain for tables
+# this size, and it runs once per top-level folder.
 DISK_CATEGORIES = {
     # Home directory mappings
     "Desktop": "documents",
@@ -1169,23 +1535,34 @@ CATEGORY_DISPLAY = {
 }
 
 
-def scan_full_disk(tracker: ProgressTracker) -> dict:
+# Largest dirs kept per disk-map category; the rest are rolled into one node
+CATEGORY_TOP_DIRS = 50
+
+# Any of these directly inside a top-level home folder files it under Developer
+_DEV_MARKERS = (".git", "package.json", "Cargo.toml", "go.mod", "setup.py", "Makefile", "CMakeLists.txt")
+
+
+def _list_dir(path: str) -> list:
+    """Read a whole directory listing (closes the scandir handle before returning)."""
+    with os.scandir(path) as it:
+        return list(it)
+
+
+def scan_full_disk(tracker: ProgressTracker, prefetch: bool = True) -> dict:
     """Pass 2: DEEP recursive scan of entire home directory, Library, and Applications.
     
     Walks every directory recursively to build a complete nested tree of where
     every byte lives. This is DaisyDisk/WhatSize-level granularity — the user
     can see exactly what's inside every folder.
+
+    With prefetch on, the listing of the next sibling directory is read on a
+    background thread while the current one is being walked, so readdir
+    latency overlaps with stat/bookkeeping work.  The pipeline is two deep
+    (current + next) and listings are materialized, so no extra directory
+    handles stay open.
     """
     tracker.phase = "full_map"
-    emit({
-        "event": "progress",
-        "phase": "full_map",
-        "dir": "Mapping entire disk recursively...",
-        "files": tracker.files_processed,
-        "bytes": tracker.bytes_scanned,
-        "rate_mbps": 0, "eta_seconds": -1,
-        "elapsed": round(time.monotonic() - tracker.start_time, 1),
-    })
+    tracker.announce("Mapping entire disk recursively...")
 
     categories = {}
     for cat_id, meta in CATEGORY_DISPLAY.items():
@@ -1199,10 +1576,19 @@ def scan_full_disk(tracker: ProgressTracker) -> dict:
 
     total_mapped = 0
     seen_inodes = set()  # Avoid double-counting hard links
+    inode_lock = Lock()
+    prefetch_pool = ThreadPoolExecutor(max_workers=SIZING_WORKERS) if prefetch else None
+
+    def start_listing(dir_path: str):
+        """Kick off a background listing of dir_path (None when prefetch is off)."""
+        if prefetch_pool is None:
+            return None
+        return prefetch_pool.submit(_list_dir, dir_path)
 
-    def walk_dir_recursive(dir_path: str, max_depth: int = 5, current_depth: int = 0):
+    def walk_dir_recursive(dir_path: str, max_depth: int = 5, current_depth: int = 0, listing=None):
         """Recursively walk a directory and return a tree node with children.
         
+        listing: optional Future already reading dir_path's entries.
         Returns: {"name", "path", "bytes", "children": [...], "file_count"}
         """
         name = os.path.basename(dir_path) or dir_path
@@ -1216,7 +1602,7 @@ def scan_full_disk(tracker: ProgressTracker) -> dict:
         }
 
         try:
-            entries = list(os.scandir(dir_path))
+            entries = listing.result() if listing is not None else _list_dir(dir_path)
         except (PermissionError, OSError) as e:
             tracker.record_error(dir_path, e)
             # Still show this node — try du -sk for best-effort size
@@ -1240,10 +1626,11 @@ def scan_full_disk(tracker: ProgressTracker) -> dict:
                     st = entry.stat(follow_symlinks=False)
                     # Avoid double-counting hard links
                     if st.st_nlink > 1:
-                        if st.st_ino in seen_inodes:
-                            continue
-                        seen_inodes.add(st.st_ino)
-                    fsize = st.st_size
+                        with inode_lock:
+                            if st.st_ino in seen_inodes:
+                                continue
+                            seen_inodes.add(st.st_ino)
+                    fsize = st.st_blocks * STAT_BLOCK_SIZE
                     node["bytes"] += fsize
                     node["file_count"] += 1
                     loose_files_size += fsize
@@ -1252,17 +1639,20 @@ def scan_full_disk(tracker: ProgressTracker) -> dict:
                 elif entry.is_dir(follow_symlinks=False):
                     if _is_du_only_path(entry.path):
                         # Measure without recursing into virtual/bundle filesystems.
-                        # Use pure Python get_dir_size_fast — no subprocess spawning.
+                        # Pure Python, bounded walk — no subprocess spawning.
                         try:
-                            csize = get_dir_size_fast(entry.path)
+                            csize, estimated = estimate_dir_size(entry.path)
                             node["children"].append({
                                 "name": entry.name,
                                 "path": entry.path,
                                 "bytes": csize,
                                 "children": [],
                                 "file_count": 0,
+                                "estimated": estimated,
                             })
                             node["bytes"] += csize
+                            if estimated:
+                                node["estimated"] = True
                         except Exception:
                             pass
                         continue
@@ -1292,19 +1682,26 @@ def scan_full_disk(tracker: ProgressTracker) -> dict:
 
         # Recurse into child directories — always add every node, even locked/empty ones
         if current_depth < max_depth:
-            for child_entry in child_dirs:
-                tracker.update(child_entry.path, files=0, bytes_added=0)
-                child_node = walk_dir_recursive(child_entry.path, max_depth, current_depth + 1)
+            pending = start_listing(child_dirs[0].path) if child_dirs else None
+            for i, child_entry in enumerate(child_dirs):
+                # Queue the next sibling's listing before descending into this one
+                upcoming = start_listing(child_dirs[i + 1].path) if i + 1 < len(child_dirs) else None
+                tracker.update(child_entry.path)
+                child_node = walk_dir_recursive(child_entry.path, max_depth, current_depth + 1, pending)
+                pending = upcoming
                 node["children"].append(child_node)
                 node["bytes"] += child_node["bytes"]
                 node["file_count"] += child_node["file_count"]
+                if child_node.get("estimated"):
+                    node["estimated"] = True
         else:
             # At max depth, size the child dirs without recursing — always include them
             for child_entry in child_dirs:
                 locked = False
+                estimated = False
                 csize = 0
                 try:
-                    csize = get_dir_size_fast(child_entry.path)
+                    csize, estimated = estimate_dir_size(child_entry.path)
                 except (PermissionError, OSError):
                     locked = True
                 node["children"].append({
@@ -1314,8 +1711,11 @@ def scan_full_disk(tracker: ProgressTracker) -> dict:
                     "children": [],
                     "file_count": 0,
                     "locked": locked,
+                    "estimated": estimated,
                 })
                 node["bytes"] += csize
+                if estimated:
+                    node["estimated"] = True
 
         # Add loose files as a single entry if significant
         if loose_files_size > 1024 * 1024 and node["children"]:  # > 1 MB
@@ -1329,7 +1729,7 @@ def scan_full_disk(tracker: ProgressTracker) -> dict:
             })
 
         # Sort children by size, largest first
-        node["children"].sort(key=lambda x: x["bytes"], reverse=True)
+        node["children"].sort(key=itemgetter("bytes"), reverse=True)
 
         # Keep top 30 children to avoid massive payloads, roll up the rest
         if len(node["children"]) > 30:
@@ -1348,203 +1748,199 @@ def scan_full_disk(tracker: ProgressTracker) -> dict:
 
         return node
 
-    # ── 1. Scan every top-level home directory RECURSIVELY ──
-    try:
-        for entry in os.scandir(HOME):
-            if not entry.is_dir(follow_symlinks=False) and not entry.is_file(follow_symlinks=False):
-                continue
+    cat_lock = Lock()
+    # Per category: min-heap of the CATEGORY_TOP_DIRS largest (bytes, seq, node)
+    # entries, plus [count, bytes, files] of nodes that fell out of it.
+    top_dirs = {cat_id: [] for cat_id in categories}
+    overflow = {cat_id: [0, 0, 0] for cat_id in categories}
+    seq = itertools.count()
+
+    def add_to_category(cat: str, nbytes: int, node: dict | None = None, counted: bool = True):
+        """Fold one mapped entry into its category (passes run on separate threads)."""
+        nonlocal total_mapped
+        with cat_lock:
+            bucket = categories[cat]
+            bucket["bytes"] += nbytes
+            if counted:
+                bucket["count"] += 1
+            total_mapped += nbytes
+            if node is None:
+                return
+            heap = top_dirs[cat]
+            entry = (node["bytes"], next(seq), node)
+            if len(heap) < CATEGORY_TOP_DIRS:
+                heapq.heappush(heap, entry)
+                return
+            dropped = heapq.heappushpop(heap, entry)[2]
+            rest = overflow[cat]
+            rest[0] += 1
+            rest[1] += dropped["bytes"]
+            rest[2] += dropped.get("file_count", 0)
 
-            name = entry.name
-            entry_path = entry.path
-
-            if name == "Library":
-                continue  # Scanned separately below
-
-            tracker.update(entry_path)
-            emit({
-                "event": "progress",
-                "phase": "full_map",
-                "dir": f"Scanning ~/{name}...",
-                "files": tracker.files_processed,
-                "bytes": tracker.bytes_scanned,
-                "rate_mbps": 0, "eta_seconds": -1,
-                "elapsed": round(time.monotonic() - tracker.start_time, 1),
-            })
-
-            cat = DISK_CATEGORIES.get(name, "other")
-            if cat == "other" and entry.is_dir(follow_symlinks=False):
-                try:
-                    children = {e.name for e in os.scandir(entry_path)}
-                    if children & {".git", "package.json", "Cargo.toml", "go.mod", "setup.py", "Makefile", "CMakeLists.txt"}:
-                        cat = "developer"
-                except (PermissionError, OSError):
-                    pass
+    # ── 1. Scan every top-level home directory RECURSIVELY ──
+    def map_home():
+        try:
+            for entry in os.scandir(HOME):
+                if not entry.is_dir(follow_symlinks=False) and not entry.is_file(follow_symlinks=False):
+                    continue
 
-            if entry.is_dir(follow_symlinks=False):
-                # DEEP RECURSIVE WALK
-                dir_node = walk_dir_recursive(entry_path, max_depth=4)
-                dir_node["formatted"] = format_size(dir_node["bytes"])
-                categories[cat]["bytes"] += dir_node["bytes"]
-                categories[cat]["count"] += 1
-                categories[cat]["dirs"].append(dir_node)
-                total_mapped += dir_node["bytes"]
-            else:
-                try:
-                    size = entry.stat(follow_symlinks=False).st_size
-                    if size > 0:
-                        categories[cat]["bytes"] += size
-                        categories[cat]["dirs"].append({
-                            "name": name, "path": entry_path,
-                            "bytes": size, "formatted": format_size(size),
-                            "children": [],
-                        })
-                        total_mapped += size
-                except OSError:
-                    pass
+                name = entry.name
+                entry_path = entry.path
 
-            tracker.update(entry_path, files=1, bytes_added=0)
+                if name == "Library":
+                    continue  # Scanned separately below
 
-    except (PermissionError, OSError) as e:
-        tracker.record_error(HOME, e)
+                tracker.announce(f"Scanning ~/{name}...")
 
-    # ── 2. Scan ~/Library RECURSIVELY ──
-    emit({
-        "event": "progress",
-        "phase": "full_map",
-        "dir": "Scanning ~/Library...",
-        "files": tracker.files_processed,
-        "bytes": tracker.bytes_scanned,
-        "rate_mbps": 0, "eta_seconds": -1,
-        "elapsed": round(time.monotonic() - tracker.start_time, 1),
-    })
-    try:
-        for entry in os.scandir(LIBRARY):
-            if not entry.is_dir(follow_symlinks=False):
-                continue
+                cat = DISK_CATEGORIES.get(name, "other")
+                if cat == "other" and entry.is_dir(follow_symlinks=False):
+                    # A few lstat probes instead of reading the whole directory
+                    if any(os.path.lexists(os.path.join(entry_path, m)) for m in _DEV_MARKERS):
+                        cat = "developer"
 
-            name = entry.name
-            entry_path = entry.path
-            tracker.update(entry_path)
+                if entry.is_dir(follow_symlinks=False):
+                    # DEEP RECURSIVE WALK
+                    dir_node = walk_dir_recursive(entry_path, max_depth=4)
+                    dir_node["formatted"] = format_size(dir_node["bytes"])
+                    add_to_category(cat, dir_node["bytes"], dir_node)
+                else:
+                    try:
+                        size = physical_size(entry.stat(follow_symlinks=False))
+                        if size > 0:
+                            add_to_category(cat, size, {
+                                "name": name, "path": entry_path,
+                                "bytes": size, "formatted": format_size(size),
+                                "children": [],
+                            }, counted=False)
+                    except OSError:
+                        pass
 
-            cat = LIBRARY_CATEGORIES.get(name, "system_data")
+                tracker.update(entry_path, files=1, bytes_added=0)
 
-            # DEEP RECURSIVE WALK — always include, even if small/empty
-            dir_node = walk_dir_recursive(entry_path, max_depth=3)
-            dir_node["name"] = f"Library/{name}"
-            dir_node["formatted"] = format_size(dir_node["bytes"])
-            categories[cat]["bytes"] += dir_node["bytes"]
-            categories[cat]["count"] += 1
-            categories[cat]["dirs"].append(dir_node)
-            total_mapped += dir_node["bytes"]
-            tracker.update(entry_path, files=1, bytes_added=dir_node["bytes"])
+        except (PermissionError, OSError) as e:
+            tracker.record_error(HOME, e)
 
-    except (PermissionError, OSError) as e:
-        tracker.record_error(LIBRARY, e)
+    # ── 2. Scan ~/Library RECURSIVELY ──
+    def map_library_entry(entry):
+        name = entry.name
+        entry_path = entry.path
+        cat = LIBRARY_CATEGORIES.get(name, "system_data")
+
+        # DEEP RECURSIVE WALK — always include, even if small/empty
+        dir_node = walk_dir_recursive(entry_path, max_depth=3)
+        dir_node["name"] = f"Library/{name}"
+        dir_node["formatted"] = format_size(dir_node["bytes"])
+        add_to_category(cat, dir_node["bytes"], dir_node)
+        tracker.update(entry_path, files=1, bytes_added=dir_node["bytes"])
+
+    def map_library():
+        tracker.announce("Scanning ~/Library...")
+        try:
+            with os.scandir(LIBRARY) as it:
+                entries = [entry for entry in it if entry.is_dir(follow_symlinks=False)]
+        except (PermissionError, OSError) as e:
+            tracker.record_error(LIBRARY, e)
+            return
+        # Library subtrees are independent; walk several at once
+        with ThreadPoolExecutor(max_workers=SIZING_WORKERS) as executor:
+            for _ in executor.map(map_library_entry, entries):
+                pass
 
     # ── 3. Scan /Applications RECURSIVELY ──
-    emit({
-        "event": "progress",
-        "phase": "full_map",
-        "dir": "Scanning /Applications...",
-        "files": tracker.files_processed,
-        "bytes": tracker.bytes_scanned,
-        "rate_mbps": 0, "eta_seconds": -1,
-        "elapsed": round(time.monotonic() - tracker.start_time, 1),
-    })
     apps_path = "/Applications"
-    try:
-        total_apps = 0
-        app_count = 0
-        for entry in os.scandir(apps_path):
-            if not entry.is_dir(follow_symlinks=False):
-                continue
-            try:
-                # Apps don't need deep recursion — just total size
-                size = get_dir_size_fast(entry.path)
+
+    def map_applications():
+        tracker.announce("Scanning /Applications...")
+        try:
+            with os.scandir(apps_path) as it:
+                entries = [entry for entry in it if entry.is_dir(follow_symlinks=False)]
+        except (PermissionError, OSError):
+            return
+        # Apps don't need deep recursion — just total size, several bundles at a time
+        with ThreadPoolExecutor(max_workers=SIZING_WORKERS) as executor:
+            sizes = executor.map(get_dir_size_fast, [entry.path for entry in entries])
+            for entry, size in zip(entries, sizes):
                 if size > 1024 * 1024:
-                    total_apps += size
-                    app_count += 1
-                    categories["applications"]["dirs"].append({
+                    add_to_category("applications", size, {
                         "name": entry.name.replace(".app", ""),
                         "path": entry.path,
                         "bytes": size,
                         "formatted": format_size(size),
                         "children": [],
                     })
-            except (PermissionError, OSError):
-                pass
-            tracker.update(entry.path)
-
-        categories["applications"]["bytes"] = total_apps
-        categories["applications"]["count"] = app_count
-        total_mapped += total_apps
-    except (PermissionError, OSError):
-        pass
+                tracker.update(entry.path)
 
     # ── 4. Scan remaining top-level disk roots (user-accessible storage only) ──
     # Now that the `du` .app fork-bomb bug is fixed, we can safely sweep /System,
     # /private, and other Apple OS directories without crashing photolibraryd.
     _ALREADY_SCANNED = {HOME, LIBRARY, apps_path}
     _SKIP_VIRTUAL = {"/dev", "/proc"}  # True virtual kernel interfaces, not real storage
-    emit({
-        "event": "progress",
-        "phase": "full_map",
-        "dir": "Scanning full disk...",
-        "files": tracker.files_processed,
-        "bytes": tracker.bytes_scanned,
-        "rate_mbps": 0, "eta_seconds": -1,
-        "elapsed": round(time.monotonic() - tracker.start_time, 1),
-    })
-    try:
-        for entry in os.scandir("/"):
-            if entry.path in _SKIP_VIRTUAL:
-                continue
-            if entry.path in _ALREADY_SCANNED:
-                continue
-            if not entry.is_dir(follow_symlinks=False) and not entry.is_file(follow_symlinks=False):
-                continue
-            cat = "system_data"
-            if entry.name in ("Users",):
-                # Scan other user home dirs too
-                try:
-                    for user_entry in os.scandir(entry.path):
-                        if user_entry.is_dir(follow_symlinks=False) and user_entry.path != HOME:
-                            user_node = walk_dir_recursive(user_entry.path, max_depth=3)
-                            user_node["formatted"] = format_size(user_node["bytes"])
-                            categories["system_data"]["bytes"] += user_node["bytes"]
-                            categories["system_data"]["count"] += 1
-                            categories["system_data"]["dirs"].append(user_node)
-                            total_mapped += user_node["bytes"]
-                except (PermissionError, OSError):
-                    pass
-                continue
-            if entry.is_dir(follow_symlinks=False):
-                dir_node = walk_dir_recursive(entry.path, max_depth=3)
-                dir_node["formatted"] = format_size(dir_node["bytes"])
-                categories[cat]["bytes"] += dir_node["bytes"]
-                categories[cat]["count"] += 1
-                categories[cat]["dirs"].append(dir_node)
-                total_mapped += dir_node["bytes"]
-            else:
-                try:
-                    size = entry.stat(follow_symlinks=False).st_size
-                    categories[cat]["bytes"] += size
-                    total_mapped += size
-                except OSError:
-                    pass
-    except (PermissionError, OSError) as e:
-        tracker.record_error("/", e)
-
-    # ── 4. Sort each category's dirs by size ──
-    for cat in categories.values():
-        cat["dirs"].sort(key=lambda x: x["bytes"], reverse=True)
 
-    # ── 5. Detect hidden/purgeable space ──
-    hidden_space = detect_hidden_space(total_mapped)
+    def map_disk_roots():
+        tracker.announce("Scanning full disk...")
+        try:
+            for entry in os.scandir("/"):
+                if entry.path in _SKIP_VIRTUAL:
+                    continue
+                if entry.path in _ALREADY_SCANNED:
+                    continue
+                if not entry.is_dir(follow_symlinks=False) and not entry.is_file(follow_symlinks=False):
+                    continue
+                cat = "system_data"
+                if entry.name in ("Users",):
+                    # Scan other user home dirs too
+                    try:
+                        for user_entry in os.scandir(entry.path):
+                            if user_entry.is_dir(follow_symlinks=False) and user_entry.path != HOME:
+                                user_node = walk_dir_recursive(user_entry.path, max_depth=3)
+                                user_node["formatted"] = format_size(user_node["bytes"])
+                                add_to_category("system_data", user_node["bytes"], user_node)
+                    except (PermissionError, OSError):
+                        pass
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    dir_node = walk_dir_recursive(entry.path, max_depth=3)
+                    dir_node["formatted"] = format_size(dir_node["bytes"])
+                    add_to_category(cat, dir_node["bytes"], dir_node)
+                else:
+                    try:
+                        size = physical_size(entry.stat(follow_symlinks=False))
+                        add_to_category(cat, size, counted=False)
+                    except OSError:
+                        pass
+        except (PermissionError, OSError) as e:
+            tracker.record_error("/", e)
+
+    # The four passes cover disjoint roots and only meet in add_to_category,
+    # the inode set and the (locked) tracker, so their metadata latency overlaps.
+    passes = (map_home, map_library, map_applications, map_disk_roots)
+    with ThreadPoolExecutor(max_workers=len(passes)) as executor:
+        for future in [executor.submit(p) for p in passes]:
+            future.result()
+
+    if prefetch_pool is not None:
+        prefetch_pool.shutdown()
+
+    # ── 4. Each category's kept dirs, largest first, then the rolled-up rest ──
+    for cat_id, cat in categories.items():
+        cat["dirs"] = [node for _, _, node in sorted(top_dirs[cat_id], reverse=True)]
+        rest_count, rest_bytes, rest_files = overflow[cat_id]
+        if rest_count:
+            cat["dirs"].append({
+                "name": f"({rest_count} more items)",
+                "path": "",
+                "bytes": rest_bytes,
+                "formatted": format_size(rest_bytes),
+                "children": [],
+                "file_count": rest_files,
+            })
 
-    # ── 6. Get disk totals ──
+    # ── 5. Get disk totals ──
     disk = check_disk_space()
 
+    # ── 6. Detect hidden/purgeable space ──
+    hidden_space = detect_hidden_space(total_mapped, disk)
+
     return {
         "categories": categories,
         "total_mapped": total_mapped,
@@ -1555,8 +1951,14 @@ def scan_full_disk(tracker: ProgressTracker) -> dict:
     }
 
 
-def detect_hidden_space(total_mapped: int) -> dict:
-    """Detect APFS purgeable space, Time Machine snapshots, and unaccounted space."""
+_BYTES_IN_PARENS_RE = re.compile(r'\((\d+)\s*Bytes?\)')
+
+
+def detect_hidden_space(total_mapped: int, disk: dict | None = None) -> dict:
+    """Detect APFS purgeable space, Time Machine snapshots, and unaccounted space.
+
+    disk: check_disk_space() result when the caller already has one.
+    """
     result = {
         "purgeable_bytes": 0,
         "snapshots": [],
@@ -1565,38 +1967,22 @@ def detect_hidden_space(total_mapped: int) -> dict:
     }
 
     # APFS purgeable space
-    try:
-        r = subprocess.run(
-            ["diskutil", "info", "/"],
-            capture_output=True, text=True, timeout=10
-        )
-        if r.returncode == 0:
-            for line in r.stdout.split("\n"):
-                if "Purgeable" in line and "Bytes" in line:
-                    # Parse: "   Container Free Space:  3.1 GB (3145728000 Bytes)"
-                    import re
-                    match = re.search(r'\((\d+)\s*Bytes?\)', line)
-                    if match:
-                        result["purgeable_bytes"] = int(match.group(1))
-                        break
-    except (FileNotFoundError, subprocess.TimeoutExpired, OSError):
-        pass
+    # Parse: "   Container Free Space:  3.1 GB (3145728000 Bytes)"
+    for line in _diskutil_info().splitlines():
+        if "Purgeable" in line and "Bytes" in line:
+            match = _BYTES_IN_PARENS_RE.search(line)
+            if match:
+                result["purgeable_bytes"] = int(match.group(1))
+                break
 
     # Time Machine local snapshots
-    try:
-        r = subprocess.run(
-            ["tmutil", "listlocalsnapshots", "/"],
-            capture_output=True, text=True, timeout=10
-        )
-        if r.returncode == 0:
-            snaps = [l.strip() for l in r.stdout.strip().split("\n") if l.strip() and "com.apple" in l]
-            result["snapshots"] = snaps[:10]  # Keep first 10
-            result["snapshot_count"] = len(snaps)
-    except (FileNotFoundError, subprocess.TimeoutExpired, OSError):
-        pass
+    snaps = [l for l in _tmutil_snapshots() if "com.apple" in l]
+    result["snapshots"] = snaps[:10]  # Keep first 10
+    result["snapshot_count"] = len(snaps)
 
     # Unaccounted space: disk used - total mapped
-    disk = check_disk_space()
+    if disk is None:
+        disk = check_disk_space()
     disk_used = disk["total_bytes"] - disk["free_bytes"] if disk["total_bytes"] > 0 else 0
     if disk_used > total_mapped:
         result["unaccounted_bytes"] = disk_used - total_mapped
@@ -1604,6 +1990,10 @@ def detect_hidden_space(total_mapped: int) -> dict:
     return result
 
 
+# Leaves per cleanable sub-category in the sunburst tree
+CLEANABLE_TREE_TOP = 100
+
+
 def build_full_disk_tree(disk_map: dict, cleanable_items: list) -> dict:
     """Build a unified tree showing full disk usage with cleanable items highlighted.
     
@@ -1620,6 +2010,8 @@ def build_full_disk_tree(disk_map: dict, cleanable_items: list) -> dict:
         }
         if node.get("path"):
             result["path"] = node["path"]
+        if node.get("estimated"):
+            result["estimated"] = True
         children = node.get("children", [])
         if children:
             result["children"] = [convert_walk_node(c) for c in children if c.get("bytes", 0) > 0]
@@ -1671,15 +2063,24 @@ def build_full_disk_tree(disk_map: dict, cleanable_items: list) -> dict:
 
         for sub_cat, items in clean_cats.items():
             sub_total = sum(i["size"] for i in items)
+            # Only the largest items become leaves; the tail is one roll-up wedge
+            largest = heapq.nlargest(CLEANABLE_TREE_TOP, items, key=itemgetter("size"))
+            children = [
+                {"name": i["name"], "size": i["size"], "path": i["path"],
+                 "risk": i["risk"], "cleanable": not i.get("virtual")}
+                for i in largest
+            ]
+            if len(items) > len(largest):
+                children.append({
+                    "name": f"({len(items) - len(largest)} more items)",
+                    "size": sub_total - sum(i["size"] for i in largest),
+                    "cleanable": True,
+                })
             sub_node = {
                 "name": category_labels.get(sub_cat, sub_cat),
                 "size": sub_total,
                 "cleanable": True,
-                "children": [
-                    {"name": i["name"], "size": i["size"], "path": i["path"],
-                     "risk": i["risk"], "cleanable": True}
-                    for i in sorted(items, key=lambda x: x["size"], reverse=True)
-                ],
+                "children": children,
             }
             clean_node["children"].append(sub_node)
 
@@ -1700,7 +2101,7 @@ def build_full_disk_tree(disk_map: dict, cleanable_items: list) -> dict:
         })
         root["size"] += unaccounted
 
-    root["children"].sort(key=lambda x: x["size"], reverse=True)
+    root["children"].sort(key=itemgetter("size"), reverse=True)
 
     return root
 
@@ -1709,7 +2110,6 @@ def build_full_disk_tree(disk_map: dict, cleanable_items: list) -> dict:
 
 def build_tree(items: list) -> dict:
     """Build a hierarchical tree structure from discovered items for sunburst visualization."""
-    root = {"name": "Storage", "children": {}, "size": 0}
 
     category_labels = {
         "browser_cache": "Browser Caches",
@@ -1720,37 +2120,30 @@ def build_tree(items: list) -> dict:
         "general_cache": "Other Caches",
     }
 
+    # One pass groups leaves straight into per-category lists (first-seen order)
+    cat_children = defaultdict(list)
+    cat_size = defaultdict(int)
     for item in items:
         category = item.get("category", "other")
         cat_label = category_labels.get(category, category)
-
-        if cat_label not in root["children"]:
-            root["children"][cat_label] = {"name": cat_label, "children": {}, "size": 0}
-
-        cat_node = root["children"][cat_label]
-        cat_node["size"] += item["size"]
-        root["size"] += item["size"]
-
-        # Add item as leaf
-        item_name = item["name"]
-        cat_node["children"][item_name] = {
-            "name": item_name,
-            "size": item["size"],
+        size = item["size"]
+        cat_size[cat_label] += size
+        cat_children[cat_label].append({
+            "name": item["name"],
+            "size": size,
             "path": item["path"],
             "risk": item["risk"],
             "last_accessed": item.get("last_accessed", "Unknown"),
-        }
-
-    # Convert children dicts to lists for D3
-    def convert_children(node):
-        if "children" in node and isinstance(node["children"], dict):
-            children_list = list(node["children"].values())
-            for child in children_list:
-                convert_children(child)
-            node["children"] = children_list
-        return node
+        })
 
-    return convert_children(root)
+    return {
+        "name": "Storage",
+        "size": sum(cat_size.values()),
+        "children": [
+            {"name": label, "children": children, "size": cat_size[label]}
+            for label, children in cat_children.items()
+        ],
+    }
 
 
 # ─── Agent Intelligence: Semantic File Classifier ────────────────────────────
@@ -1799,6 +2192,28 @@ TEMP_INDICATORS = {"tmp", "temp", "cache", "backup", ".bak", "old", "copy", "dra
                    "~", ".swp", ".swo", ".DS_Store", ".localized"}
 
 
+def _keyword_regex(keywords) -> re.Pattern:
+    """One alternation per keyword list, so matching runs in the regex engine."""
+    return re.compile("|".join(re.escape(kw) for kw in keywords))
+
+
+# keyword -> category, and one alternation over every keyword (longest first so
+# e.g. "cover letter" is reported rather than a shorter overlapping keyword)
+_SEMANTIC_KEYWORD_LABEL = {kw: label for label, p in SEMANTIC_PATTERNS.items() for kw in p["keywords"]}
+_SEMANTIC_KEYWORD_RE = _keyword_regex(sorted(_SEMANTIC_KEYWORD_LABEL, key=len, reverse=True))
+_TEMP_INDICATOR_RE = _keyword_regex(sorted(TEMP_INDICATORS))
+_EXT_TO_LABEL = {ext: label for label, p in SEMANTIC_PATTERNS.items() for ext in p["extensions"]}
+_SEMANTIC_ORDER = {label: i for i, label in enumerate(SEMANTIC_PATTERNS)}
+
+
+def _keyword_hits(text: str) -> dict:
+    """label -> first keyword of that category found in text."""
+    hits = {}
+    for kw in _SEMANTIC_KEYWORD_RE.findall(text):
+        hits.setdefault(_SEMANTIC_KEYWORD_LABEL[kw], kw)
+    return hits
+
+
 def classify_file_semantic(path: str) -> dict:
     """Classify a file by semantic meaning using filename, extension, and path heuristics.
     
@@ -1809,39 +2224,39 @@ def classify_file_semantic(path: str) -> dict:
     path_lower = path.lower()
 
     # Check for temp/transient indicators first
-    for indicator in TEMP_INDICATORS:
-        if indicator in name:
-            return {"label": "temporary", "confidence": 0.85, "reason": f"filename contains '{indicator}'"}
+    match = _TEMP_INDICATOR_RE.search(name)
+    if match:
+        return {"label": "temporary", "confidence": 0.85, "reason": f"filename contains '{match.group()}'"}
+
+    # One regex pass over the filename and one over the directories above it
+    # (keywords never contain "/", so nothing spans the boundary)
+    name_hits = _keyword_hits(name)
+    path_hits = _keyword_hits(path_lower[:len(path_lower) - len(name)])
+
+    # Only categories with a signal get scored: label -> [score, reason]
+    scores = {}
+    ext_label = _EXT_TO_LABEL.get(ext)
+    if ext_label is not None:
+        # Extension match (strong signal)
+        scores[ext_label] = [0.6, f"extension '{ext}' matches {ext_label}"]
+    # Keyword match in filename (stronger) or else anywhere in the path
+    for label, kw in path_hits.items():
+        if label not in name_hits:
+            entry = scores.setdefault(label, [0.0, ""])
+            entry[0] += 0.3
+            entry[1] = f"path contains '{kw}'"
+    for label, kw in name_hits.items():
+        entry = scores.setdefault(label, [0.0, ""])
+        entry[0] += 0.5
+        entry[1] = f"filename contains '{kw}'"
 
-    # Score each semantic category
     best_label = "other"
     best_score = 0.0
     best_reason = ""
-
-    for label, patterns in SEMANTIC_PATTERNS.items():
-        score = 0.0
-        reason = ""
-
-        # Extension match (strong signal)
-        if ext in patterns["extensions"]:
-            score += 0.6
-            reason = f"extension '{ext}' matches {label}"
-
-        # Keyword match in filename or path
-        for kw in patterns["keywords"]:
-            if kw in name:
-                score += 0.5
-                reason = f"filename contains '{kw}'"
-                break
-            elif kw in path_lower:
-                score += 0.3
-                reason = f"path contains '{kw}'"
-                break
-
-        if score > best_score:
-            best_score = score
-            best_label = label
-            best_reason = reason
+    if scores:
+        # Highest score; ties go to the category listed first in SEMANTIC_PATTERNS
+        best_label = min(scores, key=lambda label: (-scores[label][0], _SEMANTIC_ORDER[label]))
+        best_score, best_reason = scores[best_label]
 
     confidence = min(best_score, 0.95)
     if confidence < 0.2:
@@ -1892,6 +2307,120 @@ CLEANABLE_ARTIFACTS = {
 
 # Stale threshold in days
 STALE_THRESHOLD_DAYS = 90
+# Candidate folders are inspected on an I/O-sized pool once there are enough
+STALE_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+STALE_PARALLEL_MIN = 4
+
+
+def _inspect_project(tracker: ProgressTracker, now: float, fresh_cutoff: float,
+                     entry_path: str) -> dict | None:
+    """Return a stale-project record for entry_path, or None if it isn't one.
+
+    Runs on detect_stale_projects' worker threads; the tracker is locked.
+    now and fresh_cutoff (now minus the stale threshold) are taken once per
+    scan, so every candidate is judged against the same instant.
+    """
+    tracker.update(entry_path)
+
+    # Check for project markers. Where getattrlistbulk exists one call lists
+    # the children together with their times; otherwise scandir's entries
+    # are stat'ed lazily below.
+    listing = bulk_list_times(entry_path) if USE_BULK_ATTRS else None
+    if listing is None:
+        try:
+            children = _list_dir(entry_path)
+        except (PermissionError, OSError):
+            return None
+        names = {e.name for e in children}
+    else:
+        names = {name for name, _atime, _mtime in listing}
+
+    markers = [m for m in PROJECT_MARKERS if m in names]
+    if not markers:
+        return None
+    marker_set = set(markers)
+
+    def child_times():
+        """Newest of atime/mtime for each child, marker files first."""
+        if listing is not None:
+            listing.sort(key=lambda e: e[0] not in marker_set)
+            for _name, atime, mtime in listing:
+                yield max(atime, mtime)
+            return
+        children.sort(key=lambda e: e.name not in marker_set)
+        for child in children:
+            try:
+                st = child.stat(follow_symlinks=False)
+            except OSError:
+                continue
+            yield max(st.st_atime, st.st_mtime)
+
+    # Check staleness — use most recent access time of marker files.
+    # DirEntry.stat() works from the listing's entry (no path rebuild)
+    # and caches its result on the entry. Markers are checked first and
+    # the first fresh child ends the check, so active projects cost a
+    # stat or two; only stale ones need every child for last_accessed.
+    try:
+        most_recent = 0
+        for newest in child_times():
+            if newest > fresh_cutoff:
+                return None  # Project is active
+            most_recent = max(most_recent, newest)
+
+        if most_recent == 0:
+            return None
+
+        days_since = (now - most_recent) / 86400
+
+    except OSError:
+        return None
+
+    # Find cleanable artifact directories
+    cleanable_dirs = []
+    reclaimable = 0
+    for artifact_name, description in CLEANABLE_ARTIFACTS.items():
+        if artifact_name not in names:
+            continue  # absent from the listing taken above; no stat needed
+        artifact_path = os.path.join(entry_path, artifact_name)
+        try:
+            st = os.stat(artifact_path)
+        except OSError:
+            continue
+        if stat.S_ISDIR(st.st_mode):
+            try:
+                # Daemon re-scans reuse the size recorded for an unchanged artifact
+                marker, size = st.st_mtime, None
+                if _reuse_sizes:
+                    marker = change_marker(artifact_path, st)
+                    size = reusable_size(artifact_path, marker)
+                if size is None:
+                    size = get_dir_size_fast(artifact_path)
+                if size > 1024 * 1024:  # > 1 MB
+                    _observed_mtimes[artifact_path] = marker
+                    cleanable_dirs.append({
+                        "name": artifact_name,
+                        "description": description,
+                        "path": artifact_path,
+                        "bytes": size,
+                        "formatted": format_size(size),
+                    })
+                    reclaimable += size
+            except OSError:
+                pass
+
+    if not cleanable_dirs:
+        return None
+    tm = time.localtime(most_recent)
+    return {
+        "path": entry_path,
+        "name": os.path.basename(entry_path),
+        "last_accessed": f"{tm.tm_year:04d}-{tm.tm_mon:02d}-{tm.tm_mday:02d}",
+        "days_stale": round(days_since),
+        "reclaimable_bytes": reclaimable,
+        "reclaimable_formatted": format_size(reclaimable),
+        "cleanable_dirs": cleanable_dirs,
+        "markers": markers,
+    }
 
 
 def detect_stale_projects(tracker: ProgressTracker) -> list:
@@ -1902,8 +2431,7 @@ def detect_stale_projects(tracker: ProgressTracker) -> list:
        "cleanable_dirs": [{"name", "path", "bytes"}], "markers": [str]}
     """
     tracker.phase = "stale_detect"
-    projects = []
-    
+
     # Directories to search for dev projects
     search_roots = [
         HOME,
@@ -1918,110 +2446,54 @@ def detect_stale_projects(tracker: ProgressTracker) -> list:
         os.path.join(HOME, "src"),
     ]
 
-    seen = set()
-
-    for search_root in search_roots:
-        if not os.path.isdir(search_root):
-            continue
+    # Roots are scanned one level deep, so nested roots (HOME vs ~/Documents)
+    # still need their own pass; only aliases of the same directory are dropped.
+    roots = unique_dirs(search_roots)
 
+    seen = set()
+    candidates = []
+    for search_root in roots:
         try:
-            for entry in os.scandir(search_root):
-                if not entry.is_dir(follow_symlinks=False):
-                    continue
-
-                entry_path = entry.path
-                if entry_path in seen:
-                    continue
-                seen.add(entry_path)
-
-                tracker.update(entry_path)
-
-                # Check for project markers
-                try:
-                    children = {e.name for e in os.scandir(entry_path)}
-                except (PermissionError, OSError):
-                    continue
-
-                markers = [m for m in PROJECT_MARKERS if m in children]
-                if not markers:
-                    continue
-
-                # Check staleness — use most recent access time of marker files
-                try:
-                    most_recent = 0
-                    for child_name in children:
-                        child_path = os.path.join(entry_path, child_name)
-                        try:
-                            st = os.stat(child_path, follow_symlinks=False)
-                            most_recent = max(most_recent, st.st_atime, st.st_mtime)
-                        except OSError:
-                            pass
-
-                    if most_recent == 0:
+            with os.scandir(search_root) as it:
+                for entry in it:
+                    if not entry.is_dir(follow_symlinks=False):
                         continue
-
-                    days_since = (time.time() - most_recent) / 86400
-
-                    if days_since < STALE_THRESHOLD_DAYS:
-                        continue  # Project is active
-
-                except OSError:
-                    continue
-
-                # Find cleanable artifact directories
-                cleanable_dirs = []
-                reclaimable = 0
-                for artifact_name, description in CLEANABLE_ARTIFACTS.items():
-                    artifact_path = os.path.join(entry_path, artifact_name)
-                    if os.path.isdir(artifact_path):
-                        try:
-                            size = get_dir_size_fast(artifact_path)
-                            if size > 1024 * 1024:  # > 1 MB
-                                cleanable_dirs.append({
-                                    "name": artifact_name,
-                                    "description": description,
-                                    "path": artifact_path,
-                                    "bytes": size,
-                                    "formatted": format_size(size),
-                                })
-                                reclaimable += size
-                        except OSError:
-                            pass
-
-                if cleanable_dirs:
-                    last_accessed_dt = datetime.fromtimestamp(most_recent)
-                    projects.append({
-                        "path": entry_path,
-                        "name": os.path.basename(entry_path),
-                        "last_accessed": last_accessed_dt.strftime("%Y-%m-%d"),
-                        "days_stale": round(days_since),
-                        "reclaimable_bytes": reclaimable,
-                        "reclaimable_formatted": format_size(reclaimable),
-                        "cleanable_dirs": cleanable_dirs,
-                        "markers": markers,
-                    })
-
+                    if entry.path in seen:
+                        continue
+                    seen.add(entry.path)
+                    candidates.append(entry.path)
         except (PermissionError, OSError) as e:
             tracker.record_error(search_root, e)
 
+    now = time.time()
+    inspect = functools.partial(_inspect_project, tracker, now, now - STALE_THRESHOLD_DAYS * 86400)
+
+    # Each candidate is a handful of independent metadata calls; overlap them
+    # unless there are too few for a pool to pay off
+    if len(candidates) < STALE_PARALLEL_MIN:
+        results = [inspect(path) for path in candidates]
+    else:
+        with ThreadPoolExecutor(max_workers=STALE_WORKERS) as executor:
+            results = list(executor.map(inspect, candidates))
+    projects = [project for project in results if project is not None]
+
     # Sort by reclaimable space
-    projects.sort(key=lambda p: p["reclaimable_bytes"], reverse=True)
+    projects.sort(key=itemgetter("reclaimable_bytes"), reverse=True)
 
-    emit({
-        "event": "progress",
-        "phase": "stale_detect",
-        "dir": f"Found {len(projects)} stale projects",
-        "files": tracker.files_processed,
-        "bytes": tracker.bytes_scanned,
-        "rate_mbps": 0, "eta_seconds": -1,
-        "elapsed": round(time.monotonic() - tracker.start_time, 1),
-    })
+    tracker.announce(f"Found {len(projects)} stale projects")
 
     return projects
 
 
 # ─── Agent Intelligence: Smart Recommendations ──────────────────────────────
 
+def _short_id(text: str) -> str:
+    """8-hex-char id for a recommendation (stable per path, not security-relevant)."""
+    if xxhash is not None:
+        return xxhash.xxh3_64_hexdigest(os.fsencode(text))[:8]
+    return hashlib.md5(os.fsencode(text)).hexdigest()[:8]
+
+
 def build_recommendations(items: list, disk_map: dict, stale_projects: list, macos_insights: dict) -> list:
     """Generate ranked cleanup recommendations with confidence and impact.
     
@@ -2030,12 +2502,15 @@ def build_recommendations(items: list, disk_map: dict, stale_projects: list, mac
        "confidence", "risk", "items": [paths], "action_type"}
     """
     recs = []
+    # Quick wins, batches and the low-space warning all draw on safe items only
+    # Delete actions take paths, so virtual items (docker://...) never join them
+    safe_items = [item for item in items if item["risk"] == "safe" and not item.get("virtual")]
 
     # ── Quick Wins: Large single-item cleanups ──
-    for item in items:
-        if item["size"] > 500 * 1024 * 1024 and item["risk"] == "safe":  # > 500 MB safe items
+    for item in safe_items:
+        if item["size"] > 500 * 1024 * 1024:  # > 500 MB safe items
             recs.append({
-                "id": f"quick_{hashlib.md5(item['path'].encode()).hexdigest()[:8]}",
+                "id": f"quick_{_short_id(item['path'])}",
                 "title": f"Remove {item['name']}",
                 "description": f"{item.get('description', 'Large cache/junk item')} — {format_size(item['size'])}",
                 "category": "quick_wins",
@@ -2052,7 +2527,7 @@ def build_recommendations(items: list, disk_map: dict, stale_projects: list, mac
         if proj["reclaimable_bytes"] > 50 * 1024 * 1024:  # > 50 MB
             artifact_names = ", ".join(d["name"] for d in proj["cleanable_dirs"][:3])
             recs.append({
-                "id": f"stale_{hashlib.md5(proj['path'].encode()).hexdigest()[:8]}",
+                "id": f"stale_{_short_id(proj['path'])}",
                 "title": f"Clean stale project: {proj['name']}",
                 "description": f"Not accessed in {proj['days_stale']} days. "
                               f"Remove {artifact_names} to free {proj['reclaimable_formatted']}",
@@ -2089,7 +2564,7 @@ def build_recommendations(items: list, disk_map: dict, stale_projects: list, mac
         for xc in macos_insights.get("xcode", []):
             if xc["size"] > 100 * 1024 * 1024: # > 100MB
                 recs.append({
-                    "id": f"xcode_{hashlib.md5(xc['path'].encode()).hexdigest()[:8]}",
+                    "id": f"xcode_{_short_id(xc['path'])}",
                     "title": f"Clear Xcode DerivedData: {xc['name']}",
                     "description": f"Has not been built in {xc['days_stale']} days. Safe to delete.",
                     "category": "dev_cleanup",
@@ -2104,7 +2579,7 @@ def build_recommendations(items: list, disk_map: dict, stale_projects: list, mac
         # iOS Backups
         for backup in macos_insights.get("ios_backups", []):
             recs.append({
-                "id": f"ios_{hashlib.md5(backup['path'].encode()).hexdigest()[:8]}",
+                "id": f"ios_{_short_id(backup['path'])}",
                 "title": backup["name"],
                 "description": backup["description"],
                 "category": "ios_backup",
@@ -2136,7 +2611,7 @@ def build_recommendations(items: list, disk_map: dict, stale_projects: list, mac
         # Stale Downloads
         for dl in macos_insights.get("stale_downloads", []):
             recs.append({
-                "id": f"dl_{hashlib.md5(dl['path'].encode()).hexdigest()[:8]}",
+                "id": f"dl_{_short_id(dl['path'])}",
                 "title": f"Clean old download: {dl['name']}",
                 "description": dl["description"] + ". Safe to delete.",
                 "category": "quick_wins",
@@ -2151,7 +2626,7 @@ def build_recommendations(items: list, disk_map: dict, stale_projects: list, mac
         # Forgotten Installers
         for installer in macos_insights.get("forgotten_installers", []):
             recs.append({
-                "id": f"dmg_{hashlib.md5(installer['path'].encode()).hexdigest()[:8]}",
+                "id": f"dmg_{_short_id(installer['path'])}",
                 "title": f"Remove old installer: {installer['name']}",
                 "description": installer["description"] + ". Often safe to delete after installation.",
                 "category": "quick_wins",
@@ -2166,8 +2641,8 @@ def build_recommendations(items: list, disk_map: dict, stale_projects: list, mac
     # ── Category Aggregates ──
     # Group small items by category for batch recommendations
     cat_groups = defaultdict(list)
-    for item in items:
-        if item["size"] < 500 * 1024 * 1024 and item["risk"] == "safe":
+    for item in safe_items:
+        if item["size"] < 500 * 1024 * 1024:
             cat_groups[item.get("category", "other")].append(item)
 
     category_labels = {
@@ -2202,8 +2677,8 @@ def build_recommendations(items: list, disk_map: dict, stale_projects: list, mac
     free_pct = (disk_free / disk_total * 100) if disk_total > 0 else 100
 
     if free_pct < 10:
-        total_cleanable = sum(i["size"] for i in items if i["risk"] == "safe")
-        recs.insert(0, {
+        total_cleanable = sum(i["size"] for i in safe_items)
+        recs.append({
             "id": "urgent_space",
             "title": "⚠️ Disk space critically low",
             "description": f"Only {format_size(disk_free)} free ({round(free_pct, 1)}%). "
@@ -2213,7 +2688,7 @@ def build_recommendations(items: list, disk_map: dict, stale_projects: list, mac
             "impact_formatted": format_size(total_cleanable),
             "confidence": 1.0,
             "risk": "safe",
-            "items": [i["path"] for i in items if i["risk"] == "safe"],
+            "items": [i["path"] for i in safe_items],
             "action_type": "delete",
         })
 
@@ -2233,8 +2708,10 @@ def get_storage_timeline(conn) -> list:
       {"scan_time": str, "total_bytes": int, "total_formatted": str}
     """
     try:
+        # Newest rows first off the rowid, bounded by what save_scan_to_cache keeps
         rows = conn.execute(
-            "SELECT scan_time, total_bytes FROM scan_results ORDER BY id ASC"
+            "SELECT scan_time, total_bytes FROM scan_results ORDER BY id DESC LIMIT ?",
+            (SCAN_RESULTS_KEPT,)
         ).fetchall()
         return [
             {
@@ -2242,7 +2719,7 @@ def get_storage_timeline(conn) -> list:
                 "total_bytes": row[1],
                 "total_formatted": format_size(row[1]),
             }
-            for row in rows
+            for row in reversed(rows)
         ]
     except Exception:
         return []
@@ -2256,20 +2733,24 @@ def predict_space_exhaustion(timeline: list, disk_free: int) -> dict | None:
     if len(timeline) < 2:
         return None
 
-    # Calculate growth rate from first and last scans
+    # Growth rate is the least-squares slope over every scan, so one noisy
+    # first or last point doesn't set the trend on its own
     try:
-        first_time = datetime.fromisoformat(timeline[0]["scan_time"])
-        last_time = datetime.fromisoformat(timeline[-1]["scan_time"])
-        days_span = max((last_time - first_time).total_seconds() / 86400, 0.01)
+        times = [datetime.fromisoformat(point["scan_time"]) for point in timeline]
+        days = [(t - times[0]).total_seconds() / 86400 for t in times]
+        days_span = max(days[-1], 0.01)
+        if days_span < 0.1:
+            return None
 
-        first_bytes = timeline[0]["total_bytes"]
-        last_bytes = timeline[-1]["total_bytes"]
-        growth = last_bytes - first_bytes
+        sizes = [point["total_bytes"] for point in timeline]
+        mean_day = sum(days) / len(days)
+        mean_size = sum(sizes) / len(sizes)
+        spread = sum((d - mean_day) ** 2 for d in days)
+        rate_per_day = sum((d - mean_day) * (b - mean_size) for d, b in zip(days, sizes)) / spread
 
-        if growth <= 0 or days_span < 0.1:
+        if rate_per_day <= 0:
             return None
 
-        rate_per_day = growth / days_span
         days_until_full = disk_free / rate_per_day if rate_per_day > 0 else -1
 
         return {
@@ -2285,14 +2766,20 @@ def predict_space_exhaustion(timeline: list, disk_free: int) -> dict | None:
 
 # ─── SQLite Cache + Checkpointing ────────────────────────────────────────────
 
+# Historical scans kept in scan_results (and so the storage timeline's length)
+SCAN_RESULTS_KEPT = 10
+
+
 def get_cache_db_path() -> str:
-    os.makedirs(APP_SUPPORT, exist_ok=True)
+    ensure_cache_dir(APP_SUPPORT)
     return os.path.join(APP_SUPPORT, "scan_cache.db")
 
 
 def init_cache_db(db_path: str):
     conn = sqlite3.connect(db_path)
     conn.executescript("""
+        PRAGMA journal_mode=WAL;
+        PRAGMA synchronous=NORMAL;
         CREATE TABLE IF NOT EXISTS scan_results (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             scan_time TEXT NOT NULL,
@@ -2332,31 +2819,80 @@ def check_path_unchanged(conn, path: str) -> bool:
     return row is not None and abs(row[0] - cur_mtime) < 0.01
 
 
-def mark_path_scanned(conn, path: str, size_bytes: int):
-    """Mark a path as scanned in the checkpoint table."""
-    try:
-        mtime = os.path.getmtime(path)
-    except OSError:
-        mtime = 0
-    conn.execute(
-        "INSERT OR REPLACE INTO scan_state (path, crawl_status, last_mtime, size_bytes, last_scan_ts) VALUES (?, 'scanned', ?, ?, ?)",
-        (path, mtime, size_bytes, datetime.now().isoformat())
+def mark_paths_scanned(conn, items: list, mtimes: dict | None = None, scan_time: str | None = None,
+                       reused: set | None = None):
+    """Mark item paths as scanned in the checkpoint table (one executemany).
+
+    mtimes maps paths to the change_marker taken when they were sized; only
+    paths missing from it are stat'ed again. Paths in reused had their size
+    taken from scan_state rather than walked: their rows are left as they
+    are, so reused sizes still age out after SIZE_REUSE_MAX_AGE, while every
+    walked path gets a fresh last_scan_ts. Virtual items (docker://...)
+    have no file behind them and are skipped. scan_time (ISO format)
+    defaults to now.
+    """
+    now = scan_time or datetime.now().isoformat()
+    if mtimes is None:
+        mtimes = {}
+    if reused is None:
+        reused = set()
+
+    def rows():
+        for item in items:
+            if item.get("virtual"):
+                continue  # no file behind it to stat or re-size later
+            if item["path"] in reused:
+                continue  # the row already holds this mtime and size
+            mtime = mtimes.get(item["path"])
+            if mtime is None:
+                try:
+                    mtime = os.path.getmtime(item["path"])
+                except OSError:
+                    mtime = 0
+            yield item["path"], mtime, item["size"], now
+
+    conn.executemany(
+        """INSERT INTO scan_state (path, crawl_status, last_mtime, size_bytes, last_scan_ts)
+           VALUES (?, 'scanned', ?, ?, ?)
+           ON CONFLICT(path) DO UPDATE SET
+               crawl_status = 'scanned',
+               last_mtime = excluded.last_mtime,
+               size_bytes = excluded.size_bytes,
+               last_scan_ts = excluded.last_scan_ts""",
+        rows(),
+    )
+
+
+def load_reusable_sizes(conn, max_age: int = SIZE_REUSE_MAX_AGE) -> dict:
+    """path -> (last_mtime, size_bytes) for rows walked within max_age seconds."""
+    cutoff = (datetime.now() - timedelta(seconds=max_age)).isoformat()
+    rows = conn.execute(
+        "SELECT path, last_mtime, size_bytes FROM scan_state WHERE crawl_status = 'scanned' AND last_scan_ts >= ?",
+        (cutoff,)
     )
+    return {path: (mtime, size) for path, mtime, size in rows}
 
 
-def save_scan_to_cache(conn, items, tree, metrics, total_bytes, duration, signature=None):
+def save_scan_to_cache(conn, items, tree, metrics, total_bytes, duration, signature=None,
+                       scan_time=None):
+    """Store a scan result row, record last_run and prune old rows.
+
+    Nothing is committed here: run_scan commits once after mark_paths_scanned,
+    so the result row, the prune and the scan_state upserts share one
+    transaction (one WAL fsync).
+    """
+    now = scan_time or datetime.now().isoformat()
     conn.execute(
         "INSERT INTO scan_results (scan_time, items_json, tree_json, metrics_json, total_bytes, duration_seconds, signature) VALUES (?, ?, ?, ?, ?, ?, ?)",
-        (datetime.now().isoformat(), json.dumps(items), json.dumps(tree),
-         json.dumps(metrics), total_bytes, duration, signature)
+        (now, _dumps(items), _dumps(tree),
+         _dumps(metrics), total_bytes, duration, signature)
     )
     conn.execute(
         "INSERT OR REPLACE INTO scan_meta (key, value) VALUES ('last_run', ?)",
-        (datetime.now().isoformat(),)
+        (now,)
     )
-    conn.commit()
-    conn.execute("DELETE FROM scan_results WHERE id NOT IN (SELECT id FROM scan_results ORDER BY id DESC LIMIT 10)")
-    conn.commit()
+    conn.execute("DELETE FROM scan_results WHERE id NOT IN (SELECT id FROM scan_results ORDER BY id DESC LIMIT ?)",
+                 (SCAN_RESULTS_KEPT,))
 
 
 def get_last_scan(conn) -> dict | None:
@@ -2367,9 +2903,9 @@ def get_last_scan(conn) -> dict | None:
     if not row:
         return None
     return {
-        "items": json.loads(row[0]),
-        "tree": json.loads(row[1]),
-        "metrics": json.loads(row[2]) if row[2] else None,
+        "items": _loads(row[0]),
+        "tree": _loads(row[1]),
+        "metrics": _loads(row[2]) if row[2] else None,
         "total_bytes": row[3],
         "duration": row[4],
         "signature": row[5],
@@ -2385,29 +2921,35 @@ def get_keys_dir() -> str:
     return keys_dir
 
 
-def sign_scan_results(items: list) -> dict:
-    """Sign scan results with a locally generated Ed25519 keypair.
-    
-    Uses HMAC-SHA256 as a portable fallback when cryptography lib isn't available.
-    The signature creates a verifiable attestation that results haven't been tampered with.
-    """
-    # Create deterministic content hash from sorted items
-    content = json.dumps(
-        sorted([{"path": i["path"], "size": i["size"]} for i in items],
-               key=lambda x: x["path"]),
-        sort_keys=True
-    ).encode("utf-8")
-    content_hash = hashlib.sha256(content).hexdigest()
+def _attestation_chunks(items: list):
+    """Yield the attested content piece by piece, as bytes.
 
+    The pieces concatenate to json.dumps([{"path", "size"}, ...] sorted by
+    path, sort_keys=True), so the content hash is unchanged, but the whole
+    document is never held in memory at once.
+    """
+    yield b"["
+    sep = b""
+    for item in sorted(items, key=itemgetter("path")):
+        yield b'%s{"path": %s, "size": %d}' % (
+            sep, _encode_json_ascii(item["path"]).encode("ascii"), item["size"])
+        sep = b", "
+    yield b"]"
+
+
+@functools.lru_cache(maxsize=None)
+def _signing_key() -> tuple:
+    """(algorithm, sign(bytes) -> str, key_id) for this install, loaded once.
+
+    Prefers a locally generated Ed25519 keypair, creating it on first use;
+    falls back to HMAC-SHA256 with a stored secret when cryptography isn't
+    installed. Parsing the PEM and deriving key_id happen once per process,
+    so the daemon's hourly attestations only pay for the signature itself.
+    """
     keys_dir = get_keys_dir()
-    key_path = os.path.join(keys_dir, "scan_signing.key")
-
-    # Try Ed25519 via cryptography library
-    try:
-        from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
-        from cryptography.hazmat.primitives import serialization
-        import base64
 
+    if Ed25519PrivateKey is not None:
+        key_path = os.path.join(keys_dir, "scan_signing.key")
         if os.path.exists(key_path):
             with open(key_path, "rb") as f:
                 private_key = serialization.load_pem_private_key(f.read(), password=None)
@@ -2424,29 +2966,23 @@ def sign_scan_results(items: list) -> dict:
             # Save public key too
             pub_pem = private_key.public_key().public_bytes(
                 serialization.Encoding.PEM,
-                serialization.SubjectPublicKeyInfo
+                serialization.PublicFormat.SubjectPublicKeyInfo
             )
             with open(os.path.join(keys_dir, "scan_signing.pub"), "wb") as f:
                 f.write(pub_pem)
 
-        signature = base64.b64encode(private_key.sign(content)).decode("ascii")
-        return {
-            "algorithm": "Ed25519",
-            "content_hash": content_hash,
-            "signature": signature,
-            "timestamp": datetime.now().isoformat(),
-            "key_id": hashlib.sha256(
-                private_key.public_key().public_bytes(
-                    serialization.Encoding.Raw,
-                    serialization.PublicFormat.Raw
-                )
-            ).hexdigest()[:16],
-        }
-    except ImportError:
-        pass
+        key_id = hashlib.sha256(
+            private_key.public_key().public_bytes(
+                serialization.Encoding.Raw,
+                serialization.PublicFormat.Raw
+            )
+        ).hexdigest()[:16]
+
+        def sign(content: bytes) -> str:
+            return base64.b64encode(private_key.sign(content)).decode("ascii")
+        return "Ed25519", sign, key_id
 
     # Fallback: HMAC-SHA256 with a locally stored secret
-    import hmac
     secret_path = os.path.join(keys_dir, "hmac_secret.key")
     if os.path.exists(secret_path):
         with open(secret_path, "rb") as f:
@@ -2457,13 +2993,31 @@ def sign_scan_results(items: list) -> dict:
             f.write(secret)
         os.chmod(secret_path, 0o600)
 
-    sig = hmac.new(secret, content, hashlib.sha256).hexdigest()
+    def sign(content: bytes) -> str:
+        return hmac.new(secret, content, hashlib.sha256).hexdigest()
+    return "HMAC-SHA256", sign, hashlib.sha256(secret).hexdigest()[:16]
+
+
+def sign_scan_results(items: list) -> dict:
+    """Sign scan results with a locally generated Ed25519 keypair.
+    
+    Uses HMAC-SHA256 as a portable fallback when cryptography lib isn't available.
+    The signature creates a verifiable attestation that results haven't been tampered with.
+    Both sign the 32-byte SHA-256 digest of the content, which is streamed
+    into the hash rather than serialized up front.
+    """
+    # Create deterministic content hash from sorted items
+    digest = hashlib.sha256()
+    for chunk in _attestation_chunks(items):
+        digest.update(chunk)
+
+    algorithm, sign, key_id = _signing_key()
     return {
-        "algorithm": "HMAC-SHA256",
-        "content_hash": content_hash,
-        "signature": sig,
+        "algorithm": algorithm,
+        "content_hash": digest.hexdigest(),
+        "signature": sign(digest.digest()),
         "timestamp": datetime.now().isoformat(),
-        "key_id": hashlib.sha256(secret).hexdigest()[:16],
+        "key_id": key_id,
     }
 
 
@@ -2471,14 +3025,22 @@ def sign_scan_results(items: list) -> dict:
 
 def build_metrics(items: list, duration: float, tracker: ProgressTracker) -> dict:
     """Build the formalized metrics object for the D3 visualization data contract."""
-    total_bytes = sum(i["size"] for i in items)
-
-    # Category breakdown
+    # Category, extension and risk breakdowns in one pass over the items
+    total_bytes = 0
     cats = defaultdict(lambda: {"bytes": 0, "count": 0})
+    extensions = defaultdict(int)
+    risk = {"safe": 0, "caution": 0, "critical": 0}
+    splitext = os.path.splitext
     for item in items:
-        cat = item.get("category", "other")
-        cats[cat]["bytes"] += item["size"]
-        cats[cat]["count"] += 1
+        size = item["size"]
+        total_bytes += size
+        cat = cats[item.get("category", "other")]
+        cat["bytes"] += size
+        cat["count"] += 1
+        if not item.get("virtual"):
+            extensions[splitext(item["path"])[1].lower() or "(dir)"] += 1
+        r = item.get("risk", "caution")
+        risk[r] = risk.get(r, 0) + 1
 
     category_labels = {
         "browser_cache": "Browser Caches",
@@ -2499,19 +3061,7 @@ def build_metrics(items: list, duration: float, tracker: ProgressTracker) -> dic
             "count": data["count"],
             "pct": round(pct, 1),
         })
-    categories.sort(key=lambda x: x["bytes"], reverse=True)
-
-    # Extension breakdown
-    extensions = defaultdict(int)
-    for item in items:
-        ext = os.path.splitext(item["path"])[1].lower() or "(dir)"
-        extensions[ext] += 1
-
-    # Risk breakdown
-    risk = {"safe": 0, "caution": 0, "critical": 0}
-    for item in items:
-        r = item.get("risk", "caution")
-        risk[r] = risk.get(r, 0) + 1
+    categories.sort(key=itemgetter("bytes"), reverse=True)
 
     return {
         "total_bytes": total_bytes,
@@ -2529,8 +3079,29 @@ def build_metrics(items: list, duration: float, tracker: ProgressTracker) -> dic
 
 # ─── Main Scanner ────────────────────────────────────────────────────────────
 
-def run_scan():
-    """Run one full discovery + analysis pass."""
+def run_scanners_concurrently(tracker: ProgressTracker, scanners: tuple) -> list:
+    """Run independent category scanners side by side.
+
+    Each scanner works on its own roots, so wall time drops to roughly the
+    slowest one.  emit() only queues and the tracker is lock-protected; items are
+    returned in scanner order regardless of which finishes first.
+    """
+    with ThreadPoolExecutor(max_workers=len(scanners)) as executor:
+        futures = [executor.submit(scanner, tracker) for scanner in scanners]
+        return [item for future in futures for item in future.result()]
+
+
+def run_scan(prefetch: bool = True, reuse_sizes: bool = False):
+    """Run one full discovery + analysis pass.
+
+    reuse_sizes: let cache roots and stale-project artifacts whose
+    change_marker is unchanged since a recent scan report their recorded
+    size instead of being walked (daemon re-scans, `scan --warm`).  The
+    marker covers a root and its direct children only; deeper churn is why
+    one-shot scans stay cold by default and reused sizes still expire after
+    SIZE_REUSE_MAX_AGE.
+    """
+    global _reuse_sizes, _reusable_sizes, _observed_mtimes, _reused_paths
     start_time = time.monotonic()
     tracker = ProgressTracker()
     all_items = []
@@ -2542,13 +3113,19 @@ def run_scan():
     except Exception:
         conn = None
 
-    emit({
-        "event": "progress",
-        "phase": "fast",
-        "dir": "Initializing scan...",
-        "files": 0, "bytes": 0, "rate_mbps": 0,
-        "eta_seconds": -1, "elapsed": 0,
-    })
+    reset_dir_size_cache()
+    prefetch_system_commands()
+    _reusable_sizes = {}
+    _observed_mtimes = {}
+    _reused_paths = set()
+    _reuse_sizes = bool(conn and reuse_sizes)
+    if _reuse_sizes:
+        try:
+            _reusable_sizes = load_reusable_sizes(conn)
+        except sqlite3.Error:
+            pass
+
+    tracker.announce("Initializing scan...")
 
     # ── FDA Status Probe ──────────────────────────────────────────────────────
     # Emit an fda_status event so the frontend knows our actual read access
@@ -2583,28 +3160,18 @@ def run_scan():
 
 
     tracker.phase = "fast"
-    all_items.extend(scan_browser_caches(tracker))
-    all_items.extend(scan_app_caches(tracker))
-    all_items.extend(scan_system_logs(tracker))
-    all_items.extend(scan_mail_and_backups(tracker))
+    all_items.extend(run_scanners_concurrently(tracker, (
+        scan_browser_caches, scan_app_caches, scan_system_logs, scan_mail_and_backups,
+    )))
 
     # ── Pass 2: Deep Scan — broader coverage ──
     tracker.phase = "deep"
-    emit({
-        "event": "progress",
-        "phase": "deep",
-        "dir": "Starting deep scan...",
-        "files": tracker.files_processed,
-        "bytes": tracker.bytes_scanned,
-        "rate_mbps": 0, "eta_seconds": -1,
-        "elapsed": round(time.monotonic() - start_time, 1),
-    })
+    tracker.announce("Starting deep scan...")
 
-    all_items.extend(scan_dev_caches(tracker))
-    all_items.extend(scan_general_caches(tracker))
+    all_items.extend(run_scanners_concurrently(tracker, (scan_dev_caches, scan_general_caches)))
 
     # ── Pass 3: Full Disk Map — complete picture ──
-    disk_map = scan_full_disk(tracker)
+    disk_map = scan_full_disk(tracker, prefetch=prefetch)
 
     # ── Pass 4: Agent Intelligence ──
     stale_projects = detect_stale_projects(tracker)
@@ -2616,13 +3183,13 @@ def run_scan():
 
     # ── Build completion payload ──
     duration = round(time.monotonic() - start_time, 2)
-    total_bytes = sum(item["size"] for item in all_items)
     tree = build_tree(all_items)
     full_tree = build_full_disk_tree(disk_map, all_items)
-    all_items.sort(key=lambda x: x["size"], reverse=True)
+    all_items.sort(key=itemgetter("size"), reverse=True)
 
     # Build D3 metrics contract
     metrics = build_metrics(all_items, duration, tracker)
+    total_bytes = metrics["total_bytes"]  # summed in build_metrics' single pass
     metrics["disk_total"] = disk_map["disk_total"]
     metrics["disk_used"] = disk_map["disk_used"]
     metrics["disk_free"] = disk_map["disk_free"]
@@ -2651,10 +3218,13 @@ def run_scan():
     # Save to checkpoint DB
     if conn:
         try:
+            # One timestamp for the result row, last_run and every scan_state row
+            now_iso = datetime.now().isoformat()
             save_scan_to_cache(conn, all_items, tree, metrics, total_bytes, duration,
-                             attestation.get("signature") if attestation else None)
-            for item in all_items:
-                mark_path_scanned(conn, item["path"], item["size"])
+                             attestation.get("signature") if attestation else None, now_iso)
+            artifacts = [{"path": d["path"], "size": d["bytes"]}
+                         for project in stale_projects for d in project["cleanable_dirs"]]
+            mark_paths_scanned(conn, all_items + artifacts, _observed_mtimes, now_iso, _reused_paths)
             conn.commit()
             conn.close()
         except Exception:
@@ -2682,7 +3252,7 @@ def run_scan():
         "disk_total": disk_map["disk_total"],
         "disk_used": disk_map["disk_used"],
         "disk_free": disk_map["disk_free"],
-        "items": all_items,
+        # No "items": every one was already streamed in a batch event
         "duration": duration,
         "metrics": metrics,
         "attestation": attestation,
@@ -2727,7 +3297,7 @@ def run_status():
         emit({"event": "error", "message": "No cached scan results found. Run 'scan' first."})
 
 
-def run_daemon():
+def run_daemon(prefetch: bool = True):
     """Long-running watcher that re-scans on filesystem changes.
     
     This is a user-space process only — no LaunchAgents or system services.
@@ -2736,24 +3306,20 @@ def run_daemon():
     import signal
 
     scan_interval = 3600  # Re-scan every hour
-    running = True
+    stop_event = Event()
 
     def handle_signal(sig, frame):
-        nonlocal running
-        running = False
+        stop_event.set()
 
     signal.signal(signal.SIGINT, handle_signal)
     signal.signal(signal.SIGTERM, handle_signal)
 
     emit({"event": "daemon_started", "interval_seconds": scan_interval})
 
-    while running:
-        run_scan()
-        # Sleep in small increments so we can respond to signals
-        for _ in range(scan_interval):
-            if not running:
-                break
-            time.sleep(1)
+    while not stop_event.is_set():
+        run_scan(prefetch=prefetch, reuse_sizes=True)
+        # One timed wait; the signal handler sets the event and ends it early
+        stop_event.wait(scan_interval)
 
     emit({"event": "daemon_stopped"})
 
@@ -2776,15 +3342,23 @@ subcommands:
         choices=["scan", "daemon", "status"],
         help="Subcommand to run (default: scan)"
     )
+    parser.add_argument(
+        "--no-async", dest="prefetch", action="store_false",
+        help="Walk the disk map serially instead of prefetching sibling directory listings"
+    )
+    parser.add_argument(
+        "--warm", action="store_true",
+        help="Reuse recorded sizes of cache roots unchanged since a recent scan instead of walking them"
+    )
 
     args = parser.parse_args()
 
     if args.command == "scan":
-        run_scan()
+        run_scan(prefetch=args.prefetch, reuse_sizes=args.warm)
     elif args.command == "status":
         run_status()
     elif args.command == "daemon":
-        run_daemon()
+        run_daemon(prefetch=args.prefetch)
 
 
 if __name__ == "__main__":
@@ -11,14 +11,21 @@ and deeply analyze files without blocking the main event loop.
 """
 import argparse
 import json
-import math
 import os
 import shutil
+import stat
 import sys
 import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from threading import Lock
-from datetime import datetime
+from dataclasses import dataclass
+from threading import Event, RLock, Timer
+
+from fs_utils import bulk_size_and_atime, format_size, format_timestamp, physical_size
+
+try:
+    import orjson  # C encoder; optional
+except ImportError:
+    orjson = None
 
 # ─── Configuration ───────────────────────────────────────────────────────────
 HOME = os.path.expanduser("~")
@@ -26,6 +33,13 @@ LIBRARY = os.path.join(HOME, "Library")
 EMIT_INTERVAL = 0.2
 MIN_ITEM_SIZE = 1024
 DISK_WARN_THRESHOLD = 1 * 1024 * 1024 * 1024
+# Walk a large analyzer target's top-level subtrees on a shared pool. Off by
+# default on macOS, where APFS serializes concurrent readdir on one volume;
+# MAC_OPTIMIZER_PARALLEL_WALK=1/0 overrides (same switch as storage_scanner)
+PARALLEL_WALK = os.environ.get("MAC_OPTIMIZER_PARALLEL_WALK",
+                               "0" if sys.platform == "darwin" else "1") != "0"
+PARALLEL_WALK_MIN_SUBDIRS = 8  # below this the subtrees are walked inline
+_walk_pool = ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1))
 
 # Resolve the absolute real path of THIS script's parent directory.
 # We use this to prevent the scanner from ever walking into its own node_modules,
@@ -38,13 +52,22 @@ ALWAYS_SKIP_DIRS = {
     ".git",  # handled separately
     ".hg", ".svn",  # version control
     "node_modules",  # handled separately
-    "__pycache__", "*.egg-info",
+    "__pycache__",
 }
+ALWAYS_SKIP_SUFFIXES = (".egg-info",)  # skipped by name suffix, e.g. foo.egg-info
 
-_emit_lock = Lock()
+# Held across each flush and the write after it, so the status timer's lines
+# can't interleave with other output or land after "complete"
+_emit_lock = RLock()
+_pipe_closed = Event()  # set when the status timer hits a closed pipe
 _item_buffer = []
 _last_item_flush = 0.0
 _ITEM_FLUSH_INTERVAL = 0.15
+# agent_status events are batched too; a timer makes sure a lone status
+# still goes out within _ITEM_FLUSH_INTERVAL while the agents are busy
+_status_buffer = []
+_status_timer = None
+_STATUS_BATCH_MAX = 32
 
 # Categories for simple heuristics
 EXTENSION_CATEGORIES = {
@@ -52,23 +75,54 @@ EXTENSION_CATEGORIES = {
     "logs": {".log", ".out", ".err"},
 }
 
-def format_size(size_bytes: int) -> str:
-    if size_bytes == 0:
-        return "0 B"
-    units = ("B", "KB", "MB", "GB", "TB")
-    i = int(math.floor(math.log(size_bytes, 1024))) if size_bytes > 0 else 0
-    i = min(i, len(units) - 1)
-    p = math.pow(1024, i)
-    s = round(size_bytes / p, 2)
-    return f"{s} {units[i]}"
-
 def get_last_accessed(path: str) -> str:
     try:
-        st = os.stat(path)
-        return datetime.fromtimestamp(st.st_atime).strftime("%Y-%m-%d %H:%M:%S")
-    except (OSError, ValueError):
+        return format_timestamp(os.stat(path).st_atime)
+    except OSError:
         return "Unknown"
 
+@dataclass(slots=True)
+class SwarmItem:
+    """One finding, kept slotted (not a dict) until its batch is written."""
+    path: str
+    size: int
+    risk: str
+    category: str
+    name: str
+    description: str
+    last_accessed: str = ""  # looked up from the path when not supplied
+    traits: dict | None = None
+
+    def to_dict(self) -> dict:
+        """The item event, with its camelCase aliases filled in."""
+        fmt = format_size(self.size)
+        la = self.last_accessed or get_last_accessed(self.path)
+        event = {"event": "item", "path": self.path, "size": self.size, "sizeBytes": self.size,
+                 "size_formatted": fmt, "sizeFormatted": fmt,
+                 "last_accessed": la, "lastUsed": la,
+                 "risk": self.risk, "category": self.category, "name": self.name,
+                 "description": self.description}
+        if self.traits is not None:
+            event["traits"] = self.traits
+        return event
+
+def _write_line(event_dict: dict):
+    """Write one NDJSON line straight to the stdout buffer (orjson when available).
+
+    Paths that aren't valid UTF-8 arrive as surrogate-escaped str, which
+    orjson refuses; those events go through json, which writes the escapes.
+    """
+    line = None
+    if orjson is not None:
+        try:
+            line = orjson.dumps(event_dict, option=orjson.OPT_APPEND_NEWLINE)
+        except orjson.JSONEncodeError:
+            pass
+    if line is None:
+        line = (json.dumps(event_dict, separators=(",", ":")) + "\n").encode()  # same shape as orjson
+    sys.stdout.buffer.write(line)
+    sys.stdout.buffer.flush()
+
 def _flush_item_buffer(force: bool = False):
     global _item_buffer, _last_item_flush
     now = time.monotonic()
@@ -76,44 +130,69 @@ def _flush_item_buffer(force: bool = False):
         return
     if not force and (now - _last_item_flush) < _ITEM_FLUSH_INTERVAL:
         return
+    try:
+        with _emit_lock:
+            if not _item_buffer:
+                return
+            batch = _item_buffer[:]
+            _item_buffer = []
+            _last_item_flush = now
+            _write_line({"event": "batch", "items": [item.to_dict() for item in batch]})
+    except BrokenPipeError:
+        sys.exit(0)
+
+def _flush_status_buffer():
+    """Write buffered agent_status events as one line; BrokenPipeError propagates."""
+    global _status_buffer, _status_timer
     with _emit_lock:
-        if not _item_buffer:
+        if _status_timer is not None:
+            _status_timer.cancel()
+            _status_timer = None
+        if not _status_buffer:
             return
-        batch = _item_buffer[:]
-        _item_buffer = []
-        _last_item_flush = now
+        batch = _status_buffer
+        _status_buffer = []
+        _write_line({"event": "batch_status", "statuses": batch})
+
+def _status_timer_fired():
+    # sys.exit here would only end the timer thread; the next emit exits instead
     try:
-        sys.stdout.write(json.dumps({"event": "batch", "items": batch}) + "\n")
-        sys.stdout.flush()
+        _flush_status_buffer()
     except BrokenPipeError:
+        _pipe_closed.set()
+
+def emit_item(item: SwarmItem):
+    """Queue an item for the next batch line (serialized only when written)."""
+    if _pipe_closed.is_set():
         sys.exit(0)
+    with _emit_lock:
+        _item_buffer.append(item)
+    _flush_item_buffer()
 
 def emit(event_dict: dict):
-    global _item_buffer, _last_item_flush
+    global _status_timer
+    if _pipe_closed.is_set():
+        sys.exit(0)
     try:
         evt = event_dict.get("event")
-        if evt == "item":
-            if "size" in event_dict and "sizeBytes" not in event_dict:
-                event_dict["sizeBytes"] = event_dict["size"]
-            if "size_formatted" in event_dict and "sizeFormatted" not in event_dict:
-                event_dict["sizeFormatted"] = event_dict["size_formatted"]
-            if "last_accessed" in event_dict and "lastUsed" not in event_dict:
-                event_dict["lastUsed"] = event_dict["last_accessed"]
+        if evt == "agent_status":
+            # UI Swarm panel events go out as one batch_status line
             with _emit_lock:
-                _item_buffer.append(event_dict)
-            _flush_item_buffer()
+                _status_buffer.append(event_dict)
+                full = len(_status_buffer) >= _STATUS_BATCH_MAX
+                if not full and _status_timer is None:
+                    _status_timer = Timer(_ITEM_FLUSH_INTERVAL, _status_timer_fired)
+                    _status_timer.daemon = True
+                    _status_timer.start()
+            if full:
+                _flush_status_buffer()
             return
 
-        if evt == "agent_status":
-            # Real-time event for UI Swarm panel
+        # Pending items and statuses go first, and "complete" cancels the timer
+        with _emit_lock:
             _flush_item_buffer(force=True)
-            sys.stdout.write(json.dumps(event_dict) + "\n")
-            sys.stdout.flush()
-            return
-
-        _flush_item_buffer(force=True)
-        sys.stdout.write(json.dumps(event_dict) + "\n")
-        sys.stdout.flush()
+            _flush_status_buffer()
+            _write_line(event_dict)
     except BrokenPipeError:
         sys.exit(0)
 
@@ -147,6 +226,75 @@ class ProgressTracker:
             })
             self.last_emit_time = now
 
+# ─── Tree sizing ─────────────────────────────────────────────────────────────
+
+def _tree_size_and_atime(path):
+    """(allocated bytes, oldest file atime or None) for everything under path.
+
+    One getattrlistbulk(2) walk gives both on macOS; elsewhere a scandir
+    stack with one lstat per file. Symlinks are never followed or counted.
+    """
+    bulk = bulk_size_and_atime(path)
+    if bulk is not None:
+        return bulk
+    size = 0
+    oldest = None
+    stack = [path]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):  # d_type, no syscall
+                            stack.append(entry.path)
+                            continue
+                        st = entry.stat(follow_symlinks=False)  # the one lstat
+                    except OSError:
+                        continue
+                    if stat.S_ISREG(st.st_mode):  # symlinks and specials skipped
+                        size += physical_size(st)
+                        if oldest is None or st.st_atime < oldest:
+                            oldest = st.st_atime
+        except OSError:
+            pass
+    return size, oldest
+
+
+def _fan_out_size_and_atime(path):
+    """_tree_size_and_atime with path's top-level subtrees walked concurrently.
+
+    The root is listed once; its files are counted here and its subtrees go
+    to _walk_pool when there are at least PARALLEL_WALK_MIN_SUBDIRS of them.
+    Walk tasks never submit further work, so analyzers sharing the pool
+    can't deadlock it.
+    """
+    size = 0
+    times = []
+    subdirs = []
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                        continue
+                    st = entry.stat(follow_symlinks=False)
+                except OSError:
+                    continue
+                if stat.S_ISREG(st.st_mode):
+                    size += physical_size(st)
+                    times.append(st.st_atime)
+    except OSError:
+        return 0, None
+    walk = map if len(subdirs) < PARALLEL_WALK_MIN_SUBDIRS else _walk_pool.map
+    for sub_size, sub_oldest in walk(_tree_size_and_atime, subdirs):
+        size += sub_size
+        if sub_oldest is not None:
+            times.append(sub_oldest)
+    return size, min(times, default=None)
+
+
 # ─── SWARM AGENTS ────────────────────────────────────────────────────────────
 
 def agent_worker_explorer(target_dir, agent_id="Explorer-1"):
@@ -163,54 +311,60 @@ def agent_worker_explorer(target_dir, agent_id="Explorer-1"):
     files_added = 0
 
     try:
-        for root, dirs, files in os.walk(target_dir, followlinks=False):
-            # ── Safety: never scan this project's own node_modules ────────
-            real_root = os.path.realpath(root)
-            if real_root == THIS_PROJECT_NODE_MODULES or real_root.startswith(THIS_PROJECT_NODE_MODULES + os.sep):
-                dirs.clear()
-                continue
+        # ── Safety: never scan this project's own node_modules ────────
+        # node_modules is never descended into, so only the root itself and
+        # each node_modules entry need the realpath check.
+        real_target = os.path.realpath(target_dir)
+        if real_target == THIS_PROJECT_NODE_MODULES or real_target.startswith(THIS_PROJECT_NODE_MODULES + os.sep):
+            stack = []
+        else:
+            stack = [target_dir]
 
-            # Tell Analyzer if we found a dev project (but skip our own)
-            if "node_modules" in dirs:
-                nm_path = os.path.join(root, "node_modules")
-                real_nm = os.path.realpath(nm_path)
-                dirs.remove("node_modules")  # Don't recurse into node_modules
-                if real_nm != THIS_PROJECT_NODE_MODULES:
-                    deep_analysis_targets.append(("dev_project", nm_path))
-
-            if ".git" in dirs:
-                git_path = os.path.join(root, ".git")
-                dirs.remove(".git")
-                deep_analysis_targets.append(("git_repo", git_path))
-                
-            # Basic file aggregation
-            for f in files:
-                try:
-                    fpath = os.path.join(root, f)
-                    if os.path.islink(fpath): continue
-                    st = os.stat(fpath)
-                    
-                    if st.st_size > MIN_ITEM_SIZE:
+        while stack:
+            current = stack.pop()
+            try:
+                it = os.scandir(current)
+            except OSError:
+                continue
+            with it:
+                for entry in it:
+                    name = entry.name
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            # Tell Analyzer if we found a dev project (but skip our own)
+                            if name == "node_modules":
+                                if os.path.realpath(entry.path) != THIS_PROJECT_NODE_MODULES:
+                                    deep_analysis_targets.append(("dev_project", entry.path))
+                            elif name == ".git":
+                                deep_analysis_targets.append(("git_repo", entry.path))
+                            elif name not in ALWAYS_SKIP_DIRS and not name.endswith(ALWAYS_SKIP_SUFFIXES):
+                                stack.append(entry.path)
+                            continue
+                        # d_type answered is_dir(); files cost this one lstat
+                        st = entry.stat(follow_symlinks=False)
+                    except OSError:
+                        continue
+
+                    # Basic file aggregation, in allocated bytes like the analyzer's tree sizes
+                    size = physical_size(st)
+                    if stat.S_ISREG(st.st_mode) and size > MIN_ITEM_SIZE:
                         # Identify simple caches
-                        ext = os.path.splitext(f)[1].lower()
+                        ext = os.path.splitext(name)[1].lower()
                         cat = "general_cache"
                         if ext in EXTENSION_CATEGORIES["cache"]: cat = "cache"
                         if ext in EXTENSION_CATEGORIES["logs"]: cat = "logs"
 
-                        found_items.append({
-                            "path": fpath,
-                            "size": st.st_size,
-                            "size_formatted": format_size(st.st_size),
-                            "last_accessed": datetime.fromtimestamp(st.st_atime).strftime("%Y-%m-%d %H:%M:%S"),
-                            "risk": "safe" if cat in ("cache", "logs") else "caution",
-                            "category": cat,
-                            "name": f,
-                            "description": "Discovered by Explorer Agent"
-                        })
-                        bytes_added += st.st_size
+                        item = SwarmItem(
+                            entry.path, size,
+                            "safe" if cat in ("cache", "logs") else "caution",
+                            cat, name, "Discovered by Explorer Agent",
+                            format_timestamp(st.st_atime),
+                        )
+                        found_items.append(item)
+                        # Stream it now rather than after the whole root is walked
+                        emit_item(item)
+                        bytes_added += size
                         files_added += 1
-                except OSError:
-                    pass
     except Exception as e:
         emit({"event": "agent_status", "agent_id": agent_id, "status": f"Error: {str(e)}", "type": "error"})
 
@@ -227,46 +381,25 @@ def agent_worker_analyzer(target_type, target_path, agent_id="Analyzer-1"):
     
     item = None
     try:
-        size = 0
         stale_days = 0
         oldest_access = time.time()
         
-        # Fast recursive sum using scandir
-        stack = [target_path]
-        while stack:
-            current = stack.pop()
-            try:
-                with os.scandir(current) as it:
-                    for entry in it:
-                        try:
-                            if entry.is_symlink(): continue
-                            st = entry.stat(follow_symlinks=False)
-                            if entry.is_dir(follow_symlinks=False):
-                                stack.append(entry.path)
-                            else:
-                                size += st.st_size
-                                oldest_access = min(oldest_access, st.st_atime)
-                        except OSError:
-                            pass
-            except OSError:
-                pass
+        size, oldest = _fan_out_size_and_atime(target_path) if PARALLEL_WALK else _tree_size_and_atime(target_path)
+        if oldest is not None:
+            oldest_access = min(oldest_access, oldest)
 
         if size > MIN_ITEM_SIZE:
             stale_days = int((time.time() - oldest_access) / (60*60*24)) if oldest_access < time.time() else 0
             
             project_name = os.path.basename(os.path.dirname(target_path)) if target_type == "dev_project" else os.path.basename(target_path)
             
-            item = {
-                "path": target_path,
-                "size": size,
-                "size_formatted": format_size(size),
-                "last_accessed": datetime.fromtimestamp(oldest_access).strftime("%Y-%m-%d %H:%M:%S"),
-                "risk": "safe",
-                "category": "dev_cache",
-                "name": f"{project_name} ({target_type})",
-                "description": f"Analyzed by {agent_id}. Stale for ~{stale_days} days.",
-                "traits": {"stale_days": stale_days}
-            }
+            item = SwarmItem(
+                target_path, size, "safe", "dev_cache",
+                f"{project_name} ({target_type})",
+                f"Analyzed by {agent_id}. Stale for ~{stale_days} days.",
+                format_timestamp(oldest_access),
+                traits={"stale_days": stale_days},
+            )
             
             # Emit an insight if it's very stale
             if stale_days > 30 and size > 10 * 1024 * 1024:
@@ -324,10 +457,6 @@ def deploy_swarm(target_path=None):
                 all_items.extend(items)
                 deep_targets.extend(targets)
                 tracker.update(root_dir, f_added, b_added)
-                
-                # Emit items incrementally
-                for item in items:
-                    emit({"event": "item", **item})
             except Exception as e:
                 tracker.errors["other"] += 1
                 
@@ -346,19 +475,20 @@ def deploy_swarm(target_path=None):
                 item = future.result()
                 if item:
                     all_items.append(item)
-                    emit({"event": "item", **item})
-                    tracker.update(item["path"], 1, item["size"])
+                    emit_item(item)
+                    tracker.update(item.path, 1, item.size)
             except Exception as e:
                 pass
                 
     # Phase 3: Final Consolidation
     _flush_item_buffer(force=True)
     
-    total_size = sum(i["size"] for i in all_items)
+    total_size = sum(i.size for i in all_items)
+    disk = shutil.disk_usage("/")
     
     emit({
         "event": "complete",
-        "items": all_items,
+        # Items were already streamed in batch events; metrics carries the count
         "metrics": {
             "total_bytes": total_size,
             "total_formatted": format_size(total_size),
@@ -366,9 +496,9 @@ def deploy_swarm(target_path=None):
             "items_found": len(all_items),
             "time_seconds": round(time.monotonic() - tracker.start_time, 2)
         },
-        "disk_total": shutil.disk_usage("/")[0],
-        "disk_used": shutil.disk_usage("/")[1],
-        "disk_free": shutil.disk_usage("/")[2]
+        "disk_total": disk.total,
+        "disk_used": disk.used,
+        "disk_free": disk.free
     })
 
 def main():
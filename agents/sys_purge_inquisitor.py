@@ -2,38 +2,20 @@ import os
 import json
 import pwd
 import sys
-import math
+
+from fs_utils import bulk_attr_size, format_size, scandir_size
 
 def get_directory_size(start_path):
-    """Recursively calculates the true disk size of a directory in bytes."""
-    total_size = 0
-    if not os.path.exists(start_path):
-        return 0
-    
-    try:
-        for dirpath, dirnames, filenames in os.walk(start_path):
-            for f in filenames:
-                fp = os.path.join(dirpath, f)
-                # Skip symbolic links to avoid infinite loops and mapping outside the target
-                if not os.path.islink(fp):
-                    try:
-                        total_size += os.path.getsize(fp)
-                    except (OSError, FileNotFoundError):
-                        pass
-    except Exception:
-        pass # Catch broad exceptions for permission denied on root files
-        
-    return total_size
+    """Recursively calculates the true disk size of a directory in bytes.
 
-def format_size(size_bytes):
-    """Converts bytes to a human-readable format."""
-    if size_bytes == 0:
-        return "0 B"
-    size_name = ("B", "KB", "MB", "GB", "TB")
-    i = int(math.floor(math.log(size_bytes, 1024))) if size_bytes > 0 else 0
-    p = math.pow(1024, i)
-    s = round(size_bytes / p, 2)
-    return f"{s} {size_name[i]}"
+    Symlinks are skipped so the walk never loops or maps outside the target;
+    getattrlistbulk(2) batches are used where available (macOS). A missing
+    directory simply sizes to 0, so no existence check is needed first.
+    """
+    size = bulk_attr_size(start_path)
+    if size is None:
+        size = scandir_size(start_path)
+    return size
 
 def scan_system_junk():
     """Scans specific, known macOS 'bloat' directories."""
@@ -53,17 +35,17 @@ def scan_system_junk():
 
     for target in targets:
         path = target['path']
-        if os.path.exists(path):
-            size_bytes = get_directory_size(path)
-            if size_bytes > 0:
-                results.append({
-                    "id": target["id"],
-                    "name": target["name"],
-                    "path": path,
-                    "description": target["description"],
-                    "sizeBytes": size_bytes,
-                })
-                total_bytes_found += size_bytes
+        size_bytes = get_directory_size(path)
+        if size_bytes > 0:
+            results.append({
+                "id": target["id"],
+                "name": target["name"],
+                "path": path,
+                "description": target["description"],
+                "sizeBytes": size_bytes,
+                "sizeFormatted": format_size(size_bytes),
+            })
+            total_bytes_found += size_bytes
 
     # Output strict JSON to stdout so Node.js can parse it cleanly
     output = {
@@ -71,16 +53,6 @@ def scan_system_junk():
         "totalBytes": total_bytes_found,
         "items": sorted(results, key=lambda x: x['sizeBytes'], reverse=True)
     }
-    
-    for item in output['items']:
-        
-        # Add formatted size
-        size_bytes = item['sizeBytes']
-        size_name = ("B", "KB", "MB", "GB", "TB")
-        i = int(math.floor(math.log(size_bytes, 1024))) if size_bytes > 0 else 0
-        p = math.pow(1024, i)
-        s = round(size_bytes / p, 2)
-        item['sizeFormatted'] = f"{s} {size_name[i]}"
 
     print(json.dumps(output))
 
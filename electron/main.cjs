@@ -226,6 +226,9 @@ function _flushRustBuffer(status = null, error = null) {
                 physicalSize: item.physicalSize || item.size || 0,
                 risk: item.risk || 'safe',
                 category: item.category || 'unknown',
+                // Virtual items (docker://...) are freed by their action, never deleted as paths
+                virtual: item.virtual || false,
+                actionType: item.actionType || item.action_type || null,
             };
         });
 
@@ -323,6 +326,7 @@ ipcMain.on('start-storage-scan', (event, scanPath) => {
             // {"event": "progress", "bytes_scanned": ...}
             // {"event": "complete", "metrics": {...}}
             // {"event": "swarm_phase", "phase": "..."}
+            // {"event": "batch_status", "statuses": [{agent_status}, ...]}
 
             if (parsed.event === 'item' || parsed.event === 'batch') {
                 if (parsed.items) { // Batch of items
@@ -330,14 +334,11 @@ ipcMain.on('start-storage-scan', (event, scanPath) => {
                 } else if (parsed.path) { // Single item
                     _scanBuffer.push(parsed);
                 }
-            } else if (parsed.event === 'progress' || parsed.event === 'swarm_phase' || parsed.event === 'agent_status' || parsed.event === 'insight') {
+            } else if (parsed.event === 'progress' || parsed.event === 'swarm_phase' || parsed.event === 'agent_status' || parsed.event === 'batch_status' || parsed.event === 'insight') {
                 // Instantly proxy progress/status events to the UI thread (bypassing the flush loop)
                 win.webContents.send('storage-scan-event', parsed);
             } else if (parsed.event === 'complete') {
-                // Push the final items and wait for the loop to complete natively
-                if (parsed.items) {
-                    _scanBuffer.push(...parsed.items);
-                }
+                // Items already arrived as batches; wait for the loop to complete natively
                 parsed.type = 'snapshot'; // Help frontend read totals
                 // win.webContents.send('storage-scan-event', parsed); // Not needed, on('close') handles completion
             }
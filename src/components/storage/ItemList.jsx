@@ -87,7 +87,8 @@ export default memo(function ItemList({ items, selectedPaths, onTogglePath, onCo
     }, []);
 
     const toggleCategoryItems = useCallback((catItems) => {
-        const allPaths = catItems.map(i => i.path);
+        // Virtual items (docker://...) are freed by their own action, not deleted
+        const allPaths = catItems.filter(i => !i.virtual).map(i => i.path);
         const allSelected = allPaths.every(p => selectedPaths.has(p));
         if (allSelected) {
             allPaths.forEach(p => {
@@ -224,13 +225,13 @@ export default memo(function ItemList({ items, selectedPaths, onTogglePath, onCo
                                             animate={{ opacity: 1, height: 'auto' }}
                                             exit={{ opacity: 0, height: 0 }}
                                             transition={{ duration: 0.2, ease: 'easeOut' }}
-                                            onClick={() => onTogglePath(item.path)}
+                                            onClick={() => { if (!item.virtual) onTogglePath(item.path); }}
                                             onContextMenu={(e) => onContextMenu(e, item)}
                                             className={`flex items-center px-4 py-2.5 border-b border-white/[0.03] cursor-pointer transition-all hover:bg-white/[0.04] group/row ${isSelected ? 'bg-cyan-500/[0.06] border-l-2 border-l-cyan-500' : ''}`}
                                         >
                                             {/* Checkbox */}
                                             <div className="w-8 flex-shrink-0 flex items-center justify-center">
-                                                <div className="relative">
+                                                {!item.virtual && <div className="relative">
                                                     <input
                                                         type="checkbox"
                                                         checked={isSelected}
@@ -241,7 +242,7 @@ export default memo(function ItemList({ items, selectedPaths, onTogglePath, onCo
                                                     <svg className="absolute w-2.5 h-2.5 top-1/2 left-1/2 -translate-x-1/2 -translate-y-1/2 pointer-events-none opacity-0 peer-checked:opacity-100 text-white" viewBox="0 0 14 10" fill="none">
                                                         <path d="M1 5L4.5 8.5L13 1" stroke="currentColor" strokeWidth="2" strokeLinecap="round" strokeLinejoin="round" />
                                                     </svg>
-                                                </div>
+                                                </div>}
                                             </div>
 
                                             {/* Name + path */}
@@ -857,24 +857,26 @@ export default function StorageAnalyzer() {
                 >
                     <button
                         onClick={() => {
-                            if (contextMenu.item?.path) toggleStoragePath(contextMenu.item.path);
+                            if (contextMenu.item?.path && !contextMenu.item.virtual) toggleStoragePath(contextMenu.item.path);
                             setContextMenu(null);
                         }}
                         className="w-full text-left px-3 py-2 text-xs rounded-lg hover:bg-white/10 flex items-center gap-2"
                     >
                         Reveal in Finder
                     </button>
-                    <button
-                        onClick={() => {
-                            clearStorageSelection();
-                            toggleStoragePath(contextMenu.item.path);
-                            setShowDeleteModal(true);
-                            setContextMenu(null);
-                        }}
-                        className="w-full text-left px-3 py-2 text-xs rounded-lg hover:bg-red-500/10 text-red-400 flex items-center gap-2 font-medium"
-                    >
-                        <Trash2 size={14} /> Delete Item
-                    </button>
+                    {!contextMenu.item?.virtual && (
+                        <button
+                            onClick={() => {
+                                clearStorageSelection();
+                                toggleStoragePath(contextMenu.item.path);
+                                setShowDeleteModal(true);
+                                setContextMenu(null);
+                            }}
+                            className="w-full text-left px-3 py-2 text-xs rounded-lg hover:bg-red-500/10 text-red-400 flex items-center gap-2 font-medium"
+                        >
+                            <Trash2 size={14} /> Delete Item
+                        </button>
+                    )}
                     <div className="h-px bg-white/5 my-1" />
                     <button
                         onClick={() => {
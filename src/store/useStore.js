@@ -435,6 +435,8 @@ const useStore = create((set, get) => ({
                             risk: item.risk || 'caution',
                             confidence: item.confidence,
                             recoveryNote: item.recoveryNote || item.recovery_note,
+                            virtual: item.virtual || false,
+                            actionType: item.actionType || item.action_type || null,
                         };
                     });
                     const currentItems = get().storageItems;
@@ -497,6 +499,8 @@ const useStore = create((set, get) => ({
                             risk: item.risk || 'caution',
                             confidence: item.confidence,
                             recoveryNote: item.recoveryNote || item.recovery_note,
+                            virtual: item.virtual || false,
+                            actionType: item.actionType || item.action_type || null,
                         };
                     });
 
@@ -581,9 +585,11 @@ const useStore = create((set, get) => ({
                         storageScanProgress: {
                             ...state.storageScanProgress,
                             phase: snapshot.phase || 'Scanning',
-                            currentPath: snapshot.current_path,
-                            filesProcessed: snapshot.files_processed,
-                            bytesScanned: snapshot.bytes_scanned,
+                            // schema_version >= 2 sends only dir/files/bytes/rate_mbps
+                            currentPath: snapshot.dir ?? snapshot.current_path,
+                            filesProcessed: snapshot.files ?? snapshot.files_processed,
+                            bytesScanned: snapshot.bytes ?? snapshot.bytes_scanned,
+                            scanRateMbps: snapshot.rate_mbps ?? snapshot.scan_rate_mbps ?? 0,
                             elapsed: snapshot.elapsed || 0,
                         }
                     }));
@@ -596,6 +602,16 @@ const useStore = create((set, get) => ({
                         }
                     }));
                     break;
+                case 'batch_status':
+                    // Several agent_status events in one update; later ones win
+                    set((state) => {
+                        const storageSwarmStatus = { ...state.storageSwarmStatus };
+                        for (const status of snapshot.statuses || []) {
+                            storageSwarmStatus[status.agent_id] = status;
+                        }
+                        return { storageSwarmStatus };
+                    });
+                    break;
                 case 'swarm_phase':
                     set((state) => ({
                         storageScanProgress: {
@@ -653,7 +669,9 @@ const useStore = create((set, get) => ({
     },
 
     selectAllStoragePaths: (paths) => {
-        set({ storageSelectedPaths: new Set(paths) });
+        // Virtual items (docker://...) have no file to delete, so they are never selectable
+        const virtualPaths = new Set(get().storageItems.filter(i => i.virtual).map(i => i.path));
+        set({ storageSelectedPaths: new Set(paths.filter(p => !virtualPaths.has(p))) });
     },
 
     clearStorageSelection: () => {
@@ -665,7 +683,8 @@ const useStore = create((set, get) => ({
 
     deleteSelectedStoragePaths: async () => {
         if (!checkIpc(set)) return;
-        const paths = Array.from(get().storageSelectedPaths);
+        const virtualPaths = new Set(get().storageItems.filter(i => i.virtual).map(i => i.path));
+        const paths = Array.from(get().storageSelectedPaths).filter(p => !virtualPaths.has(p));
         if (paths.length === 0) return;
 
         set({
@@ -0,0 +1,80 @@
+import os
+import plistlib
+import sys
+import tempfile
+import time
+import unittest
+from datetime import datetime, timezone
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "agents"))
+
+import macos_intelligence  # noqa: E402
+
+# 02:30 UTC on the 10th is still the 9th west of Greenwich
+BACKUP_DATE = datetime(2024, 3, 10, 2, 30)
+
+
+class _FakeNSDate:
+    def __init__(self, dt):
+        self._ts = dt.replace(tzinfo=timezone.utc).timestamp()
+
+    def timeIntervalSince1970(self):
+        return self._ts
+
+
+class _FakeNSData:
+    @staticmethod
+    def dataWithContentsOfFile_(path):
+        return path
+
+
+class _FakeNSPropertyListSerialization:
+    """Parses like CoreFoundation: dates come back as NSDate-like objects."""
+
+    @staticmethod
+    def propertyListWithData_options_format_error_(path, options, fmt, error):
+        with open(path, "rb") as f:
+            pl = plistlib.load(f)
+        return {k: _FakeNSDate(v) if isinstance(v, datetime) else v for k, v in pl.items()}, None, None
+
+
+class ReadBackupInfoTest(unittest.TestCase):
+    def setUp(self):
+        self._tz = os.environ.get("TZ")
+        os.environ["TZ"] = "America/Los_Angeles"
+        time.tzset()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.plist_path = os.path.join(self.tmp.name, "Info.plist")
+        with open(self.plist_path, "wb") as f:
+            plistlib.dump({"Device Name": "Test iPhone", "Last Backup Date": BACKUP_DATE}, f)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+        if self._tz is None:
+            os.environ.pop("TZ", None)
+        else:
+            os.environ["TZ"] = self._tz
+        time.tzset()
+
+    def _read_with_plistlib(self):
+        with mock.patch.object(macos_intelligence, "NSPropertyListSerialization", None):
+            return macos_intelligence.read_backup_info(self.plist_path)
+
+    def test_pyobjc_and_plistlib_agree(self):
+        with mock.patch.object(macos_intelligence, "NSData", _FakeNSData, create=True), \
+                mock.patch.object(macos_intelligence, "NSPropertyListSerialization",
+                                  _FakeNSPropertyListSerialization):
+            pyobjc = macos_intelligence.read_backup_info(self.plist_path)
+        self.assertEqual(pyobjc, self._read_with_plistlib())
+
+    def test_date_is_local(self):
+        self.assertEqual(self._read_with_plistlib(), ("Test iPhone", "2024-03-09"))
+
+    @unittest.skipIf(macos_intelligence.NSPropertyListSerialization is None, "pyobjc not installed")
+    def test_real_pyobjc_matches_plistlib(self):
+        self.assertEqual(macos_intelligence.read_backup_info(self.plist_path), self._read_with_plistlib())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+import os
+import sys
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "agents"))
+
+import storage_scanner  # noqa: E402
+
+
+class ScanStateReuseTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.conn = storage_scanner.init_cache_db(os.path.join(self.tmp.name, "scan_cache.db"))
+        self.path = "/cache/root"
+        self.items = [{"path": self.path, "size": 4096}]
+        self.mtimes = {self.path: 1700000000.0}
+
+    def tearDown(self):
+        self.conn.close()
+        self.tmp.cleanup()
+
+    def _age(self, hours):
+        return (datetime.now() - timedelta(hours=hours)).isoformat()
+
+    def test_rewalk_with_unchanged_content_refreshes_timestamp(self):
+        stale = self._age(storage_scanner.SIZE_REUSE_MAX_AGE / 3600 + 1)
+        storage_scanner.mark_paths_scanned(self.conn, self.items, self.mtimes, stale)
+        self.assertNotIn(self.path, storage_scanner.load_reusable_sizes(self.conn))
+
+        # The expired row forces a walk; it finds the same mtime and size
+        storage_scanner.mark_paths_scanned(self.conn, self.items, self.mtimes)
+        self.assertEqual(storage_scanner.load_reusable_sizes(self.conn)[self.path],
+                         (1700000000.0, 4096))
+
+    def test_reused_size_keeps_original_timestamp(self):
+        first = self._age(1)
+        storage_scanner.mark_paths_scanned(self.conn, self.items, self.mtimes, first)
+        storage_scanner.mark_paths_scanned(self.conn, self.items, self.mtimes, reused={self.path})
+        (last_scan_ts,) = self.conn.execute(
+            "SELECT last_scan_ts FROM scan_state WHERE path = ?", (self.path,)).fetchone()
+        self.assertEqual(last_scan_ts, first)
+
+
+if __name__ == "__main__":
+    unittest.main()